@@ -1,40 +1,324 @@
 """
     BasePage层：基类，主要实现常规的Selenium操作行为
 """
-from time import sleep  # 导入 sleep 函数，用于强制等待
+import weakref  # 弱引用字典，按浏览器驱动保存元素缓存，驱动释放后缓存随之回收
+from time import sleep, monotonic  # 导入 sleep 函数用于强制等待，monotonic 用于计算等待超时
+from base_page.metrics_page import Metrics, timed  # 导入耗时统计，记录方法耗时与等待休眠时间
+from base_page.driver_page import prepare_tab  # 新标签页需要重新执行加载配置的 DevTools 设置
+from selenium.common.exceptions import (  # 导入显式等待过程中需要处理的异常类型
+    NoSuchElementException,  # 元素尚未出现
+    NoSuchWindowException,  # 没有找到新打开的窗口
+    StaleElementReferenceException,  # 元素已从 DOM 中移除
+    TimeoutException,  # 等待超时
+)
+
+
+def element_present(by, value):
+    """
+    等待条件：元素已存在于 DOM 中。
+
+    返回:
+        callable: 条件满足时返回元素对象，否则抛出 NoSuchElementException。
+    """
+    return lambda driver: driver.find_element(by, value)  # 查找元素，找不到时抛出异常由等待引擎捕获
+
+
+def element_visible(by, value):
+    """
+    等待条件：元素存在且可见。
+
+    返回:
+        callable: 条件满足时返回元素对象，否则返回 False。
+    """
+    def _condition(driver):
+        el = driver.find_element(by, value)  # 先定位元素
+        return el if el.is_displayed() else False  # 可见时返回元素
+    return _condition
+
+
+def element_clickable(by, value):
+    """
+    等待条件：元素可见且可用（可点击）。
+
+    返回:
+        callable: 条件满足时返回元素对象，否则返回 False。
+    """
+    def _condition(driver):
+        el = driver.find_element(by, value)  # 先定位元素
+        return el if el.is_displayed() and el.is_enabled() else False  # 可见且可用时返回元素
+    return _condition
+
+
+def url_changes(old_url):
+    """
+    等待条件：当前 URL 与给定的旧 URL 不同。
+    """
+    return lambda driver: driver.current_url != old_url  # URL 发生变化即满足
+
+
+def title_changes(old_title):
+    """
+    等待条件：当前页面标题与给定的旧标题不同。
+    """
+    return lambda driver: driver.title != old_title  # 标题发生变化即满足
+
+
+def staleness_of(element):
+    """
+    等待条件：给定元素已从 DOM 中移除（旧结果容器被替换）。
+    """
+    def _condition(driver):
+        try:
+            element.is_enabled()  # 访问元素任意属性，若元素已失效会抛出异常
+            return False  # 元素仍然有效，继续等待
+        except StaleElementReferenceException:
+            return True  # 元素已失效，条件满足
+    return _condition
+
+
+def document_ready(states=('complete',)):
+    """
+    等待条件：document.readyState 处于指定状态之一。
+
+    参数:
+        states (tuple): 可接受的 readyState 值，默认仅接受 'complete'。
+    """
+    return lambda driver: driver.execute_script("return document.readyState;") in states  # 读取页面加载状态
+
+
+def network_quiet(idle):
+    """
+    等待条件："网络静默"，即资源请求数量在 idle 秒内不再增长。
+    - 通过 performance.getEntriesByType('resource') 统计已发起的资源请求数量。
+
+    参数:
+        idle (int | float): 静默窗口的秒数。
+    """
+    state = {'count': -1, 'since': monotonic()}  # 记录上一次的资源数量及其开始保持不变的时间点
+
+    def _condition(driver):
+        count = driver.execute_script("return performance.getEntriesByType('resource').length;")  # 当前资源请求数量
+        now = monotonic()
+        if count != state['count']:  # 数量发生变化，重新开始计时
+            state['count'], state['since'] = count, now
+            return False
+        return now - state['since'] >= idle  # 数量保持不变超过静默窗口即满足
+    return _condition
+
+
+def any_of(*conditions):
+    """
+    组合条件：任意一个条件满足即返回该条件的结果。
+    """
+    def _condition(driver):
+        for condition in conditions:  # 依次检查每个条件
+            try:
+                result = condition(driver)
+            except (NoSuchElementException, StaleElementReferenceException):
+                continue  # 单个条件暂不满足，继续检查下一个
+            if result:
+                return result
+        return False
+    return _condition
+
+
+# 批量提取脚本：在浏览器内一次性解析所有定位器并按字段提取数据，整页只需一次 WebDriver 往返
+BULK_QUERY_JS = """
+const [locators, fields] = arguments;
+function resolve(by, value) {
+    switch (by) {
+        case 'xpath': {
+            const snap = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            const out = [];
+            for (let i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+            return out;
+        }
+        case 'css selector': return Array.from(document.querySelectorAll(value));
+        case 'id': { const el = document.getElementById(value); return el ? [el] : []; }
+        case 'class name': return Array.from(document.getElementsByClassName(value));
+        case 'name': return Array.from(document.getElementsByName(value));
+        case 'tag name': return Array.from(document.getElementsByTagName(value));
+        case 'link text':
+            return Array.from(document.links).filter(a => a.innerText.trim() === value);
+        case 'partial link text':
+            return Array.from(document.links).filter(a => a.innerText.includes(value));
+        default: throw new Error('unsupported locator: ' + by);
+    }
+}
+function extract(el, field) {
+    switch (field) {
+        case 'text': return el.innerText.trim();
+        case 'href': {
+            const link = el.href ? el : (el.querySelector('a[href]') || el.closest('a[href]'));
+            return link ? link.href : null;
+        }
+        case 'rect': {
+            const r = el.getBoundingClientRect();
+            return {x: r.x, y: r.y, width: r.width, height: r.height};
+        }
+        case 'html': return el.outerHTML;
+        default: return el.getAttribute(field);
+    }
+}
+const result = {};
+for (const [key, [by, value]] of Object.entries(locators)) {
+    result[key] = resolve(by, value).map(el => {
+        const record = {};
+        for (const field of fields) record[field] = extract(el, field);
+        return record;
+    });
+}
+return result;
+"""
+
+NETWORK_WAITS = {'url', 'title', 'stale', 'ready', 'network'}  # 等待页面加载/替换的条件类别，轮询休眠计入网络耗时
+
+
+def element_alive(el):
+    """
+    缓存校验：元素仍在 DOM 中（已失效时 is_enabled 抛出 StaleElementReferenceException）。
+    """
+    el.is_enabled()
+    return True
+
+
+CACHE_PROBES = {  # 命中缓存时的校验，与各查找方法的条件一致，每次校验只需一到两次 WebDriver 往返
+    'wait_present': element_alive,
+    'wait_visible': lambda el: el.is_displayed(),
+    'wait_clickable': lambda el: el.is_displayed() and el.is_enabled(),
+}
+
+
+class ElementCache:
+    """
+    元素句柄缓存：按 (查找方法, 定位方式, 定位值) 缓存已定位到的元素，减少重复的查找与轮询等待。
+    - 同一浏览器驱动上的所有页面对象共享一个缓存，任一页面对象发生导航都会使整个缓存失效。
+    - 键中包含查找方法，wait_present 缓存的元素不会被 click / input 直接使用，跳过可见、可点击条件。
+    - 命中时按查找方法的条件做一次轻量校验（CACHE_PROBES），不满足或元素已失效时丢弃并重新查找。
+    """
+
+    _registry = weakref.WeakKeyDictionary()  # 浏览器驱动 -> 元素缓存
+
+    def __init__(self):
+        self.elements = {}  # (查找方法, by, value) -> WebElement
+        self.hits = 0  # 命中次数，即节省的 find_element 调用次数
+        self.misses = 0  # 未命中次数，即实际执行的查找次数
+        self.stale = 0  # 缓存的元素已失效或校验未通过的次数
+        self.invalidations = 0  # 因导航导致整体失效的次数
+
+    @classmethod
+    def of(cls, driver):
+        """
+        获取指定浏览器驱动对应的元素缓存，不存在时创建。
+        """
+        cache = cls._registry.get(driver)
+        if cache is None:
+            cache = cls._registry[driver] = cls()
+        return cache
+
+    def get(self, key, probe=None):
+        """
+        读取缓存的元素，并更新命中/未命中计数。
+
+        参数:
+            probe (callable): 命中时的校验函数 probe(el)，返回假值或元素已失效时丢弃该元素，按未命中处理。
+        """
+        el = self.elements.get(key)
+        if el is not None and probe is not None:
+            try:
+                valid = probe(el)
+            except StaleElementReferenceException:
+                valid = False
+            if not valid:
+                self.discard(key)
+                el = None
+        if el is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return el
+
+    def put(self, key, el):
+        """
+        写入缓存的元素。
+        """
+        self.elements[key] = el
+
+    def discard(self, key):
+        """
+        移除单个已失效的元素。
+        """
+        if self.elements.pop(key, None) is not None:
+            self.stale += 1
+
+    def clear(self):
+        """
+        页面导航后清空整个缓存。
+        """
+        if self.elements:
+            self.elements.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        """
+        返回缓存统计信息。
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'stale': self.stale,
+                'invalidations': self.invalidations, 'size': len(self.elements)}
 
 
 class BasePage:
     """
     BasePage 类封装了与网页元素交互的基本方法，供其他页面对象类继承使用。
     - 包含打开网页、定位元素、输入文本、点击元素和强制等待等通用方法。
+    - 提供基于条件的显式等待引擎，条件满足后立即返回，替代固定时长的强制等待。
     """
 
-    def __init__(self, driver):  # 构造方法：在实例化 BasePage 类时，初始化浏览器驱动，并设置隐式等待时间为 10 秒
+    timeouts = {  # 各类等待条件的默认超时时间（秒），子类可按需覆盖
+        'present': 10,  # 元素存在
+        'visible': 10,  # 元素可见
+        'clickable': 10,  # 元素可点击
+        'url': 15,  # URL 变化
+        'title': 15,  # 标题变化
+        'stale': 15,  # 旧元素失效
+        'ready': 20,  # 页面加载完成
+        'network': 5,  # 网络静默
+    }
+    poll_start = 0.05  # 初始轮询间隔（秒）
+    poll_max = 0.5  # 最大轮询间隔（秒）
+    poll_backoff = 1.5  # 轮询间隔的退避系数，每次未满足条件后间隔乘以该系数
+    network_idle = 0.5  # 网络静默窗口（秒）
+    cache_elements = False  # 是否启用元素句柄缓存，默认关闭，可在类或实例上开启
+
+    def __init__(self, driver):  # 构造方法：在实例化 BasePage 类时，初始化浏览器驱动
         """
         初始化 BasePage 实例。
-        - 接收浏览器驱动并设置隐式等待时间。
+        - 接收浏览器驱动并关闭隐式等待，元素等待统一交由显式等待引擎处理。
 
         参数:
             driver (WebDriver): 用于与浏览器交互的 WebDriver 实例。
         """
         self.driver = driver  # 将传入的浏览器驱动对象赋值给实例变量 self.driver
-        self.driver.implicitly_wait(10)  # 设置隐式等待时间为 10 秒，等待元素加载
+        self.driver.implicitly_wait(0)  # 关闭隐式等待，避免与显式等待叠加导致每次轮询都被阻塞
 
+    @timed
     def open(self, url):  # 访问指定的 URL
         """
         打开指定的网页。
-        - 使用 WebDriver 的 get 方法访问指定 URL。
+        - 使用 WebDriver 的 get 方法访问指定 URL，并等待页面加载完成。
 
         参数:
             url (str): 需要访问的网页 URL。
         """
+        self.invalidate_cache()  # 导航后旧元素全部失效
         self.driver.get(url)  # 使用浏览器驱动访问指定的 URL
+        self.wait_ready()  # 等待 document.readyState 进入就绪状态
 
+    @timed
     def locator(self, by, value):  # 定位元素
         """
         定位页面元素。
-        - 根据给定的定位方式和定位值返回单个元素对象。
+        - 根据给定的定位方式和定位值返回单个元素对象，元素出现前会按条件轮询等待。
 
         参数:
             by (str): 定位方式，如 ID、XPath 等。
@@ -43,8 +327,9 @@ class BasePage:
         返回:
             WebElement: 定位到的元素对象。
         """
-        return self.driver.find_element(by, value)  # 返回定位到的单个元素对象
+        return self._cached(by, value, self.wait_present)  # 等待元素出现并返回定位到的单个元素对象
 
+    @timed
     def input(self, by, value, text):  # 输入文本
         """
         在指定元素中输入文本。
@@ -55,21 +340,24 @@ class BasePage:
             value (str): 定位值。
             text (str): 需要输入的文本内容。
         """
-        el = self.locator(by, value)  # 通过 locator 方法获取元素对象
-        el.clear()  # 清除元素中的现有文本
-        el.send_keys(text)  # 在元素中输入指定的文本
+        def _input(el):
+            el.clear()  # 清除元素中的现有文本
+            el.send_keys(text)  # 在元素中输入指定的文本
+        self._with_element(by, value, self.wait_visible, _input)  # 等待元素可见后输入
 
+    @timed
     def click(self, by, value):  # 点击元素
         """
         点击指定的页面元素。
-        - 使用定位器找到元素后，执行点击操作。
+        - 等待元素可点击后，执行点击操作。
 
         参数:
             by (str): 定位方式。
             value (str): 定位值。
         """
-        self.locator(by, value).click()  # 定位到元素并点击
+        self._with_element(by, value, self.wait_clickable, lambda el: el.click())  # 等待元素可点击并点击
 
+    @timed
     def text_info(self, by, value):
         """
         获取指定位置中的文本元素的值。
@@ -81,8 +369,9 @@ class BasePage:
         返回:
             str: 获取到的文本内容。
         """
-        return self.locator(by, value).text  # 获取元素中的文本信息
+        return self._with_element(by, value, self.wait_present, lambda el: el.text)  # 获取元素中的文本信息
 
+    @timed
     def href_info(self, by, value):
         """
         获取标签内的href内容数据。
@@ -94,22 +383,288 @@ class BasePage:
         返回:
             str: 获取到的文本内容。
         """
-        return self.driver.find_element(by, value).get_attribute('href')  # 获取元素中的href内容
+        return self._with_element(by, value, self.wait_present, lambda el: el.get_attribute('href'))  # 获取元素中的href内容
+
+    @property
+    def element_cache(self):
+        """
+        当前浏览器驱动共享的元素缓存。
+        """
+        return ElementCache.of(self.driver)
+
+    def invalidate_cache(self):
+        """
+        使当前浏览器驱动的元素缓存全部失效，在页面导航或内容替换后调用。
+        """
+        if self.cache_elements:
+            self.element_cache.clear()
+
+    def _cached(self, by, value, finder):
+        """
+        按 (查找方法, by, value) 读取缓存的元素，命中时按查找条件校验，未命中或校验失败时通过 finder 查找并写入缓存。
+
+        参数:
+            finder (callable): 查找方法，如 wait_present、wait_clickable。
+        """
+        if not self.cache_elements:
+            return finder(by, value)  # 未启用缓存，直接查找
+        key = (finder.__name__, by, value)
+        el = self.element_cache.get(key, CACHE_PROBES.get(finder.__name__))
+        if el is None:
+            el = finder(by, value)  # 未命中或校验未通过，重新查找
+            self.element_cache.put(key, el)
+        return el
+
+    def _with_element(self, by, value, finder, action):
+        """
+        对元素执行操作；若缓存的元素已失效，则丢弃该缓存并重新查找后重试一次。
+
+        参数:
+            finder (callable): 查找方法。
+            action (callable): 对元素执行的操作 action(el)。
+
+        返回:
+            action 的返回值。
+        """
+        el = self._cached(by, value, finder)
+        try:
+            return action(el)
+        except StaleElementReferenceException:
+            if not self.cache_elements:
+                raise  # 未启用缓存时元素失效属于真实错误
+            self.element_cache.discard((finder.__name__, by, value))  # 丢弃失效元素
+            return action(self._cached(by, value, finder))  # 透明地重新查找并重试
+
+    @timed
+    def query(self, locators, fields=('text',)):
+        """
+        批量提取页面数据：一次 execute_script 调用解析所有定位器并提取指定字段。
+        - 替代 find_elements 后逐个读取 .text / get_attribute 的写法，避免每个元素一次 HTTP 往返。
+
+        参数:
+            locators (dict): {名称: (定位方式, 定位值)}，支持 xpath、css selector、id、class name、
+                name、tag name、link text、partial link text。
+            fields (tuple): 需要提取的字段：
+                - 'text': 元素可见文本（innerText，去除首尾空白）
+                - 'href': 元素自身或其内部/外层第一个链接的绝对地址
+                - 'rect': 元素边界框 {x, y, width, height}
+                - 'html': 元素的 outerHTML
+                - 其他值按属性名读取 getAttribute
+
+        返回:
+            dict: {名称: [{字段: 值}, ...]}，每个定位器对应按文档顺序排列的记录列表。
+        """
+        locators = {key: list(loc) for key, loc in locators.items()}  # 元组转为列表，便于序列化传入浏览器
+        return self.execute_script(BULK_QUERY_JS, locators, list(fields))  # 一次往返完成全部提取
+
+    @timed
+    def query_all(self, by, value, fields=('text',)):
+        """
+        批量提取单个定位器匹配的所有元素的字段，参数与返回值说明见 query。
+
+        返回:
+            list[dict]: 按文档顺序排列的记录列表。
+        """
+        return self.query({'items': (by, value)}, fields)['items']
+
+    @timed
+    def execute_script(self, script, *args):
+        """
+        在当前页面执行 JavaScript 并返回结果。
+
+        参数:
+            script (str): 要执行的脚本。
+            *args: 传入脚本的参数，脚本中通过 arguments 读取。
+        """
+        return self.driver.execute_script(script, *args)  # 执行脚本
+
+    @timed
+    def execute_async_script(self, script, *args):
+        """
+        在当前页面执行异步 JavaScript，脚本通过最后一个参数（回调函数）返回结果。
+
+        参数:
+            script (str): 要执行的脚本。
+            *args: 传入脚本的参数。
+        """
+        return self.driver.execute_async_script(script, *args)  # 执行异步脚本，回调被调用后返回
 
     @staticmethod  # 强制等待指定的时间，定义为静态方法，无需实例化类即可调用
     def wait(time):
         """
         强制等待指定的时间。
-        - 使用 sleep 方法暂停执行，通常用于等待页面加载或动画完成。
+        - 使用 sleep 方法暂停执行，仅在无法用条件描述的场景下使用，优先使用 wait_until 系列方法。
 
         参数:
             time (int | float): 需要等待的秒数。
         """
         sleep(time)  # 强制等待指定的秒数
+        Metrics.shared().record('sleep', 'wait', time, 'sleep')  # 计入强制等待耗时
+
+    def wait_until(self, condition, kind=None, timeout=None, message=None):
+        """
+        显式等待引擎：按自适应间隔轮询条件，条件满足后立即返回。
+        - 轮询间隔从 poll_start 开始，每次未满足后乘以 poll_backoff，最大不超过 poll_max。
+        - 条件抛出的 NoSuchElementException / StaleElementReferenceException 视为暂未满足。
 
-    def new_window(self):
+        参数:
+            condition (callable): 接收 driver 的条件函数，返回真值表示满足。
+            kind (str): 条件类别，用于从 timeouts 中读取默认超时时间。
+            timeout (int | float): 本次等待的超时时间，优先级高于 kind 对应的默认值。
+            message (str): 超时时的提示信息。
+
+        返回:
+            条件函数返回的真值（如元素对象）。
+
+        异常:
+            TimeoutException: 超时仍未满足条件。
         """
-        切换到最新的窗口。
-        - 使用 WebDriver 的 window_handles 切换到最新打开的窗口。
+        if timeout is None:
+            timeout = self.timeouts.get(kind, 10)  # 未指定超时时间时按条件类别读取默认值
+        deadline = monotonic() + timeout  # 计算截止时间
+        interval = self.poll_start  # 当前轮询间隔
+        last_exc = None  # 记录最后一次捕获的异常，便于超时时定位原因
+        slept = 0.0  # 本次等待累计的轮询休眠时间
+        try:
+            while True:
+                try:
+                    result = condition(self.driver)  # 检查条件
+                    if result:
+                        return result  # 条件满足，立即返回
+                except (NoSuchElementException, StaleElementReferenceException) as exc:
+                    last_exc = exc  # 条件暂不满足，记录异常继续轮询
+                remaining = deadline - monotonic()  # 剩余可等待时间
+                if remaining <= 0:
+                    raise TimeoutException(message or f"等待条件超时({timeout}s): {kind or condition}") from last_exc
+                pause = min(interval, remaining)  # 等待当前轮询间隔，但不超过剩余时间
+                sleep(pause)
+                slept += pause
+                interval = min(interval * self.poll_backoff, self.poll_max)  # 退避，逐步拉长轮询间隔
+        finally:
+            if slept:  # 轮询休眠：等待页面加载类计入网络耗时，其余计入休眠耗时
+                Metrics.shared().record('sleep', kind or 'custom', slept, 'network' if kind in NETWORK_WAITS else 'sleep')
+
+    @timed
+    def wait_present(self, by, value, timeout=None):
+        """
+        等待元素出现在 DOM 中并返回该元素。
+        """
+        return self.wait_until(element_present(by, value), 'present', timeout, f"元素未出现: {by}={value}")
+
+    @timed
+    def wait_visible(self, by, value, timeout=None):
+        """
+        等待元素可见并返回该元素。
+        """
+        return self.wait_until(element_visible(by, value), 'visible', timeout, f"元素不可见: {by}={value}")
+
+    @timed
+    def wait_clickable(self, by, value, timeout=None):
+        """
+        等待元素可点击并返回该元素。
+        """
+        return self.wait_until(element_clickable(by, value), 'clickable', timeout, f"元素不可点击: {by}={value}")
+
+    @timed
+    def wait_url_change(self, old_url, timeout=None):
+        """
+        等待当前 URL 离开 old_url。
+        """
+        return self.wait_until(url_changes(old_url), 'url', timeout, f"URL 未发生变化: {old_url}")
+
+    @timed
+    def wait_title_change(self, old_title, timeout=None):
+        """
+        等待页面标题离开 old_title。
+        """
+        return self.wait_until(title_changes(old_title), 'title', timeout, f"标题未发生变化: {old_title}")
+
+    @timed
+    def wait_stale(self, element, timeout=None):
+        """
+        等待旧元素（如旧的结果容器）从 DOM 中移除。
+        """
+        return self.wait_until(staleness_of(element), 'stale', timeout, "旧元素未失效")
+
+    @timed
+    def wait_ready(self, states=None, timeout=None):
+        """
+        等待 document.readyState 进入指定状态。
+        - 未指定 states 时使用浏览器加载配置中的 ready_states（eager/none 策略下 'interactive' 即视为就绪）。
+        """
+        if states is None:
+            states = getattr(self.driver, 'ready_states', ('complete',))  # 读取加载配置对应的就绪状态
+        return self.wait_until(document_ready(states), 'ready', timeout, f"页面未加载完成: {states}")
+
+    @timed
+    def wait_network_quiet(self, idle=None, timeout=None, strict=False):
+        """
+        等待网络静默（资源请求数量在 idle 秒内不再增长）。
+        - 部分页面存在持续的统计上报请求，默认超时后不抛异常，仅返回 False。
+
+        参数:
+            idle (int | float): 静默窗口秒数，默认使用 network_idle。
+            timeout (int | float): 超时时间，默认使用 timeouts['network']。
+            strict (bool): 为 True 时超时抛出 TimeoutException。
+
+        返回:
+            bool: 是否在超时前达到网络静默。
+        """
+        idle = self.network_idle if idle is None else idle  # 未指定时使用默认静默窗口
+        try:
+            return self.wait_until(network_quiet(idle), 'network', timeout, "网络未进入静默状态")
+        except TimeoutException:
+            if strict:
+                raise
+            return False
+
+    @timed
+    def wait_replaced(self, old_element, old_url, timeout=None):
+        """
+        等待页面内容被替换：旧元素失效或 URL 发生变化，任一满足即可。
+        - 用于搜索、翻页等会替换结果区域的操作，之后再等待页面加载完成。
+
+        参数:
+            old_element (WebElement | None): 操作前的旧结果容器，不存在时仅判断 URL。
+            old_url (str): 操作前的 URL。
+        """
+        conditions = [url_changes(old_url)]  # URL 变化条件
+        if old_element is not None:
+            conditions.insert(0, staleness_of(old_element))  # 优先判断旧容器是否失效
+        self.wait_until(any_of(*conditions), 'stale', timeout, "页面内容未发生替换")
+        self.invalidate_cache()  # 页面内容已替换，旧元素全部失效
+        self.wait_ready()  # 等待新页面加载完成
+
+    @timed
+    def new_window(self, known_handles=None):
+        """
+        切换到新打开的窗口，并按浏览器加载配置初始化该窗口（DevTools 设置不会从原窗口继承）。
+        - 指定 known_handles（打开前的窗口句柄集合）时，切换到不在其中的窗口；多个标签页并发时必须指定，
+          否则 window_handles[-1] 可能是其他标签页刚打开的窗口。
+        - 未指定时切换到 window_handles 中的最后一个窗口。
+
+        参数:
+            known_handles (iterable): 打开新窗口前的窗口句柄。
+        """
+        handles = self.driver.window_handles
+        if known_handles is not None:
+            known = set(known_handles)
+            opened = [handle for handle in handles if handle not in known]
+            if not opened:
+                raise NoSuchWindowException("没有新打开的窗口")
+            handle = opened[-1]
+        else:
+            handle = handles[-1]  # 切换到最新打开的窗口
+        self.switch_window(handle)
+        prepare_tab(self.driver)  # 资源屏蔽、缓存开关等设置只对发送到的窗口生效
+
+    @timed
+    def switch_window(self, handle):
+        """
+        切换到指定句柄的窗口，并使元素缓存失效。
+
+        参数:
+            handle (str): 窗口句柄。
         """
-        self.driver.switch_to.window(self.driver.window_handles[-1])  # 切换到最新打开的窗口
+        self.driver.switch_to.window(handle)
+        self.invalidate_cache()  # 切换窗口后旧窗口的元素不可再用
@@ -0,0 +1,134 @@
+"""
+    BasePage层：浏览器级 DevTools 连接，后台线程运行 trio 事件循环并保持一个 WebSocket 连接
+    - 其他线程通过 run 在事件循环中执行协程，通过 session 附加到指定标签页（窗口句柄即 DevTools target id）
+    - 每个标签页的会话互相独立，命令直接发往对应标签页，不需要 WebDriver 的窗口切换
+    - HTTP 录制与回放（replay_page）在会话上监听 Fetch 事件，多标签页（tab_page）在会话上执行脚本与导航
+"""
+import logging  # 日志模块
+import math  # 未指定超时时间时不限时
+import threading  # 后台线程运行事件循环
+
+try:  # trio 随 selenium 安装，DevTools 连接依赖于它
+    import trio
+    from selenium.webdriver.common.bidi import cdp  # selenium 的 DevTools 连接实现
+except ImportError:
+    trio = cdp = None
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+
+def cdp_endpoint(driver):
+    """
+    返回浏览器 DevTools 的 (协议版本号, WebSocket 地址)，与 selenium 的 bidi_connection 取法一致。
+    """
+    caps = driver.caps
+    if caps.get('se:cdp'):  # Selenium Grid 在能力中直接给出地址
+        return caps['se:cdpVersion'].split('.')[0], caps['se:cdp']
+    return driver._get_cdp_details()  # 本地 ChromeDriver：通过 debuggerAddress 查询
+
+
+def command(method, params=None):
+    """
+    将任意 DevTools 命令包装为会话 execute 接受的生成器，结果为原始的返回字典。
+    """
+    result = yield {'method': method, 'params': params or {}}
+    return result
+
+
+class DevTools:
+    """
+    单个浏览器的 DevTools 连接。
+    - start 启动后台线程并建立连接；conn、nursery、devtools 只能在事件循环中使用，其他线程经 run 调用。
+    - 浏览器关闭后连接断开，事件循环随之结束，之后的调用抛出异常。
+
+    参数:
+        driver (WebDriver): 浏览器驱动。
+        name (str): 后台线程名称。
+    """
+
+    def __init__(self, driver, name='devtools'):
+        if trio is None:
+            raise ImportError("DevTools 连接需要安装 trio（selenium 的依赖）")
+        self.driver = driver  # 浏览器驱动
+        self.name = name  # 后台线程名称
+        self.devtools = None  # 与浏览器版本对应的 DevTools 协议模块
+        self.conn = None  # 浏览器级连接
+        self.nursery = None  # 长期运行的任务（如 Fetch 监听）所在的 nursery
+        self.error = None  # 连接失败或断开的原因
+        self._token = None  # 事件循环令牌，其他线程凭此调用
+        self._scope = None  # 取消后关闭连接
+        self._thread = None  # 后台线程
+
+    def start(self, timeout=10):
+        """
+        启动后台线程，连接建立后返回自身。
+        """
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, args=(ready,), name=self.name, daemon=True)
+        self._thread.start()
+        if not ready.wait(timeout) or self._token is None:
+            raise RuntimeError(f"DevTools 连接失败: {self.error}")
+        return self
+
+    def _serve(self, ready):
+        """
+        后台线程入口：运行 trio 事件循环直到被取消或浏览器关闭。
+        """
+        try:
+            trio.run(self._run, ready)
+        except Exception as exc:  # 浏览器关闭时连接断开
+            self.error = exc
+            logger.info("DevTools 连接结束 %s: %s", self.name, exc)
+        finally:
+            ready.set()
+
+    async def _run(self, ready):
+        """
+        建立浏览器级连接，之后保持运行直到被取消。
+        """
+        version, ws_url = cdp_endpoint(self.driver)
+        self.devtools = cdp.import_devtools(version)
+        async with cdp.open_cdp(ws_url) as conn:
+            with trio.CancelScope() as scope:
+                async with trio.open_nursery() as nursery:
+                    self.conn, self.nursery, self._scope = conn, nursery, scope
+                    self._token = trio.lowlevel.current_trio_token()
+                    ready.set()
+                    await trio.sleep_forever()
+
+    def run(self, async_fn, *args):
+        """
+        在事件循环中执行协程函数，阻塞当前线程直到返回；多个线程的调用在事件循环中并发执行。
+        """
+        return trio.from_thread.run(async_fn, *args, trio_token=self._token)
+
+    def session(self, handle):
+        """
+        附加到标签页并返回会话（CdpSession）。
+        """
+        return self.run(self.conn.connect_session, self.devtools.target.TargetID(handle))
+
+    def execute(self, session, method, params=None, timeout=None):
+        """
+        在会话上执行 DevTools 命令并返回结果字典。
+
+        异常:
+            trio.TooSlowError: 超过 timeout 秒未返回。
+            cdp.BrowserError: 浏览器返回协议错误。
+        """
+        async def call():
+            with trio.fail_after(math.inf if timeout is None else timeout):
+                return await session.execute(command(method, params))
+        return self.run(call)
+
+    def close(self):
+        """
+        关闭连接并等待后台线程结束。
+        """
+        if self._scope is not None:
+            try:
+                trio.from_thread.run_sync(self._scope.cancel, trio_token=self._token)
+            except Exception:  # 事件循环已因浏览器关闭而结束
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=5)
@@ -0,0 +1,107 @@
+"""
+    BasePage层：断点续跑，以 (数据行号, 页码) 为单元持久化记录执行进度
+"""
+import logging  # 日志模块
+import os  # 创建检查点目录
+import sqlite3  # 使用 SQLite 持久化进度，每个单元完成后立即提交
+import threading  # 浏览器池并行时保护数据库连接
+import time  # 记录更新时间
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+
+class Checkpoint:
+    """
+    执行进度检查点：记录每个 (数据行号, 页码) 单元的状态，进程崩溃后可从断点继续。
+    - 以关键词在数据源中的行号为主键，重复出现的关键词各自记录进度；关键词本身只作为信息列保存。
+    - 状态为 done 的单元在续跑时跳过；failed 的单元会重新执行。
+    - 每次状态变更立即提交到 SQLite，保证崩溃时已完成的进度不会丢失。
+
+    参数:
+        path (str): 检查点数据库文件路径。
+        resume (bool): 是否续跑；为 False 时清空已有进度重新开始。
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path  # 数据库路径
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()  # 保护数据库连接
+        self._conn = sqlite3.connect(path, check_same_thread=False)  # 允许多个工作线程共用连接
+        self._conn.execute("PRAGMA journal_mode=WAL")  # WAL 模式，提交开销更小
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS units ("
+            " item INTEGER NOT NULL, page INTEGER NOT NULL, keyword TEXT, status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0, error TEXT, updated REAL NOT NULL,"
+            " PRIMARY KEY (item, page))"
+        )
+        if not resume:
+            self._conn.execute("DELETE FROM units")  # 非续跑模式：清空历史进度
+        self._conn.commit()
+        logger.info("检查点: %s，续跑模式: %s，已完成单元: %d", path, resume, self.count('done'))
+
+    def done_pages(self, item):
+        """
+        返回数据行已完成的页码集合。
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page FROM units WHERE item = ? AND status = 'done'", (item,)).fetchall()
+        return {page for (page,) in rows}
+
+    def todo(self, item, pages):
+        """
+        返回数据行尚未完成的页码（保持 pages 的顺序），失败的页码会重新执行。
+
+        参数:
+            item (int): 数据行号。
+            pages (iterable[int]): 需要执行的全部页码。
+        """
+        done = self.done_pages(item)
+        return [page for page in pages if page not in done]
+
+    def _update(self, item, page, keyword, status, error=None):
+        """
+        写入单元状态并立即提交，累计执行次数。
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO units (item, page, keyword, status, attempts, error, updated)"
+                " VALUES (?, ?, ?, ?, 1, ?, ?)"
+                " ON CONFLICT (item, page) DO UPDATE SET keyword = excluded.keyword, status = excluded.status,"
+                " attempts = attempts + 1, error = excluded.error, updated = excluded.updated",
+                (item, page, keyword, status, error, time.time()))
+            self._conn.commit()
+
+    def mark_done(self, item, page, keyword=None):
+        """
+        标记单元已完成。
+        """
+        self._update(item, page, keyword, 'done')
+
+    def mark_failed(self, item, page, error, keyword=None):
+        """
+        标记单元执行失败，并记录错误信息。
+        """
+        self._update(item, page, keyword, 'failed', repr(error))
+
+    def count(self, status):
+        """
+        统计指定状态的单元数量。
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM units WHERE status = ?", (status,)).fetchone()[0]
+
+    def failed(self):
+        """
+        返回所有失败单元：[(数据行号, 关键词, 页码, 错误信息), ...]。
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT item, keyword, page, error FROM units WHERE status = 'failed' ORDER BY updated").fetchall()
+
+    def close(self):
+        """
+        关闭数据库连接。
+        """
+        logger.info("检查点关闭：已完成 %d 个单元，失败 %d 个单元", self.count('done'), self.count('failed'))
+        self._conn.close()
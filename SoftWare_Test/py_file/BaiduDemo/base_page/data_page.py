@@ -0,0 +1,340 @@
+"""
+    BasePage层：测试数据加载，按行流式读取 YAML / CSV / XLSX 数据源，并将解析结果缓存到磁盘
+"""
+import csv  # 读取 CSV 文件
+import hashlib  # 计算文件内容哈希，作为缓存键的一部分
+import json  # 缓存文件按 JSON Lines 格式存储
+import logging  # 日志模块
+import os  # 文件路径与文件状态
+import yaml  # 读取 YAML 文件
+
+try:  # openpyxl 为可选依赖，仅读取 XLSX 时需要
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # 项目根目录（BaiduDemo）
+DATA_DIR = os.path.join(PROJECT_ROOT, 'test_data')  # 默认测试数据目录
+CACHE_DIR = os.path.join(PROJECT_ROOT, 'temps', 'data_cache')  # 解析结果缓存目录
+
+
+def resolve_path(path):
+    """
+    解析测试数据路径：绝对路径直接返回，相对路径基于数据目录。
+    - 数据目录默认为 test_data，可通过环境变量 BAIDU_DEMO_DATA_DIR 指定。
+    """
+    if os.path.isabs(path):
+        return path
+    return os.path.join(os.environ.get('BAIDU_DEMO_DATA_DIR', DATA_DIR), path)
+
+
+def read_csv(path, **_):
+    """
+    逐行读取 CSV 文件，首行为表头，每行返回一个字典。
+    """
+    with open(path, 'r', encoding='utf-8-sig', newline='') as file:  # utf-8-sig 兼容带 BOM 的文件
+        for row in csv.DictReader(file):
+            yield dict(row)
+
+
+def read_xlsx(path, sheet=None, **_):
+    """
+    以只读模式逐行读取 XLSX 工作表，首行为表头，每行返回一个字典，跳过空行。
+    """
+    if openpyxl is None:
+        raise ImportError("读取 XLSX 需要安装 openpyxl")
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)  # 只读模式按需加载行
+    try:
+        rows = (workbook[sheet] if sheet else workbook.active).iter_rows(values_only=True)
+        header = [str(cell) for cell in next(rows, ())]
+        for row in rows:
+            if any(cell is not None for cell in row):
+                yield dict(zip(header, row))
+    finally:
+        workbook.close()
+
+
+def _sequence_items(loader):
+    """
+    逐项组装并构造当前位置的列表（下一个事件为 SequenceStartEvent）中的元素，每次只在内存中保留一项。
+    - 锚点登记在 loader 上，后面的项仍可通过别名引用前面项中的锚点。
+    """
+    loader.get_event()  # SequenceStartEvent
+    while not loader.check_event(yaml.SequenceEndEvent):
+        yield loader.construct_document(loader.compose_node(None, None))
+    loader.get_event()  # SequenceEndEvent
+
+
+def _mapping_items(loader, key):
+    """
+    在当前位置的映射（下一个事件为 MappingStartEvent）中找到 key，逐项产出其列表值中的元素。
+    - 其他键的值只组装为节点（保留其中的锚点）后丢弃，不构造对象。
+    """
+    loader.get_event()  # MappingStartEvent
+    while not loader.check_event(yaml.MappingEndEvent):
+        name = loader.compose_node(None, None)
+        matched = isinstance(name, yaml.ScalarNode) and name.value == key
+        if matched and loader.check_event(yaml.SequenceStartEvent):
+            yield from _sequence_items(loader)
+            continue
+        value = loader.compose_node(None, None)
+        if matched:  # 值不是列表（如空值）时按整体构造
+            yield from loader.construct_document(value) or []
+    loader.get_event()  # MappingEndEvent
+
+
+def _skip_node(loader):
+    """
+    跳过当前位置的一个节点，只消费事件，不组装也不构造。
+    - 其中带锚点的节点仍会组装并登记，保证节点之外的别名可以引用。
+    """
+    depth = 0  # 已进入的集合层数
+    while True:
+        event = loader.peek_event()
+        if getattr(event, 'anchor', None) is not None and not isinstance(event, yaml.AliasEvent):
+            loader.compose_node(None, None)  # 消费整个带锚点的子树并登记锚点
+        else:
+            loader.get_event()
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                depth += 1
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+        if depth == 0:
+            return
+
+
+def read_yaml(path, key=None, **_):
+    """
+    按解析事件流式读取 YAML 文件，行列表中的元素逐项构造，不会一次性构造整个文档。
+    每个文档按以下规则产出行：
+    - 指定 key 时，产出文档中 key 对应列表的每一项。
+    - 文档为列表时，产出列表的每一项。
+    - 否则整个文档作为一行（多文档文件可借此按行流式读取）。
+    """
+    with open(path, 'r', encoding='utf-8-sig') as file:
+        loader = yaml.SafeLoader(file)
+        try:
+            loader.get_event()  # StreamStartEvent
+            while not loader.check_event(yaml.StreamEndEvent):
+                loader.get_event()  # DocumentStartEvent
+                if key is None and loader.check_event(yaml.SequenceStartEvent):
+                    yield from _sequence_items(loader)
+                elif key is not None and loader.check_event(yaml.MappingStartEvent):
+                    yield from _mapping_items(loader, key)
+                else:
+                    doc = loader.construct_document(loader.compose_node(None, None))
+                    if key is None and doc is not None:
+                        yield doc
+                loader.get_event()  # DocumentEndEvent
+                loader.anchors = {}  # 锚点只在文档内有效
+        finally:
+            loader.dispose()
+
+
+def read_settings(path, skip=()):
+    """
+    读取 YAML 配置文档的顶层设置，skip 中的顶层键（如内联的关键词列表 text_list）只做词法扫描，不构造对象。
+    - 被跳过的值只消费解析事件，配置中的大列表不会被加载到内存；
+      其中带锚点的节点仍会组装，其他键通过别名引用时可以正常解析。
+
+    参数:
+        path (str): 配置文件路径。
+        skip (iterable): 需要跳过的顶层键。
+
+    返回:
+        dict: 配置字典（不含被跳过的键）。
+    """
+    skip = set(skip)
+    with open(path, 'r', encoding='utf-8-sig') as file:
+        loader = yaml.SafeLoader(file)
+        try:
+            loader.get_event()  # StreamStartEvent
+            if loader.check_event(yaml.StreamEndEvent):  # 空文件
+                return {}
+            loader.get_event()  # DocumentStartEvent
+            if not loader.check_event(yaml.MappingStartEvent):
+                return loader.construct_document(loader.compose_node(None, None)) or {}
+            start = loader.get_event()
+            tag = start.tag if start.tag not in (None, '!') else loader.resolve(yaml.MappingNode, None, start.implicit)
+            node = yaml.MappingNode(tag, [], start.start_mark, None, flow_style=start.flow_style)  # 只含保留的键
+            if start.anchor is not None:
+                loader.anchors[start.anchor] = node
+            while not loader.check_event(yaml.MappingEndEvent):
+                name = loader.compose_node(node, None)
+                if isinstance(name, yaml.ScalarNode) and name.value in skip:
+                    _skip_node(loader)  # 丢弃该键，并跳过紧随其后的值节点
+                else:
+                    node.value.append((name, loader.compose_node(node, name)))
+            node.end_mark = loader.get_event().end_mark
+            return loader.construct_document(node) or {}
+        finally:
+            loader.dispose()
+
+
+READERS = {'.csv': read_csv, '.xlsx': read_xlsx, '.yaml': read_yaml, '.yml': read_yaml}  # 扩展名 -> 读取函数
+
+
+def file_digest(path):
+    """
+    分块计算文件内容的 SHA-1，不会一次性读入整个文件。
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DataSource:
+    """
+    测试数据源：可重复迭代，每次迭代都按行流式产出字典，不在内存中保留整个数据集。
+    - 首次迭代时一边解析一边写入缓存文件（JSON Lines），完整读完后才生效。
+    - 之后的迭代在源文件修改时间与大小未变（或内容哈希未变）时直接读取缓存，跳过解析。
+    - 分片读取时，第一个执行的分片遍历一次数据，同时写出所有分片的缓存，其余分片只读取自己的行。
+
+    参数:
+        path (str): 数据文件路径，相对路径基于数据目录。
+        key (str): YAML 数据中行列表所在的键。
+        sheet (str): XLSX 工作表名称，默认活动工作表。
+        rename (dict): 字段重命名，如 {'wd': 'content'}。
+        cache (bool): 是否启用解析缓存。
+    """
+
+    def __init__(self, path, key=None, sheet=None, rename=None, cache=True, cache_dir=CACHE_DIR):
+        self.path = resolve_path(path)  # 数据文件绝对路径
+        self.key = key  # YAML 行列表键
+        self.sheet = sheet  # XLSX 工作表
+        self.rename = rename or {}  # 字段重命名
+        self.cache = cache  # 是否启用缓存
+        ext = os.path.splitext(self.path)[1].lower()
+        if ext not in READERS:
+            raise ValueError(f"不支持的数据文件格式: {self.path}")
+        self.reader = READERS[ext]  # 读取函数
+        source_id = f"{os.path.abspath(self.path)}|{key}|{sheet}"
+        self.cache_path = os.path.join(cache_dir, hashlib.sha1(source_id.encode('utf-8')).hexdigest() + '.jsonl')
+
+    def __iter__(self):
+        yield from self._renamed(self._rows())
+
+    def _renamed(self, rows):
+        """
+        按 rename 重命名字段。
+        """
+        for row in rows:
+            yield {self.rename.get(k, k): v for k, v in row.items()} if self.rename else row
+
+    def _rows(self):
+        """
+        未重命名的原始行：缓存有效时读取缓存，否则解析源文件。
+        """
+        if self.cache and self._valid(self.cache_path):
+            logger.info("使用测试数据缓存: %s", self.path)
+            return self._read_cache(self.cache_path)
+        return self._parse()
+
+    def shard(self, index, count):
+        """
+        流式产出第 index 个分片的行（行号对 count 取模等于 index，第 k 行在整个数据源中的行号为 k * count + index）。
+        - 分片缓存有效时只读取本分片的缓存文件。
+        - 否则遍历一次数据源，同时将每一行写入所属分片的缓存文件，后续分片直接读取，不再重复遍历。
+        """
+        if count <= 1:
+            yield from self
+            return
+        if not self.cache:
+            for position, row in enumerate(self):
+                if position % count == index:
+                    yield row
+            return
+        paths = [self._shard_path(i, count) for i in range(count)]
+        if self._valid(paths[index]):
+            logger.info("使用测试数据分片缓存: %s（%d/%d）", self.path, index + 1, count)
+            yield from self._renamed(self._read_cache(paths[index]))
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_paths = [f"{path}.{os.getpid()}.tmp" for path in paths]
+        files = []
+        completed = False
+        try:
+            meta = json.dumps(self._meta(file_digest(self.path))) + '\n'
+            for tmp_path in tmp_paths:
+                files.append(open(tmp_path, 'w', encoding='utf-8'))
+                files[-1].write(meta)
+            for position, row in enumerate(self._rows()):  # 只遍历一次数据源
+                files[position % count].write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+                if position % count == index:
+                    yield from self._renamed([row])
+            completed = True
+        finally:
+            for file in files:
+                file.close()
+            for tmp_path, path in zip(tmp_paths, paths):
+                if completed:
+                    os.replace(tmp_path, path)  # 原子替换，避免并发读到半成品
+                elif os.path.exists(tmp_path):
+                    os.remove(tmp_path)  # 中途停止迭代时丢弃不完整的分片缓存
+
+    def _shard_path(self, index, count):
+        """
+        分片缓存文件路径。
+        """
+        return f"{os.path.splitext(self.cache_path)[0]}.shard{index}of{count}.jsonl"
+
+    def _meta(self, digest=None):
+        """
+        源文件的缓存校验信息：修改时间、大小与（可选的）内容哈希。
+        """
+        stat = os.stat(self.path)
+        return {'mtime': stat.st_mtime, 'size': stat.st_size, 'sha1': digest}
+
+    def _valid(self, cache_path):
+        """
+        缓存文件是否存在且与源文件一致。
+        """
+        if not os.path.exists(cache_path):
+            return False
+        with open(cache_path, 'r', encoding='utf-8') as file:
+            cached = json.loads(file.readline() or 'null')
+        if not cached:
+            return False
+        current = self._meta()
+        if (cached['mtime'], cached['size']) != (current['mtime'], current['size']):
+            # 修改时间变化但内容可能未变（如重新检出），大小一致时再比较内容哈希
+            if cached['size'] != current['size'] or cached['sha1'] != file_digest(self.path):
+                return False
+        return True
+
+    @staticmethod
+    def _read_cache(cache_path):
+        """
+        逐行读取缓存文件（跳过首行校验信息）。
+        """
+        with open(cache_path, 'r', encoding='utf-8') as file:
+            file.readline()
+            for line in file:
+                yield json.loads(line)
+
+    def _parse(self):
+        """
+        流式解析源文件；启用缓存时同时写入临时缓存文件，完整读完后替换正式缓存。
+        """
+        logger.info("解析测试数据: %s", self.path)
+        if not self.cache:
+            yield from self.reader(self.path, key=self.key, sheet=self.sheet)
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        completed = False
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as cache:
+                cache.write(json.dumps(self._meta(file_digest(self.path))) + '\n')
+                for row in self.reader(self.path, key=self.key, sheet=self.sheet):
+                    cache.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+                    yield row
+            completed = True
+            os.replace(tmp_path, self.cache_path)  # 原子替换，避免并发读到半成品
+        finally:
+            if not completed and os.path.exists(tmp_path):
+                os.remove(tmp_path)  # 中途停止迭代时丢弃不完整的缓存
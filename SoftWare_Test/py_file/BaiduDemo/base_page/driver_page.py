@@ -1,20 +1,95 @@
 """
     page_object 页面对象类(page_object)：浏览器驱动类
 """
+import logging  # 日志模块
 from selenium.webdriver.chrome.options import Options  # 从selenium库中导入Chrome浏览器选项类
 from selenium.webdriver.chrome.service import Service  # 从selenium库中导入Chrome浏览器服务类
 from selenium.webdriver import Chrome  # 从selenium库中导入Chrome浏览器类
+from base_page.metrics_page import instrument  # 导入命令耗时统计
 
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
 
-def driver_():  # 定义一个返回Chrome浏览器对象的函数
+# 常见的广告统计、字体、音视频资源地址模式，供 Network.setBlockedURLs 使用（支持 * 通配符）
+TRACKING_URLS = ['*hm.baidu.com*', '*hmcdn.baidu.com*', '*sp0.baidu.com/*/w.gif*', '*pos.baidu.com*', '*cpro.baidu.com*']
+FONT_URLS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot']
+MEDIA_URLS = ['*.mp4', '*.webm', '*.m3u8', '*.ts', '*.mp3', '*.flv']
+IMAGE_URLS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico']
+
+# 浏览器加载配置：控制无头模式、页面加载策略、资源屏蔽、图片加载与缓存
+PROFILES = {
+    'full': {  # 完整加载，与原有行为一致：有界面、等待全部资源加载、不屏蔽任何资源
+        'headless': False,
+        'page_load_strategy': 'normal',
+        'block_urls': [],
+        'images': True,
+        'cache': True,
+        'ready_states': ('complete',),
+    },
+    'visual': {  # 截图场景：无头、DOM 就绪即返回，屏蔽统计、字体与音视频，保留图片
+        'headless': True,
+        'page_load_strategy': 'eager',
+        'block_urls': TRACKING_URLS + FONT_URLS + MEDIA_URLS,
+        'images': True,
+        'cache': True,
+        'ready_states': ('interactive', 'complete'),
+    },
+    'extract-only': {  # 只提取标题：无头、不等待页面加载，屏蔽图片及所有非必要资源
+        'headless': True,
+        'page_load_strategy': 'none',
+        'block_urls': TRACKING_URLS + FONT_URLS + MEDIA_URLS + IMAGE_URLS,
+        'images': False,
+        'cache': True,
+        'ready_states': ('interactive', 'complete'),
+    },
+}
+
+
+def profile_commands(profile):
+    """
+    返回加载配置需要在每个标签页上执行的 DevTools 命令：[(命令, 参数), ...]。
+    """
+    settings = PROFILES[profile]
+    if not settings['block_urls'] and settings['cache']:
+        return []
+    return [
+        ('Network.enable', {}),  # 启用 DevTools 网络域，资源屏蔽与缓存设置依赖于此
+        ('Network.setBlockedURLs', {'urls': settings['block_urls']}),  # 按地址模式屏蔽资源
+        ('Network.setCacheDisabled', {'cacheDisabled': not settings['cache']}),  # 缓存开关
+    ]
+
+
+def prepare_tab(driver):
+    """
+    初始化驱动当前所在的标签页：执行 driver.cdp_commands 中的 DevTools 命令，再调用 driver.tab_setup 中登记的函数。
+    - DevTools 设置只对发送到的标签页生效，新标签页不会继承，代码中每次新建标签页并切换过去后都应调用。
+    - tab_setup 供其他模块登记按标签页生效的功能，如 HTTP 录制与回放的 Fetch 拦截，函数签名为 setup(driver)。
+    """
+    for cmd, params in getattr(driver, 'cdp_commands', ()):
+        driver.execute_cdp_cmd(cmd, params)
+    for setup in list(getattr(driver, 'tab_setup', ())):
+        setup(driver)
+
+
+def driver_(profile='full', headless=None, strategy=None):  # 定义一个返回Chrome浏览器对象的函数
     """
     配置并启动Chrome浏览器，返回一个Chrome WebDriver对象。
     - 通过添加启动选项来优化浏览器的配置，避免被识别为自动化工具。
+    - 按加载配置（PROFILES）设置无头模式、页面加载策略、资源屏蔽、图片与缓存。
     - 返回一个已配置的Chrome浏览器实例，用于后续的自动化测试操作。
 
+    参数:
+        profile (str): 加载配置名称，可选 'full'、'visual'、'extract-only'。
+        headless (bool): 是否以无头模式启动，为 None 时使用加载配置中的设置。
+        strategy (str): 页面加载策略，为 None 时使用加载配置中的设置；多标签页并发时需使用 'none'。
+
     返回:
-        Chrome: 配置好的Chrome WebDriver对象。
+        Chrome: 配置好的Chrome WebDriver对象，load_profile / ready_states 属性记录所用配置，
+            cdp_commands / tab_setup 属性供 prepare_tab 初始化新标签页。
     """
+    settings = PROFILES[profile]  # 读取加载配置，名称错误时直接抛出 KeyError
+    if headless is None:
+        headless = settings['headless']  # 未显式指定时使用配置中的无头设置
+
     opt = Options()  # 创建一个Options对象，用于存储浏览器启动选项
 
     opt.add_argument("--disable-blink-features=AutomationControlled")  # 禁用浏览器的自动化控制特性，使检测自动化的脚本更难
@@ -24,7 +99,23 @@ def driver_():  # 定义一个返回Chrome浏览器对象的函数
     opt.add_argument('--disable-extensions')  # 禁用所有浏览器扩展，确保测试环境的纯净
     opt.add_argument('--disable-webgl')  # 禁用WebGL，防止图形渲染相关的检测或异常
     opt.add_argument('--no-sandbox')  # 禁用沙箱模式，通常用于提高稳定性或解决某些权限问题
-    opt.add_argument('start-maximized')  # 启动浏览器时窗口最大化，确保网页元素的可见性和交互性
+    if headless:
+        opt.add_argument('--headless=new')  # 无头模式启动，不创建可见窗口
+        opt.add_argument('--window-size=1920,1080')  # 无头模式下无法最大化，显式指定窗口尺寸
+    else:
+        opt.add_argument('start-maximized')  # 启动浏览器时窗口最大化，确保网页元素的可见性和交互性
+    opt.page_load_strategy = strategy or settings['page_load_strategy']  # 页面加载策略：normal / eager / none
+    if not settings['images']:
+        opt.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})  # 禁止加载图片
 
     service_path = r'D:\Tianyi_Cloud\learn\Py_ProJect\FishC_Python\Python_file\driver\chromedriver.exe'  # 指定ChromeDriver的路径
-    return Chrome(service=Service(service_path), options=opt)  # 返回一个使用指定服务和选项启动的Chrome浏览器对象
+    driver = Chrome(service=Service(service_path), options=opt)  # 使用指定服务和选项启动Chrome浏览器
+
+    driver.cdp_commands = profile_commands(profile)  # 每个标签页都需要执行的 DevTools 命令
+    driver.tab_setup = []  # 其他模块登记的标签页初始化函数
+    prepare_tab(driver)  # 初始化第一个标签页
+    driver.load_profile = profile  # 记录加载配置名称
+    driver.ready_states = settings['ready_states']  # 记录页面视为就绪的 readyState，供 BasePage.wait_ready 使用
+    instrument(driver)  # 安装命令耗时统计
+    logger.info("浏览器已启动，加载配置: %s", profile)
+    return driver  # 返回配置好的Chrome浏览器对象
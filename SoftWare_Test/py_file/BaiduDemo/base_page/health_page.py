@@ -0,0 +1,207 @@
+"""
+    BasePage层：浏览器健康监控，按步数采样 DevTools 性能指标，超过阈值时重启浏览器并重新绑定页面对象
+"""
+import logging  # 日志模块
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException  # 会话失效相关异常
+from urllib3.exceptions import HTTPError  # 与 chromedriver 的连接异常
+from base_page.metrics_page import timed  # 耗时统计装饰器，记录重启耗时
+
+try:  # psutil 为可选依赖，仅用于采样浏览器进程内存
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+MB = 1024 * 1024  # 字节换算为 MB
+LOST_MARKERS = ('invalid session id', 'session deleted', 'chrome not reachable', 'disconnected',
+                'target crashed', 'tab crashed', 'no such window')  # 会话已不可用的错误信息片段
+
+
+def session_lost(exc):
+    """
+    判断异常是否表示浏览器会话已不可用（会话失效、浏览器或标签页崩溃、与 chromedriver 断开），
+    此时在同一会话上重试没有意义，需要先重启浏览器。
+    """
+    if isinstance(exc, (InvalidSessionIdException, HTTPError, ConnectionError)):
+        return True
+    if isinstance(exc, WebDriverException):
+        message = (exc.msg or str(exc)).lower()
+        return any(marker in message for marker in LOST_MARKERS)
+    return False
+
+
+class HealthMonitor:
+    """
+    浏览器健康监控：长时间运行时浏览器内存与 DOM 持续增长，页面越来越慢，按阈值自动重启浏览器。
+    - 每执行 every 个步骤采样一次 Performance.getMetrics（JS 堆、DOM 节点数）与浏览器进程内存（需要 psutil）。
+    - 任一指标超过阈值，或累计步骤数达到 max_steps 时重启：新建浏览器、重新绑定已登记的页面对象、恢复当前地址。
+    - 阈值为 0 或 None 时不检查该项。
+
+    参数:
+        factory (callable): 创建浏览器驱动的函数，如 lambda: driver_(profile)。
+        every (int): 采样间隔（步骤数）。
+        max_steps (int): 单个浏览器最多执行的步骤数。
+        max_heap_mb (int | float): JS 堆使用量上限（MB）。
+        max_nodes (int): DOM 节点数上限。
+        max_rss_mb (int | float): 浏览器进程（含子进程）常驻内存上限（MB）。
+    """
+
+    def __init__(self, factory, every=20, max_steps=0, max_heap_mb=0, max_nodes=0, max_rss_mb=0):
+        self.factory = factory  # 浏览器驱动创建函数
+        self.every = every  # 采样间隔
+        self.max_steps = max_steps  # 步骤数上限
+        self.limits = {'heap_mb': max_heap_mb, 'nodes': max_nodes, 'rss_mb': max_rss_mb}  # 指标阈值
+        self.driver = None  # 当前浏览器驱动
+        self.pages = []  # 已登记的页面对象，重启后重新绑定到新驱动
+        self.steps = 0  # 当前浏览器已执行的步骤数
+        self.recycles = 0  # 重启次数
+        self.samples = []  # 采样记录
+
+    def start(self):
+        """
+        创建浏览器驱动。
+        """
+        self.driver = self._create()
+        return self.driver
+
+    def _create(self):
+        """
+        创建并准备浏览器驱动：启用 DevTools 性能域。
+        """
+        driver = self.factory()
+        driver.execute_cdp_cmd('Performance.enable', {})  # 启用后 Performance.getMetrics 才有数据
+        return driver
+
+    def spawn(self, factory, driver=None, **overrides):
+        """
+        按当前监控的阈值为另一个浏览器（如浏览器池的工作会话、多标签页中的标签页）创建健康监控。
+
+        参数:
+            factory (callable): 新监控重启时创建驱动的函数。
+            driver (WebDriver): 已创建的驱动，新监控直接接管；为 None 时需调用 start 创建。
+            **overrides: 覆盖的阈值，如多标签页共用一个浏览器进程时 max_rss_mb=0。
+
+        返回:
+            HealthMonitor: 新的健康监控。
+        """
+        options = {'every': self.every, 'max_steps': self.max_steps, 'max_heap_mb': self.limits['heap_mb'],
+                   'max_nodes': self.limits['nodes'], 'max_rss_mb': self.limits['rss_mb'], **overrides}
+        monitor = HealthMonitor(factory, **options)
+        if driver is not None:
+            driver.execute_cdp_cmd('Performance.enable', {})
+            monitor.driver = driver
+        return monitor
+
+    def bind(self, pages):
+        """
+        登记页面对象，重启浏览器后统一绑定到新驱动。
+
+        参数:
+            pages (dict): build_pages 返回的页面对象；不是当前驱动页面对象的值（如测试数据）会被忽略。
+
+        返回:
+            dict: 原样返回 pages，便于在构造时直接登记。
+        """
+        self.pages.extend(page for page in pages.values() if getattr(page, 'driver', None) is self.driver)
+        return pages
+
+    def sample(self):
+        """
+        采样当前浏览器的性能指标。
+
+        返回:
+            dict: heap_mb / nodes / rss_mb（未安装 psutil 时为 None）/ steps。
+        """
+        self.driver.execute_cdp_cmd('Performance.enable', {})  # 当前标签页可能是翻页时切换过去的新标签页，需重新启用
+        metrics = self.driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+        values = {item['name']: item['value'] for item in metrics}
+        sample = {
+            'heap_mb': round(values.get('JSHeapUsedSize', 0) / MB, 1),  # JS 堆使用量
+            'nodes': int(values.get('Nodes', 0)),  # DOM 节点数
+            'rss_mb': self._rss_mb(),  # 浏览器进程内存
+            'steps': self.steps,  # 当前浏览器已执行的步骤数
+        }
+        self.samples.append(sample)
+        return sample
+
+    def _rss_mb(self):
+        """
+        统计 chromedriver 启动的所有浏览器进程的常驻内存；未安装 psutil 或无法获取进程时返回 None。
+        """
+        service = getattr(self.driver, 'service', None)
+        pid = getattr(getattr(service, 'process', None), 'pid', None)
+        if psutil is None or pid is None:
+            return None
+        try:
+            children = psutil.Process(pid).children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for proc in children:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:  # 进程已退出
+                pass
+        return round(total / MB, 1)
+
+    def step(self):
+        """
+        记录执行了一个步骤，到达采样间隔时检查健康状况，需要时重启浏览器。
+
+        返回:
+            bool: 是否重启了浏览器。
+        """
+        self.steps += 1
+        reason = None
+        if self.max_steps and self.steps >= self.max_steps:
+            reason = f"已执行 {self.steps} 个步骤"
+        elif self.every and self.steps % self.every == 0:
+            sample = self.sample()
+            logger.info("浏览器健康采样: %s", sample)
+            for name, limit in self.limits.items():
+                if limit and sample[name] is not None and sample[name] > limit:
+                    reason = f"{name}={sample[name]} 超过上限 {limit}"
+                    break
+        if reason is None:
+            return False
+        self.recycle(reason)
+        return True
+
+    @timed
+    def recycle(self, reason=''):
+        """
+        重启浏览器：新建驱动，重新初始化已登记的页面对象，打开原来的地址，最后关闭旧浏览器。
+
+        参数:
+            reason (str): 重启原因，写入日志。
+        """
+        old = self.driver
+        try:
+            url = old.current_url
+        except Exception:  # 旧浏览器已无响应时无法恢复地址
+            url = None
+        logger.info("重启浏览器（%s），当前地址: %s", reason, url)
+        self.driver = self._create()
+        for page in self.pages:
+            page.__init__(self.driver)  # 重新执行初始化，恢复隐式等待等驱动设置
+        if url and url.startswith('http'):
+            if self.pages:
+                self.pages[0].open(url)  # 通过页面对象打开，等待页面就绪
+            else:
+                self.driver.get(url)
+        try:
+            getattr(old, 'discard', old.quit)()  # 从浏览器服务借用的会话交还服务关闭并补充，其余直接关闭
+        except Exception as exc:  # 旧浏览器可能已经崩溃
+            logger.warning("关闭旧浏览器失败: %s", exc)
+        self.steps = 0
+        self.recycles += 1
+
+    def close(self):
+        """
+        关闭当前浏览器。
+        """
+        logger.info("浏览器健康监控结束，共重启 %d 次", self.recycles)
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
@@ -0,0 +1,317 @@
+"""
+    BasePage层：HTTP 提取后端的基础设施，不启动浏览器，直接请求搜索结果页并解析标题与链接
+    - HttpClient：按主机维护长连接池的 HTTP 客户端（标准库 http.client，线程安全）
+    - SerpParser：基于 html.parser 的搜索结果页解析器，提取 <h3> 标题、链接与分页地址
+    - HttpSession：相当于浏览器驱动，保存当前页面地址与解析结果
+    - HttpPage：HTTP 页面对象的基类，与 BasePage 对应
+    - run_concurrently：在 asyncio 事件循环上并发执行阻塞任务
+"""
+import asyncio  # 事件循环，用于并发执行关键词
+import gzip  # 解压 gzip 响应
+import http.client  # 标准库 HTTP 客户端
+import logging  # 日志模块
+import threading  # 连接池锁
+import zlib  # 解压 deflate 响应
+from http.cookies import SimpleCookie  # 解析 Set-Cookie
+from html.parser import HTMLParser  # 标准库 HTML 解析器
+from urllib.parse import urljoin, urlsplit  # 地址拼接与拆分
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+DEFAULT_HEADERS = {  # 模拟浏览器的默认请求头
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                  'Chrome/124.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'zh-CN,zh;q=0.9',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+REDIRECT_STATUS = {301, 302, 303, 307, 308}  # 需要跟随的重定向状态码
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+class NeedsBrowser(Exception):
+    """
+    页面需要执行 JavaScript 才能得到结果（如安全验证页、脚本渲染页），应回退到浏览器后端。
+    """
+
+
+class HttpResponse:
+    """
+    HTTP 响应。
+
+    属性:
+        status (int): 状态码。
+        url (str): 最终地址（跟随重定向后）。
+        text (str): 解码后的响应正文。
+    """
+
+    def __init__(self, status, url, text):
+        self.status = status  # 状态码
+        self.url = url  # 最终地址
+        self.text = text  # 响应正文
+
+
+class HttpClient:
+    """
+    长连接 HTTP 客户端：按 (协议, 主机, 端口) 复用空闲连接，多线程共享。
+
+    参数:
+        max_per_host (int): 每个主机保留的最大空闲连接数。
+        timeout (int | float): 连接与读取超时（秒）。
+        headers (dict): 额外的请求头。
+    """
+
+    def __init__(self, max_per_host=8, timeout=10, headers=None):
+        self.max_per_host = max_per_host  # 每个主机的空闲连接上限
+        self.timeout = timeout  # 超时时间
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}  # 请求头
+        self.cookies = {}  # 会话 Cookie（只访问单一站点，不区分域名）
+        self.requests = 0  # 请求次数
+        self.connects = 0  # 新建连接次数，与请求次数对比可看出连接复用情况
+        self._idle = {}  # (scheme, host, port) -> 空闲连接列表
+        self._lock = threading.Lock()  # 保护连接池、Cookie 与计数
+
+    def _connect(self, key):
+        """
+        新建连接。
+        """
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        with self._lock:
+            self.connects += 1
+        return cls(host, port, timeout=self.timeout)
+
+    def _acquire(self, key):
+        """
+        取出一个空闲连接，没有时新建。
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+        return self._connect(key)
+
+    def _release(self, key, conn):
+        """
+        归还连接；空闲连接已满时关闭。
+        """
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _send(self, conn, path, headers):
+        """
+        发送请求并读取完整响应。
+        """
+        conn.request('GET', path, headers=headers)
+        resp = conn.getresponse()
+        return resp, resp.read()
+
+    def get(self, url, redirects=5):
+        """
+        发送 GET 请求，自动跟随重定向、保存 Cookie 并解压响应。
+
+        参数:
+            url (str): 请求地址。
+            redirects (int): 最多跟随的重定向次数。
+
+        返回:
+            HttpResponse: 响应对象。
+        """
+        for _ in range(redirects + 1):
+            parts = urlsplit(url)
+            key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+            path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+            headers = dict(self.headers)
+            with self._lock:
+                if self.cookies:
+                    headers['Cookie'] = '; '.join(f"{k}={v}" for k, v in self.cookies.items())
+                self.requests += 1
+            conn = self._acquire(key)
+            try:
+                resp, body = self._send(conn, path, headers)
+            except (http.client.HTTPException, OSError):  # 复用的连接可能已被服务端关闭，新建连接重试一次
+                conn.close()
+                conn = self._connect(key)
+                resp, body = self._send(conn, path, headers)
+            cookies = SimpleCookie()
+            for header in resp.headers.get_all('Set-Cookie') or []:
+                cookies.load(header)
+            with self._lock:
+                self.cookies.update({name: morsel.value for name, morsel in cookies.items()})
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            location = resp.headers.get('Location')
+            if resp.status in REDIRECT_STATUS and location:
+                url = urljoin(url, location)  # 跟随重定向
+                continue
+            encoding = resp.headers.get('Content-Encoding', '')
+            if encoding == 'gzip':
+                body = gzip.decompress(body)
+            elif encoding == 'deflate':
+                body = zlib.decompress(body)
+            charset = resp.headers.get_content_charset() or 'utf-8'
+            return HttpResponse(resp.status, url, body.decode(charset, errors='replace'))
+        raise http.client.HTTPException(f"重定向次数过多: {url}")
+
+    def close(self):
+        """
+        关闭所有空闲连接。
+        """
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+
+class SerpParser(HTMLParser):
+    """
+    搜索结果页解析器，解析后提供：
+        titles (list[dict]): [{'text': 标题文本, 'href': 标题内第一个链接的绝对地址}, ...]
+        pages (dict): {页码: 分页链接绝对地址}，来自 id="page" 区域中的链接
+        title (str): 页面 <title>
+        has_results (bool): 是否存在结果容器 id="content_left"
+    """
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url  # 用于将相对地址转为绝对地址
+        self.titles = []  # 标题记录
+        self.pages = {}  # 页码 -> 链接
+        self.title = ''  # 页面标题
+        self.has_results = False  # 是否有结果容器
+        self._h3 = None  # 当前正在解析的 <h3>
+        self._in_title = False  # 是否处于 <title> 中
+        self._page_depth = 0  # 处于 id="page" 区域内的标签深度，0 表示不在区域内
+        self._page_link = None  # 分页区域内当前链接的 [href, 文本]
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if attrs.get('id') == 'content_left':
+            self.has_results = True
+        if self._page_depth and tag not in VOID_TAGS:
+            self._page_depth += 1
+        elif attrs.get('id') == 'page':
+            self._page_depth = 1  # 进入分页区域
+        if tag == 'title':
+            self._in_title = True
+        elif tag == 'h3':
+            self._h3 = {'text': [], 'href': None}
+        elif tag == 'a' and attrs.get('href'):
+            href = urljoin(self.base_url, attrs['href'])
+            if self._h3 is not None and self._h3['href'] is None:
+                self._h3['href'] = href  # 标题内第一个链接
+            if self._page_depth:
+                self._page_link = [href, []]
+
+    def handle_endtag(self, tag):
+        if self._page_depth:
+            if tag == 'a' and self._page_link:
+                text = ''.join(self._page_link[1]).strip()
+                if text.isdigit():
+                    self.pages[int(text)] = self._page_link[0]  # 只记录数字页码链接
+                self._page_link = None
+            self._page_depth -= 1
+        if tag == 'title':
+            self._in_title = False
+        elif tag == 'h3' and self._h3 is not None:
+            self.titles.append({'text': ' '.join(''.join(self._h3['text']).split()), 'href': self._h3['href']})
+            self._h3 = None
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        if self._h3 is not None:
+            self._h3['text'].append(data)
+        if self._page_link is not None:
+            self._page_link[1].append(data)
+
+
+class HttpSession:
+    """
+    HTTP 会话：相当于 HTTP 后端的"浏览器驱动"，保存当前页面地址与解析结果。
+
+    参数:
+        client (HttpClient): 共享的 HTTP 客户端。
+    """
+
+    def __init__(self, client):
+        self.client = client  # HTTP 客户端
+        self.base_url = None  # 站点首页地址，由打开页设置
+        self.current_url = None  # 当前页面地址
+        self.document = None  # 当前页面的解析结果（SerpParser）
+
+    def get(self, url, expect_results=False):
+        """
+        请求并解析页面。
+
+        参数:
+            url (str): 页面地址。
+            expect_results (bool): 是否应为结果页；为 True 且页面中没有结果时抛出 NeedsBrowser。
+        """
+        resp = self.client.get(url)
+        parser = SerpParser(resp.url)
+        parser.feed(resp.text)
+        parser.close()
+        self.current_url, self.document = resp.url, parser
+        if '安全验证' in parser.title:
+            raise NeedsBrowser(f"页面需要安全验证: {resp.url}")
+        if expect_results and not parser.titles and not parser.has_results:
+            raise NeedsBrowser(f"页面中没有可直接解析的结果，可能依赖脚本渲染: {resp.url}")
+        return parser
+
+
+class HttpPage:
+    """
+    HTTP 页面对象的基类，与 BasePage 对应，driver 为 HttpSession。
+    """
+
+    def __init__(self, driver):
+        """
+        参数:
+            driver (HttpSession): HTTP 会话。
+        """
+        self.driver = driver  # HTTP 会话
+
+    def open(self, url, expect_results=False):
+        """
+        打开指定地址。
+        """
+        return self.driver.get(url, expect_results)
+
+
+def run_concurrently(items, func, concurrency=8):
+    """
+    在 asyncio 事件循环上并发执行阻塞任务，最多同时执行 concurrency 个。
+    - concurrency 个工作协程按需从输入中领取任务，不预先展开输入或为每个任务创建协程。
+
+    参数:
+        items (iterable): 任务输入，按需惰性读取。
+        func (callable): 阻塞任务函数 func(item)。
+        concurrency (int): 最大并发数。
+
+    返回:
+        list[tuple]: 按输入顺序排列的 (item, 返回值, 异常)。
+    """
+    jobs = enumerate(items)  # 惰性读取任务输入
+    results = {}
+
+    async def worker():
+        for index, item in jobs:  # 事件循环单线程，多个工作协程共享同一个迭代器
+            try:
+                results[index] = item, await asyncio.to_thread(func, item), None
+            except Exception as exc:  # 单个任务失败不影响其他任务
+                results[index] = item, None, exc
+
+    async def main():
+        await asyncio.gather(*(worker() for _ in range(max(1, int(concurrency)))))
+        return [results[index] for index in sorted(results)]
+
+    return asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+    BasePage层：统一的日志管道，整个进程只配置一次
+    - 测试线程上的 logger 调用只把日志记录放入内存队列，格式化与控制台 / 文件 / JSONL 输出在后台监听线程中完成
+    - 日志消息使用 %-style 参数，低于级别的日志不会格式化；进入队列的记录也推迟到后台线程格式化
+    - JSONL 输出附带当前线程的关键词、页码等标签（来自 Metrics.context）
+    - 支持按模块设置日志级别，如 {'page_object': 'WARNING', 'base_page.tab_page': 'DEBUG'}
+"""
+import atexit  # 进程退出时停止监听线程，写完剩余日志
+import json  # JSONL 输出
+import logging  # 日志模块
+import os  # 创建日志目录
+import queue  # 日志记录队列
+import sys  # 控制台输出流
+from logging.handlers import QueueHandler, QueueListener  # 队列处理器与后台监听
+from base_page.metrics_page import Metrics  # 读取当前线程的关键词与页码标签
+
+TEXT_FORMAT = "%(levelname)-8s %(asctime)s [%(name)s:%(lineno)s] :%(message)s"  # 文件日志格式
+CONSOLE_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"  # 控制台日志格式
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"  # 日期时间格式
+
+_listener = None  # 后台监听器，setup_logging 只生效一次
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    队列处理器：不在调用线程中格式化消息，原样放入队列，由后台线程格式化。
+    - 标准 QueueHandler.prepare 会在调用线程中合并参数并格式化异常，这里跳过，只保留记录对象。
+    - 日志参数应为不可变对象或日志调用后不再修改的对象。
+    """
+
+    def __init__(self, log_queue, context=False):
+        super().__init__(log_queue)
+        self.context = context  # 是否附加当前线程的标签
+
+    def prepare(self, record):
+        if self.context:
+            record.context = dict(Metrics.shared().tags())  # 复制标签，后续修改不影响已入队的记录
+        return record
+
+
+class JsonlFormatter(logging.Formatter):
+    """
+    JSONL 格式：时间、级别、模块、行号、消息，以及关键词、页码等上下文字段。
+    """
+
+    def format(self, record):
+        entry = {
+            'time': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'line': record.lineno,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+            **getattr(record, 'context', {}),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _file_handler(path, formatter):
+    """
+    创建文件处理器，自动创建目录。
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    handler = logging.FileHandler(path, mode='w', encoding='utf-8')
+    handler.setFormatter(formatter)
+    return handler
+
+
+def setup_logging(level='INFO', levels=None, file=None, jsonl=None, console=True):
+    """
+    配置全局日志管道，重复调用不会重复配置。
+
+    参数:
+        level (str | int): 根日志级别。
+        levels (dict): 按模块设置的日志级别，如 {'page_object.titles_page': 'DEBUG'}。
+        file (str): 文本日志文件路径，为空时不写文件。
+        jsonl (str): JSONL 日志文件路径，为空时不输出。
+        console (bool): 是否输出到控制台。
+
+    返回:
+        QueueListener: 后台监听器。
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+    handlers = []
+    if console:
+        handler = logging.StreamHandler(sys.__stderr__)  # 直接写终端，不受 pytest 输出捕获影响
+        handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(handler)
+    if file:
+        handlers.append(_file_handler(file, logging.Formatter(TEXT_FORMAT, DATE_FORMAT)))
+    if jsonl:
+        handlers.append(_file_handler(jsonl, JsonlFormatter()))
+
+    log_queue = queue.SimpleQueue()  # 无界队列，放入记录不会阻塞
+    root = logging.getLogger()
+    for handler in root.handlers[:]:  # 移除已有处理器，所有输出都经过队列
+        root.removeHandler(handler)
+    root.addHandler(LazyQueueHandler(log_queue, context=bool(jsonl)))
+    root.setLevel(level)
+    for name, module_level in (levels or {}).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """
+    停止后台监听线程，写完队列中剩余的日志。
+    """
+    global _listener
+    if _listener is not None:
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            if isinstance(handler, LazyQueueHandler):
+                root.removeHandler(handler)  # 监听停止后不再入队
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -0,0 +1,263 @@
+"""
+    BasePage层：耗时统计，记录每条 WebDriver 命令与每个页面对象方法的耗时，并在会话结束时生成慢步骤报告
+    - 记录不逐条保存，按命令与方法累计聚合，内存占用与运行时长无关
+"""
+import heapq  # 保留最慢的若干步骤
+import json  # 输出 JSON 报告
+import logging  # 日志模块
+import math  # 最近秩法向上取整
+import os  # 创建报告目录
+import random  # 蓄水池抽样
+import threading  # 线程锁与线程本地上下文，浏览器池并行时各线程互不干扰
+from bisect import bisect_left  # 查找直方图分桶
+from contextlib import contextmanager  # 上下文管理器，用于标记关键词与页码
+from functools import wraps  # 保留被装饰方法的元信息
+from time import perf_counter  # 高精度计时
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+NAVIGATION_COMMANDS = {'get', 'refresh', 'goBack', 'goForward'}  # 计入网络耗时的导航命令
+HISTOGRAM_EDGES = [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]  # 直方图分桶上界（秒）
+RESERVOIR_SIZE = 1024  # 每个命令或方法保留的耗时样本数，用于估算百分位数
+
+
+def percentile(values, pct):
+    """
+    计算已排序数据的百分位数（最近秩法）。
+
+    参数:
+        values (list[float]): 升序排列的数据。
+        pct (int | float): 百分位，如 50、95、99。
+    """
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(values)))  # 最近秩：不小于 pct% * n 的最小整数
+    return values[min(rank, len(values)) - 1]
+
+
+class Aggregate:
+    """
+    单个命令或方法的耗时聚合。
+    - 次数、总耗时、最大值与直方图精确累计。
+    - 百分位数基于固定容量的蓄水池样本计算：次数不超过容量时为精确值，超过后为均匀抽样的估计值。
+
+    参数:
+        size (int): 蓄水池容量。
+    """
+
+    def __init__(self, size=RESERVOIR_SIZE):
+        self.size = size  # 蓄水池容量
+        self.count = 0  # 次数
+        self.total = 0.0  # 总耗时
+        self.max = 0.0  # 最大耗时
+        self.histogram = [0] * (len(HISTOGRAM_EDGES) + 1)  # 各分桶次数，最后一个为超出最大上界
+        self.samples = []  # 蓄水池样本
+
+    def add(self, seconds):
+        """
+        累计一次耗时。
+        """
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.histogram[bisect_left(HISTOGRAM_EDGES, seconds)] += 1  # 落入第一个不小于该值的分桶
+        if len(self.samples) < self.size:
+            self.samples.append(seconds)
+        else:
+            index = random.randrange(self.count)  # 以 size / count 的概率替换已有样本
+            if index < self.size:
+                self.samples[index] = seconds
+
+    def summary(self):
+        """
+        汇总：次数、总耗时、p50/p95/p99、最大值与直方图。
+        """
+        values = sorted(self.samples)
+        labels = [f"<={edge}s" for edge in HISTOGRAM_EDGES] + [f">{HISTOGRAM_EDGES[-1]}s"]
+        return {
+            'count': self.count,
+            'total': round(self.total, 4),
+            'p50': round(percentile(values, 50), 4),
+            'p95': round(percentile(values, 95), 4),
+            'p99': round(percentile(values, 99), 4),
+            'max': round(self.max, 4),
+            'histogram': dict(zip(labels, self.histogram)),
+        }
+
+
+class Metrics:
+    """
+    耗时统计收集器。
+    - command：每条 WebDriver 命令的耗时，按命令名统计，并归入 network / driver 耗时分类。
+    - step：每个被 timed 装饰的方法的耗时，带有关键词与页码标签；慢步骤列表只取最外层方法，
+      嵌套调用（如 input -> wait_visible -> wait_until）的耗时已包含在外层方法中，不重复列出。
+    - sleep：强制等待与显式等待轮询间隔的休眠时间，按等待类型归入 network / sleep 分类。
+    - 记录写入时即按名称聚合（见 Aggregate），慢步骤只保留最慢的 keep_slowest 条，长时间运行内存不增长。
+
+    参数:
+        keep_slowest (int): 保留的最慢步骤条数，report 最多能列出这么多条。
+    """
+
+    _shared = None  # 全局共享实例
+    _shared_lock = threading.Lock()  # 保护共享实例的创建
+
+    def __init__(self, keep_slowest=100):
+        self.enabled = True  # 是否记录
+        self.keep_slowest = keep_slowest  # 保留的最慢步骤条数
+        self.commands = {}  # 命令名 -> Aggregate
+        self.methods = {}  # 方法名 -> Aggregate
+        self.buckets = {'network': 0.0, 'driver': 0.0, 'sleep': 0.0}  # 耗时分类累计
+        self._slowest = []  # 最慢的最外层步骤，最小堆 (耗时, 序号, 记录)
+        self._seq = 0  # 堆中耗时相同时的次序
+        self._lock = threading.Lock()  # 保护聚合数据
+        self._local = threading.local()  # 线程本地上下文：方法调用栈与标签
+
+    @classmethod
+    def shared(cls):
+        """
+        获取全局共享的统计实例，不存在时创建。
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:  # 加锁后再次检查，避免多个线程各自创建
+                    cls._shared = cls()
+        return cls._shared
+
+    def _stack(self):
+        """
+        当前线程的方法调用栈。
+        """
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+            self._local.tags = {}
+        return self._local.stack
+
+    def tags(self):
+        """
+        当前线程的标签（关键词、页码等）。
+        """
+        self._stack()
+        return self._local.tags
+
+    @contextmanager
+    def context(self, **tags):
+        """
+        在 with 块内为所有记录附加标签，如 keyword、page。
+        """
+        current = self.tags()
+        previous = dict(current)
+        current.update(tags)
+        try:
+            yield
+        finally:
+            current.clear()
+            current.update(previous)
+
+    def record(self, kind, name, seconds, bucket):
+        """
+        写入一条记录：累计到对应的聚合中，最外层步骤参与慢步骤排名。
+
+        参数:
+            kind (str): 记录类型：command / step / sleep。
+            name (str): 命令名或方法名。
+            seconds (float): 耗时（秒）。
+            bucket (str | None): 耗时分类：network / driver / sleep，step 记录为 None（避免重复计算）。
+        """
+        if not self.enabled:
+            return
+        outermost = kind == 'step' and not self._stack()  # timed 在记录前已弹出自身，栈为空即最外层方法
+        tags = self.tags()
+        with self._lock:
+            if kind in ('command', 'step'):
+                table = self.commands if kind == 'command' else self.methods
+                aggregate = table.get(name)
+                if aggregate is None:
+                    aggregate = table[name] = Aggregate()
+                aggregate.add(seconds)
+            if bucket:
+                self.buckets[bucket] += seconds
+            if outermost and (len(self._slowest) < self.keep_slowest or seconds > self._slowest[0][0]):
+                self._seq += 1
+                item = (seconds, self._seq, {'name': name, 'seconds': seconds, 'method': None, **tags})
+                if len(self._slowest) < self.keep_slowest:
+                    heapq.heappush(self._slowest, item)
+                else:
+                    heapq.heapreplace(self._slowest, item)  # 替换当前最快的一条
+
+    def report(self, slowest=20):
+        """
+        生成统计报告。
+
+        参数:
+            slowest (int): 慢步骤列表的条数。
+
+        返回:
+            dict: 包含 methods（各方法耗时分布）、commands（各命令耗时分布）、
+                slowest（最慢的最外层步骤）与 buckets（网络/驱动/休眠耗时分类）。
+        """
+        with self._lock:
+            return {
+                'methods': {name: agg.summary() for name, agg in sorted(self.methods.items())},
+                'commands': {name: agg.summary() for name, agg in sorted(self.commands.items())},
+                'slowest': [dict(entry) for _, _, entry in sorted(self._slowest, reverse=True)[:slowest]],
+                'buckets': {name: round(value, 4) for name, value in self.buckets.items()},
+            }
+
+    def dump(self, path):
+        """
+        将统计报告写入 JSON 文件并返回报告内容。
+        """
+        data = self.report()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+        logger.info("耗时统计已写入: %s，分类耗时: %s", path, data['buckets'])
+        return data
+
+
+def timed(func):
+    """
+    方法耗时装饰器：记录方法耗时，并在执行期间将 "类名.方法名" 压入调用栈，
+    期间产生的 WebDriver 命令与等待都会标记为该方法。
+    """
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        metrics = Metrics.shared()
+        if not metrics.enabled:
+            return func(self, *args, **kwargs)
+        name = f"{type(self).__name__}.{func.__name__}"
+        stack = metrics._stack()
+        stack.append(name)
+        start = perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            seconds = perf_counter() - start
+            stack.pop()
+            metrics.record('step', name, seconds, None)
+    return wrapper
+
+
+def instrument(driver):
+    """
+    为 WebDriver 实例安装命令耗时统计：包装实例上的 execute 方法。
+    - WebElement 的所有操作最终也通过其所属 driver 的 execute 发送，因此同样会被统计。
+
+    参数:
+        driver (WebDriver): 浏览器驱动。
+
+    返回:
+        WebDriver: 同一个驱动实例。
+    """
+    execute = driver.execute  # 原始的绑定方法
+
+    def timed_execute(driver_command, params=None):
+        start = perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            bucket = 'network' if driver_command in NAVIGATION_COMMANDS else 'driver'
+            Metrics.shared().record('command', driver_command, perf_counter() - start, bucket)
+
+    driver.execute = timed_execute  # 只替换当前实例，不影响其他驱动
+    return driver
@@ -0,0 +1,170 @@
+"""
+    BasePage层：浏览器池，维护多个独立的浏览器会话并以工作窃取方式并行执行任务
+"""
+import logging  # 日志模块
+import threading  # 线程模块，每个浏览器会话由一个工作线程独占
+from collections import deque  # 双端队列，作为每个工作线程的任务分片
+from itertools import islice  # 按批从任务输入中领取任务
+from concurrent.futures import ThreadPoolExecutor  # 线程池，用于并行启动浏览器
+from base_page.driver_page import driver_  # 导入自定义的浏览器驱动生成方法
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+
+class TaskResult:
+    """
+    单个任务的执行结果。
+
+    属性:
+        index (int): 任务在输入序列中的位置，用于按原顺序合并结果。
+        item: 任务输入（如关键词数据）。
+        value: 任务函数的返回值，失败时为 None。
+        error (BaseException | None): 任务抛出的异常，成功时为 None。
+        worker (int): 执行该任务的工作线程编号。
+    """
+
+    def __init__(self, index, item, value=None, error=None, worker=-1):
+        self.index = index  # 任务序号
+        self.item = item  # 任务输入
+        self.value = value  # 任务返回值
+        self.error = error  # 任务异常
+        self.worker = worker  # 工作线程编号
+
+
+class BrowserPool:
+    """
+    浏览器池：维护 size 个独立的浏览器会话，将任务分片到各会话并行执行。
+    - 任务输入按需惰性读取：工作线程的队列为空时，从输入中按批（chunk 个）领取任务，不预先展开整个输入。
+    - 输入读完后，队列为空的工作线程从剩余任务最多的队列尾部窃取任务，保证负载均衡。
+    - 每个工作线程通过 setup(driver) 创建自己独立的页面对象上下文。
+
+    用法:
+        with BrowserPool(4) as pool:
+            results = pool.run(keywords, task, setup)
+    """
+
+    def __init__(self, size, factory=None, profile='visual', chunk=4):
+        """
+        初始化浏览器池。
+
+        参数:
+            size (int): 浏览器会话数量。
+            factory (callable): 创建浏览器驱动的函数，默认使用无头模式的 driver_。
+            profile (str): 默认创建函数使用的加载配置。
+            chunk (int): 工作线程每次从输入中领取的任务数量。
+        """
+        self.size = max(1, int(size))  # 至少保留一个会话
+        self.factory = factory or (lambda: driver_(profile, headless=True))  # 浏览器驱动创建函数
+        self.drivers = []  # 已启动的浏览器驱动列表
+        self.chunk = max(1, int(chunk))  # 每批领取的任务数量
+        self._items = iter(())  # 尚未领取的任务输入 (index, item)
+        self._shards = []  # 每个工作线程的任务分片
+        self._lock = threading.Lock()  # 保护任务输入与任务分片的锁
+
+    def start(self):
+        """
+        并行启动所有浏览器会话；任一会话启动失败时关闭已启动的会话并抛出该异常。
+        """
+        logger.info("启动浏览器池，共 %d 个会话", self.size)
+        with ThreadPoolExecutor(max_workers=self.size) as executor:  # 并行启动，缩短整体启动时间
+            futures = [executor.submit(self.factory) for _ in range(self.size)]
+        drivers, error = [], None
+        for future in futures:
+            try:
+                drivers.append(future.result())
+            except Exception as exc:  # 记录第一个启动异常，其余会话照常收集以便关闭
+                error = error or exc
+        if error is not None:
+            logger.error("浏览器池启动失败，关闭已启动的 %d 个会话: %s", len(drivers), error)
+            self.drivers = drivers
+            self.close()
+            raise error
+        self.drivers = drivers
+        return self
+
+    def close(self):
+        """
+        关闭所有浏览器会话。
+        """
+        for driver in self.drivers:
+            try:
+                driver.quit()  # 关闭浏览器驱动，释放资源
+            except Exception as exc:  # 单个会话关闭失败不影响其他会话
+                logger.warning("关闭浏览器会话失败: %s", exc)
+        self.drivers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _next(self, worker):
+        """
+        获取下一个任务：优先从自己的分片头部取，分片为空时从输入中领取一批，输入读完后从最长分片的尾部窃取。
+
+        返回:
+            tuple | None: (index, item)，没有剩余任务时返回 None。
+        """
+        with self._lock:
+            own = self._shards[worker]
+            if not own:
+                own.extend(islice(self._items, self.chunk))  # 从输入中按批领取任务
+            if own:
+                return own.popleft()  # 从自己的分片头部取任务
+            victim = max(self._shards, key=len)  # 找到剩余任务最多的分片
+            if victim:
+                return victim.pop()  # 从其尾部窃取任务，减少与其所有者的冲突
+            return None
+
+    def _work(self, worker, task, setup, results):
+        """
+        工作线程主循环：在独占的浏览器会话上依次执行任务直到没有剩余任务。
+        """
+        driver = self.drivers[worker]
+        try:
+            context = setup(driver) if setup else driver  # 为当前会话创建独立的页面对象上下文
+        except Exception as exc:  # 会话初始化失败：该会话退出，剩余任务由其他会话窃取
+            logger.error("会话 %d 初始化失败: %s", worker, exc)
+            return
+        while True:
+            job = self._next(worker)
+            if job is None:
+                break
+            index, item = job
+            try:
+                results[index] = TaskResult(index, item, task(context, item), worker=worker)
+            except Exception as exc:  # 单个任务失败不影响其他任务，异常随结果返回
+                logger.error("会话 %d 执行任务 %d 失败: %s", worker, index, exc)
+                results[index] = TaskResult(index, item, error=exc, worker=worker)
+
+    def run(self, items, task, setup=None):
+        """
+        在浏览器池上并行执行任务。
+
+        参数:
+            items (iterable): 任务输入序列（如关键词数据源），按需惰性读取。
+            task (callable): 任务函数 task(context, item)，返回值存入 TaskResult.value。
+            setup (callable): 上下文创建函数 setup(driver)，每个会话调用一次。
+
+        返回:
+            list[TaskResult]: 按输入顺序排列的任务结果。
+        """
+        if not self.drivers:
+            self.start()
+        self._items = enumerate(items)  # 惰性读取任务输入
+        self._shards = [deque() for _ in self.drivers]  # 为每个会话创建任务分片
+        results = {}
+        threads = [
+            threading.Thread(target=self._work, args=(worker, task, setup, results), name=f"browser-pool-{worker}")
+            for worker in range(len(self.drivers))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        remaining = [job for shard in self._shards for job in shard]
+        remaining.extend(self._items)
+        for index, item in remaining:  # 所有会话都初始化失败时，剩余任务标记为未执行
+            results[index] = TaskResult(index, item, error=RuntimeError("没有可用的浏览器会话执行该任务"))
+        return [results[index] for index in sorted(results)]
@@ -0,0 +1,242 @@
+"""
+    BasePage层：HTTP 录制与回放，通过 DevTools Fetch 拦截浏览器的所有请求
+    - record：放行请求，并将每个响应（状态码、响应头、正文）写入本地按内容寻址的存储
+    - replay：不访问网络，直接用存储中的响应完成请求，未录制的请求按断网处理
+    存储结构（类似 HAR，正文按 SHA-256 去重）：
+        <store>/index.jsonl                每行一条 {key, method, url, status, headers, body}，后写入的覆盖先写入的
+        <store>/objects/<前2位>/<sha256>    响应正文
+"""
+import base64  # DevTools 以 base64 传递二进制正文
+import hashlib  # 正文按 SHA-256 寻址
+import json  # 索引按 JSON Lines 存储
+import logging  # 日志模块
+import os  # 存储目录
+import threading  # 保护索引与连接表
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode  # 规范化请求地址
+from base_page.cdp_page import DevTools, trio  # 浏览器级 DevTools 连接
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+MODES = ('off', 'record', 'replay')  # 缓存模式
+VOLATILE_PARAMS = {'rsv_pq', 'rsv_t', 'rsv_idx', 'rsv_btype', 'rsv_dl', 'rsv_sug3', 'rsv_sug4', 'rsv_sug7',
+                   'rsv_enter', 'inputT', 'oq', '_', 't', 'r', 'callback', 'cb'}  # 每次请求都会变化的参数，不参与匹配
+DROP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}  # 正文已解压，这些响应头不再适用
+
+
+def request_key(method, url, volatile=VOLATILE_PARAMS):
+    """
+    计算请求的匹配键：方法 + 去掉易变参数并排序后的地址，忽略 # 片段。
+    """
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in volatile)
+    return f"{method} {urlunsplit(parts._replace(query=urlencode(query), fragment=''))}"
+
+
+class ReplayStore:
+    """
+    按内容寻址的响应存储，多个拦截线程共用。
+
+    参数:
+        path (str): 存储目录。
+    """
+
+    def __init__(self, path):
+        self.path = path  # 存储目录
+        self.index_path = os.path.join(path, 'index.jsonl')  # 索引文件
+        self.entries = {}  # 匹配键 -> 索引条目
+        self._lock = threading.Lock()  # 保护索引与索引文件
+        os.makedirs(os.path.join(path, 'objects'), exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry['key']] = entry
+
+    def _object_path(self, digest):
+        return os.path.join(self.path, 'objects', digest[:2], digest)
+
+    def put(self, method, url, status, headers, body):
+        """
+        保存一个响应；正文内容相同的响应只存一份。
+
+        参数:
+            headers (list[tuple]): 响应头 [(名称, 值), ...]。
+            body (bytes): 解压后的响应正文。
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as file:
+                file.write(body)
+            os.replace(tmp_path, path)  # 原子替换，避免回放时读到半成品
+        entry = {'key': request_key(method, url), 'method': method, 'url': url, 'status': status,
+                 'headers': [(k, v) for k, v in headers if k.lower() not in DROP_HEADERS], 'body': digest}
+        with self._lock:
+            self.entries[entry['key']] = entry
+            with open(self.index_path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def get(self, method, url):
+        """
+        查找已录制的响应。
+
+        返回:
+            tuple | None: (状态码, 响应头, 正文)，未录制时返回 None。
+        """
+        entry = self.entries.get(request_key(method, url))
+        if entry is None:
+            return None
+        with open(self._object_path(entry['body']), 'rb') as file:
+            return entry['status'], entry['headers'], file.read()
+
+
+class ReplayCache:
+    """
+    浏览器 HTTP 录制 / 回放：每个浏览器一个 DevTools 连接（见 cdp_page.DevTools），
+    为每个标签页单独开启 Fetch 拦截并监听 Fetch.requestPaused 事件。
+    - record：在响应阶段暂停，读取正文写入存储后放行。
+    - replay：在请求阶段暂停，命中则直接用存储的响应完成请求，未命中则以断网失败（strict）或放行。
+    - Fetch 拦截只对开启它的标签页生效：attach 拦截浏览器当前所在的标签页，并在 driver.tab_setup 中登记，
+      之后通过 prepare_tab 初始化的新标签页（预加载、多标签页、按标签页重启）都会自动开启拦截。
+
+    参数:
+        path (str): 存储目录。
+        mode (str): 'off' / 'record' / 'replay'。
+        strict (bool): 回放未命中时是否按断网处理；为 False 时放行到网络。
+    """
+
+    def __init__(self, path, mode='replay', strict=True):
+        if mode not in MODES:
+            raise ValueError(f"未知的缓存模式: {mode}，可选 {MODES}")
+        self.mode = mode  # 缓存模式
+        self.strict = strict  # 回放未命中时是否断网
+        self.store = ReplayStore(path) if mode != 'off' else None  # 响应存储
+        self.recorded = 0  # 录制的响应数
+        self.hits = 0  # 回放命中数
+        self.misses = 0  # 回放未命中数
+        self._browsers = {}  # 浏览器驱动 -> DevTools 连接
+        self._attached = set()  # 已开启拦截的标签页句柄（即 DevTools target id）
+        self._lock = threading.Lock()  # 多个标签页并发开启拦截时保护连接表
+
+    def attach(self, driver, handle=None, timeout=10):
+        """
+        开始拦截指定标签页的请求（默认为浏览器当前所在的标签页），Fetch 拦截生效后返回；
+        同时登记到 driver.tab_setup，新标签页经 prepare_tab 初始化时自动开启拦截。
+        """
+        if self.mode == 'off':
+            return driver
+        if trio is None:
+            raise ImportError("HTTP 录制与回放需要安装 trio（selenium 的依赖）")
+        handle = handle or driver.current_window_handle
+        with self._lock:
+            if handle in self._attached:
+                return driver
+            browser = self._browsers.get(driver)
+            if browser is None:
+                browser = self._browsers[driver] = DevTools(driver, name="http-replay").start(timeout)
+            self._attached.add(handle)
+        try:
+            browser.run(self._intercept, browser, handle, timeout)
+        except Exception as exc:
+            self._attached.discard(handle)
+            raise RuntimeError(f"DevTools Fetch 拦截启动失败: {exc}") from exc
+        hooks = getattr(driver, 'tab_setup', None)
+        if hooks is not None and self._attach_tab not in hooks:
+            hooks.append(self._attach_tab)
+        logger.info("HTTP %s 已拦截标签页 %s，存储: %s，已有响应 %d 个",
+                    self.mode, handle, self.store.path, len(self.store.entries))
+        return driver
+
+    def _attach_tab(self, driver):
+        """
+        登记到 driver.tab_setup 的钩子：为 prepare_tab 初始化的标签页开启拦截。
+        """
+        self.attach(driver)
+
+    async def _intercept(self, browser, handle, timeout):
+        """
+        在拦截线程的事件循环中为标签页启动监听任务，Fetch 拦截生效后返回。
+        """
+        with trio.fail_after(timeout):
+            await browser.nursery.start(self._listen, browser, handle)
+
+    async def _listen(self, browser, handle, task_status):
+        """
+        附加到标签页，开启 Fetch 拦截后逐个处理暂停的请求；标签页关闭后任务结束，不影响其他标签页。
+        """
+        devtools = browser.devtools
+        stage = devtools.fetch.RequestStage.RESPONSE if self.mode == 'record' else devtools.fetch.RequestStage.REQUEST
+        handler = self._record if self.mode == 'record' else self._replay
+        started = False
+        try:
+            async with browser.conn.open_session(devtools.target.TargetID(handle)) as session:
+                await session.execute(devtools.fetch.enable(patterns=[devtools.fetch.RequestPattern(
+                    url_pattern='*', request_stage=stage)]))
+                task_status.started()
+                started = True
+                async with trio.open_nursery() as nursery:
+                    async for event in session.listen(devtools.fetch.RequestPaused):
+                        nursery.start_soon(handler, session, devtools, event)
+        except Exception as exc:  # 启动失败时抛给 attach；已启动的标签页被关闭时只结束本任务
+            if not started:
+                raise
+            logger.info("HTTP %s 标签页拦截结束 %s: %s", self.mode, handle, exc)
+
+    async def _record(self, session, devtools, event):
+        """
+        录制：读取响应正文写入存储，然后放行。
+        """
+        try:
+            if event.response_status_code is not None and event.response_error_reason is None:
+                try:
+                    body, encoded = await session.execute(devtools.fetch.get_response_body(event.request_id))
+                    data = base64.b64decode(body) if encoded else body.encode('utf-8')
+                except Exception:  # 重定向等响应没有正文
+                    data = b''
+                headers = [(h.name, h.value) for h in event.response_headers or []]
+                await trio.to_thread.run_sync(self.store.put, event.request.method, event.request.url,
+                                              event.response_status_code, headers, data)
+                self.recorded += 1
+        finally:
+            await session.execute(devtools.fetch.continue_request(event.request_id))
+
+    async def _replay(self, session, devtools, event):
+        """
+        回放：命中时直接完成请求，未命中时断网失败或放行。
+        """
+        cached = await trio.to_thread.run_sync(self.store.get, event.request.method, event.request.url)
+        if cached is None:
+            self.misses += 1
+            logger.warning("回放未命中: %s %s", event.request.method, event.request.url)
+            if self.strict:
+                await session.execute(devtools.fetch.fail_request(
+                    event.request_id, devtools.network.ErrorReason.INTERNET_DISCONNECTED))
+            else:
+                await session.execute(devtools.fetch.continue_request(event.request_id))
+            return
+        status, headers, body = cached
+        self.hits += 1
+        await session.execute(devtools.fetch.fulfill_request(
+            event.request_id, status,
+            response_headers=[devtools.fetch.HeaderEntry(name=k, value=v) for k, v in headers],
+            body=base64.b64encode(body).decode('ascii')))
+
+    def stats(self):
+        """
+        返回录制与回放统计。
+        """
+        return {'mode': self.mode, 'recorded': self.recorded, 'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        """
+        停止所有拦截线程。
+        """
+        for browser in self._browsers.values():
+            browser.close()
+        self._browsers = {}
+        self._attached = set()
+        if self.mode != 'off':
+            logger.info("HTTP 录制与回放结束: %s", self.stats())
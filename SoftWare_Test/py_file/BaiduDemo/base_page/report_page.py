@@ -0,0 +1,257 @@
+"""
+    BasePage层：Allure 结果存储，附件按内容哈希只保存一份，多次运行或多个分片的结果合并为一个报告
+    存储结构：
+        <store>/objects/<sha1><扩展名>    附件本体，内容相同的附件只保存一份
+        <store>/results/                  合并后的 Allure 结果目录：结果 JSON + 指向 objects 的硬链接，可直接生成报告；
+                                          每个用例（historyId）只保留最新一次的结果，目录大小不随运行次数增长
+        <store>/manifest.json             上次生成报告时的结果指纹，结果没有变化时跳过生成
+"""
+import hashlib  # 计算结果集指纹
+import json  # 读写 Allure 结果与清单
+import logging  # 日志模块
+import os  # 文件与链接操作
+import shutil  # 硬链接不可用时复制文件，复制报告历史
+import subprocess  # 调用 allure 命令行生成报告
+from base_page.data_page import file_digest  # 分块计算文件内容哈希
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+RESULT_SUFFIXES = ('-result.json', '-container.json')  # Allure 结果与容器文件
+
+
+def link_or_copy(source, target):
+    """
+    创建硬链接，文件系统不支持时复制。目标已存在时不做任何事。
+    """
+    if os.path.exists(target):
+        return
+    try:
+        os.link(source, target)
+    except OSError:  # 跨分区或文件系统不支持硬链接
+        shutil.copyfile(source, target)
+
+
+def rewrite_sources(node, mapping):
+    """
+    递归替换结果 JSON 中附件的 source（结果、步骤、容器的 befores / afters 中都可能有附件）。
+    """
+    if isinstance(node, dict):
+        source = node.get('source')
+        if isinstance(source, str) and source in mapping:
+            node['source'] = mapping[source]
+        for value in node.values():
+            rewrite_sources(value, mapping)
+    elif isinstance(node, list):
+        for value in node:
+            rewrite_sources(value, mapping)
+
+
+def attachment_sources(node):
+    """
+    产出结果 JSON 中引用的所有附件 source。
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if isinstance(node.get('source'), str):
+                yield node['source']
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+class ResultStore:
+    """
+    Allure 结果存储：ingest 把一次运行（或一个分片）的结果目录并入存储，generate 从合并后的结果生成报告。
+    - 附件按内容哈希移动到 objects，重复的附件直接删除；结果中的附件引用改为哈希文件名。
+    - results 目录中的附件是 objects 的硬链接，合并多个目录不会再复制附件。
+    - 同一用例（historyId 相同）只保留结束时间最新的结果，被替换的结果及只被它引用的容器、附件链接随之删除；
+      历次运行的趋势由 generate 带入的报告 history 保留。
+    - 结果集自上次生成以来没有变化时，generate 直接跳过。
+
+    参数:
+        root (str): 存储目录。
+    """
+
+    def __init__(self, root='./temps/allure-store'):
+        self.root = root  # 存储目录
+        self.objects = os.path.join(root, 'objects')  # 附件本体
+        self.results = os.path.join(root, 'results')  # 合并后的结果目录
+        self.manifest_path = os.path.join(root, 'manifest.json')  # 生成清单
+        os.makedirs(self.objects, exist_ok=True)
+        os.makedirs(self.results, exist_ok=True)
+
+    def ingest(self, results_dir, remove=True):
+        """
+        并入一个 Allure 结果目录。
+
+        参数:
+            results_dir (str): pytest --alluredir 指定的结果目录。
+            remove (bool): 是否从原目录移走文件；为 False 时保留原目录，附件以复制方式入库。
+
+        返回:
+            dict: results（结果文件数）、attachments（附件数）、stored（新入库附件数）、duplicates（重复附件数）、
+                superseded（被更新结果替换或比已有结果更旧而丢弃的结果数）。
+        """
+        stats = {'results': 0, 'attachments': 0, 'stored': 0, 'duplicates': 0, 'superseded': 0}
+        if not os.path.isdir(results_dir):
+            return stats
+        names = os.listdir(results_dir)
+        mapping = {}  # 原附件文件名 -> 哈希文件名
+        for name in names:
+            if '-attachment' not in name:
+                continue
+            path = os.path.join(results_dir, name)
+            obj = file_digest(path) + os.path.splitext(name)[1]
+            target = os.path.join(self.objects, obj)
+            if os.path.exists(target):
+                stats['duplicates'] += 1
+                if remove:
+                    os.remove(path)
+            else:
+                stats['stored'] += 1
+                if remove:
+                    os.replace(path, target)  # 同一分区内移动，不复制内容
+                else:
+                    shutil.copyfile(path, target)
+            mapping[name] = obj
+            stats['attachments'] += 1
+
+        latest = self._latest()  # historyId -> (结束时间, 结果文件名)
+        for name in names:
+            path = os.path.join(results_dir, name)
+            if name.endswith(RESULT_SUFFIXES):
+                with open(path, 'r', encoding='utf-8') as file:
+                    result = json.load(file)
+                stats['results'] += 1
+                action = self._supersede(result, name, latest) if name.endswith('-result.json') else 'new'
+                if action != 'new':
+                    stats['superseded'] += 1  # 替换了旧结果，或已有更新的结果而丢弃本条
+                if action != 'skip':
+                    rewrite_sources(result, mapping)
+                    self._link_objects(result)
+                    with open(os.path.join(self.results, name), 'w', encoding='utf-8') as file:
+                        json.dump(result, file, ensure_ascii=False)
+            elif '-attachment' not in name and os.path.isfile(path):  # environment.properties、categories.json 等
+                shutil.copyfile(path, os.path.join(self.results, name))
+            else:
+                continue
+            if remove:
+                os.remove(path)
+        self._prune()
+        logger.info("Allure 结果入库: %s <- %s", stats, results_dir)
+        return stats
+
+    def _load_results(self):
+        """
+        逐个读取合并后的结果与容器：产出 (文件名, 内容)。
+        """
+        for name in os.listdir(self.results):
+            if name.endswith(RESULT_SUFFIXES):
+                with open(os.path.join(self.results, name), 'r', encoding='utf-8') as file:
+                    yield name, json.load(file)
+
+    def _latest(self):
+        """
+        已合并结果中每个用例的最新结果：{historyId: (结束时间, 结果文件名)}。
+        """
+        latest = {}
+        for name, result in self._load_results():
+            history_id = result.get('historyId')
+            if name.endswith('-result.json') and history_id:
+                latest[history_id] = max(latest.get(history_id, (-1, '')), (result.get('stop') or 0, name))
+        return latest
+
+    def _supersede(self, result, name, latest):
+        """
+        判断结果如何写入，并登记到 latest：
+        - 'skip'：同一用例已有更新的结果，丢弃本条。
+        - 'replace'：删除同一用例的旧结果后写入。
+        - 'new'：该用例还没有结果（或没有 historyId），直接写入。
+        """
+        history_id = result.get('historyId')
+        if not history_id:
+            return 'new'
+        stop = result.get('stop') or 0
+        previous = latest.get(history_id)
+        action = 'new'
+        if previous is not None and previous[1] != name:
+            if previous[0] > stop:
+                return 'skip'
+            os.remove(os.path.join(self.results, previous[1]))  # 旧结果的容器与附件链接由 _prune 清理
+            action = 'replace'
+        latest[history_id] = (stop, name)
+        return action
+
+    def _prune(self):
+        """
+        删除不再被需要的文件：子结果都已被替换的容器，以及没有任何结果或容器引用的附件链接。
+        """
+        results, children, sources = set(), {}, {}  # 结果 uuid；容器 -> 子结果；文件 -> 引用的附件
+        for name, result in self._load_results():
+            sources[name] = set(attachment_sources(result))
+            if name.endswith('-result.json'):
+                results.add(result.get('uuid') or name[:-len('-result.json')])
+            else:
+                children[name] = result.get('children') or []
+        for name, uuids in children.items():
+            if uuids and not results.intersection(uuids):
+                os.remove(os.path.join(self.results, name))
+                del sources[name]
+        referenced = set().union(*sources.values())
+        for name in os.listdir(self.results):
+            if os.path.exists(os.path.join(self.objects, name)) and name not in referenced:
+                os.remove(os.path.join(self.results, name))  # 只删除链接，附件本体保留在 objects
+
+    def _link_objects(self, result):
+        """
+        将结果引用的附件硬链接到合并后的结果目录。
+        """
+        for source in attachment_sources(result):
+            if os.path.exists(os.path.join(self.objects, source)):
+                link_or_copy(os.path.join(self.objects, source), os.path.join(self.results, source))
+
+    def fingerprint(self):
+        """
+        结果集指纹：结果文件名与大小，结果有增删改时变化。
+        """
+        digest = hashlib.sha1()
+        for name in sorted(os.listdir(self.results)):
+            if name.endswith(RESULT_SUFFIXES):
+                digest.update(f"{name}:{os.path.getsize(os.path.join(self.results, name))}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def generate(self, report_dir='./temps/allure-report', allure='allure', force=False):
+        """
+        从合并后的结果生成 HTML 报告；结果自上次生成以来没有变化时跳过。
+        - 生成前把上次报告的 history 带入结果目录，保留 Allure 趋势图。
+
+        返回:
+            bool: 是否重新生成了报告。
+        """
+        current = self.fingerprint()
+        manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+        if not force and manifest.get(report_dir) == current and os.path.isdir(report_dir):
+            logger.info("Allure 结果没有变化，跳过报告生成: %s", report_dir)
+            return False
+        history = os.path.join(report_dir, 'history')
+        if os.path.isdir(history):
+            shutil.copytree(history, os.path.join(self.results, 'history'), dirs_exist_ok=True)
+        subprocess.run([allure, 'generate', self.results, '-o', report_dir, '--clean'], check=True,
+                       shell=os.name == 'nt')  # Windows 下 allure 为 .bat 脚本，需要通过 shell 调用
+        manifest[report_dir] = current
+        with open(self.manifest_path, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+        logger.info("Allure 报告已生成: %s", report_dir)
+        return True
+
+    def reset(self):
+        """
+        清空合并后的结果（附件本体保留，后续运行中相同的附件无需再次入库）。
+        """
+        shutil.rmtree(self.results, ignore_errors=True)
+        os.makedirs(self.results, exist_ok=True)
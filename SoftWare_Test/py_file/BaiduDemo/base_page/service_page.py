@@ -0,0 +1,339 @@
+"""
+    BasePage层：常驻浏览器服务，预先启动若干浏览器会话，测试会话直接借用，省去每次启动 chromedriver 与 Chrome 的时间
+    - BrowserService：常驻进程，按加载配置预热会话，提供本地 HTTP 接口借出 / 归还会话；归还后在后台清理状态再放回空闲队列
+    - SessionDriver：测试进程中连接到已有会话的驱动，quit 时归还会话而不是关闭浏览器
+    - acquire_driver：向服务借用会话，服务不可用时返回 None，由调用方回退到 driver_()
+    启动服务：python -m base_page.service_page --profile visual=2 --profile full=1
+"""
+import argparse  # 解析服务的命令行参数
+import json  # 接口请求与响应
+import logging  # 日志模块
+import os  # 读取服务地址环境变量
+import queue  # 每个加载配置的空闲会话队列
+import threading  # 后台预热与清理
+from concurrent.futures import ThreadPoolExecutor  # 并行预热会话
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler  # 标准库 HTTP 服务
+from urllib.request import Request, urlopen  # 客户端请求服务接口
+from urllib.error import URLError  # 服务不可用
+from urllib.parse import urlsplit  # 从浏览历史中提取访问过的源
+from selenium.webdriver.chrome.options import Options  # 连接已有会话时的浏览器选项
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection  # 支持 DevTools 命令的远程连接
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver  # 远程驱动基类
+from base_page.driver_page import driver_, prepare_tab, profile_commands, PROFILES  # 浏览器驱动生成方法、标签页初始化与加载配置
+from base_page.metrics_page import Metrics, instrument  # 客户端驱动同样记录命令耗时；服务进程中关闭统计
+from base_page.log_page import setup_logging  # 独立运行服务时配置日志管道
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+SERVICE_ENV = 'BAIDU_DEMO_BROWSER_SERVICE'  # 服务地址环境变量，如 http://127.0.0.1:8765
+
+
+def visited_origins(driver):
+    """
+    收集会话访问过的源（scheme://host[:port]）：所有窗口浏览历史中的地址，以及 Cookie 所属的域名。
+    """
+    origins = set()
+    for handle in driver.window_handles:
+        driver.switch_to.window(handle)
+        for entry in driver.execute_cdp_cmd('Page.getNavigationHistory', {})['entries']:
+            parts = urlsplit(entry['url'])
+            if parts.scheme in ('http', 'https'):
+                origins.add(f"{parts.scheme}://{parts.netloc}")
+    for cookie in driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']:
+        domain = cookie['domain'].lstrip('.')
+        origins.update((f"http://{domain}", f"https://{domain}"))
+    return origins
+
+
+def reset_session(driver):
+    """
+    清理会话状态：关闭多余窗口，按源清空所有访问过的源的存储（localStorage、IndexedDB、Service Worker 等），
+    再清空 Cookie 与缓存，回到空白页。
+    """
+    origins = visited_origins(driver)  # 关闭窗口前收集，预加载等标签页访问过的源同样清理
+    handles = driver.window_handles
+    for handle in handles[1:]:  # 只保留第一个窗口
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    for origin in origins:
+        driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+    driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+    driver.get('about:blank')
+
+
+class BrowserService:
+    """
+    常驻浏览器服务：按加载配置预热会话，借出时直接从空闲队列取出，归还后在后台清理再放回。
+    - 归还时 discard 为 True（如健康监控判定浏览器内存过高）则关闭该浏览器并补充一个新会话。
+    - 清理失败的会话同样关闭并补充。
+
+    接口（JSON）:
+        POST /acquire  {"profile": "visual"}            -> 会话信息，没有空闲会话时返回 404
+        POST /release  {"session_id": ..., "discard": false}
+        GET  /status                                    -> 各加载配置的空闲与借出数量
+
+    参数:
+        profiles (dict): 加载配置 -> 预热会话数量，如 {'visual': 2}。
+        host (str): 监听地址。
+        port (int): 监听端口。
+    """
+
+    def __init__(self, profiles, host='127.0.0.1', port=8765):
+        self.profiles = profiles  # 加载配置 -> 会话数量
+        self.idle = {profile: queue.Queue() for profile in profiles}  # 空闲会话
+        self.leased = {}  # session_id -> (加载配置, 驱动)
+        self._lock = threading.Lock()  # 保护借出表
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="browser-service")  # 预热与清理
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        """
+        服务地址。
+        """
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _warm(self, profile):
+        """
+        启动一个会话并放入空闲队列。
+        """
+        try:
+            driver = driver_(profile)
+            driver.get('about:blank')
+        except Exception as exc:  # 后台任务的异常不会被取回，在这里记录
+            logger.error("会话预热失败: %s %s", profile, exc)
+            raise
+        self.idle[profile].put(driver)
+        logger.info("会话已预热: %s %s", profile, driver.session_id)
+
+    def start(self):
+        """
+        并行预热所有会话。
+        """
+        futures = [self._executor.submit(self._warm, profile)
+                   for profile, count in self.profiles.items() for _ in range(count)]
+        for future in futures:
+            future.result()
+        logger.info("浏览器服务已启动: %s，会话: %s", self.url, self.profiles)
+        return self
+
+    def serve_forever(self):
+        """
+        处理接口请求，直到进程结束。
+        """
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self.stop()
+
+    def acquire(self, profile):
+        """
+        借出一个空闲会话。
+
+        返回:
+            dict | None: 会话信息；没有空闲会话时返回 None。
+        """
+        if profile not in self.idle:
+            return None
+        try:
+            driver = self.idle[profile].get_nowait()
+        except queue.Empty:
+            return None
+        with self._lock:
+            self.leased[driver.session_id] = (profile, driver)
+        return {'executor': driver.service.service_url, 'session_id': driver.session_id,
+                'capabilities': driver.capabilities, 'profile': profile}
+
+    def release(self, session_id, discard=False):
+        """
+        归还会话：在后台清理状态后放回空闲队列；discard 为 True 或清理失败时关闭并补充新会话。
+        """
+        with self._lock:
+            profile, driver = self.leased.pop(session_id, (None, None))
+        if driver is None:
+            return False
+        self._executor.submit(self._recycle, profile, driver, discard)
+        return True
+
+    def _recycle(self, profile, driver, discard):
+        """
+        后台清理归还的会话并放回空闲队列；需要关闭时关闭并补充新会话。
+        """
+        if not discard:
+            try:
+                reset_session(driver)
+                self.idle[profile].put(driver)
+                return
+            except Exception as exc:  # 浏览器已崩溃或无响应
+                logger.warning("会话清理失败，重新启动: %s", exc)
+        try:
+            driver.quit()
+        except Exception as exc:  # 浏览器可能已经崩溃
+            logger.warning("关闭会话失败: %s %s", profile, exc)
+        self._warm(profile)
+
+    def status(self):
+        """
+        各加载配置的空闲与借出数量。
+        """
+        with self._lock:
+            leased = [profile for profile, _ in self.leased.values()]
+        return {profile: {'idle': self.idle[profile].qsize(), 'leased': leased.count(profile)}
+                for profile in self.profiles}
+
+    def stop(self):
+        """
+        关闭所有会话并停止服务。
+        """
+        self._httpd.server_close()
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            drivers = [driver for _, driver in self.leased.values()]
+            self.leased.clear()
+        for q in self.idle.values():
+            while not q.empty():
+                drivers.append(q.get_nowait())
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as exc:  # 浏览器可能已经崩溃
+                logger.warning("关闭会话失败: %s", exc)
+
+    def _handler(self):
+        """
+        创建绑定到当前服务的请求处理类。
+        """
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # 支持长连接
+
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == '/status':
+                    self._reply(200, service.status())
+                else:
+                    self._reply(404, {'error': 'not found'})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if self.path == '/acquire':
+                    info = service.acquire(body.get('profile', 'full'))
+                    self._reply(200 if info else 404, info or {'error': 'no idle session'})
+                elif self.path == '/release':
+                    self._reply(200, {'released': service.release(body.get('session_id'), body.get('discard', False))})
+                else:
+                    self._reply(404, {'error': 'not found'})
+
+            def log_message(self, format, *args):  # 关闭默认的请求日志输出
+                pass
+
+        return Handler
+
+
+def call_service(url, path, payload, timeout=1.0):
+    """
+    调用服务接口，返回 JSON 响应；服务不可用或返回错误时返回 None。
+    """
+    request = Request(url.rstrip('/') + path, data=json.dumps(payload).encode('utf-8'),
+                      headers={'Content-Type': 'application/json'}, method='POST')
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except (URLError, OSError, ValueError):  # HTTPError 是 URLError 的子类，404 同样返回 None
+        return None
+
+
+class SessionDriver(RemoteWebDriver):
+    """
+    连接到服务中已有会话的驱动：不新建会话，quit 时把会话归还给服务。
+
+    参数:
+        service_url (str): 浏览器服务地址。
+        info (dict): /acquire 返回的会话信息。
+    """
+
+    def __init__(self, service_url, info):
+        self.service_url = service_url  # 浏览器服务地址
+        self._info = info  # 会话信息
+        executor = ChromiumRemoteConnection(remote_server_addr=info['executor'], vendor_prefix='goog',
+                                            browser_name='chrome', keep_alive=True, ignore_proxy=True)
+        super().__init__(command_executor=executor, options=Options())
+
+    def start_session(self, capabilities, *args, **kwargs):
+        """
+        不新建会话，直接使用服务借出的会话。
+        """
+        self.session_id = self._info['session_id']
+        self.caps = self._info['capabilities']
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        """
+        执行 DevTools 命令，与 ChromiumDriver.execute_cdp_cmd 一致。
+        """
+        return self.execute('executeCdpCommand', {'cmd': cmd, 'params': cmd_args})['value']
+
+    def quit(self):
+        """
+        归还会话，浏览器由服务清理后继续复用。
+        """
+        call_service(self.service_url, '/release', {'session_id': self.session_id})
+
+    def discard(self):
+        """
+        归还并要求服务关闭该浏览器、补充新会话（用于健康监控重启浏览器）。
+        """
+        call_service(self.service_url, '/release', {'session_id': self.session_id, 'discard': True})
+
+
+def acquire_driver(profile='full', service_url=None):
+    """
+    向常驻浏览器服务借用一个会话。
+
+    参数:
+        profile (str): 加载配置名称。
+        service_url (str): 服务地址，默认读取环境变量 BAIDU_DEMO_BROWSER_SERVICE。
+
+    返回:
+        SessionDriver | None: 已连接的驱动；未配置服务、服务不可用或没有空闲会话时返回 None。
+    """
+    service_url = service_url or os.environ.get(SERVICE_ENV)
+    if not service_url:
+        return None
+    info = call_service(service_url, '/acquire', {'profile': profile})
+    if info is None:
+        logger.info("浏览器服务没有可用会话，改为启动新浏览器: %s", service_url)
+        return None
+    driver = SessionDriver(service_url, info)
+    driver.load_profile = profile  # 与 driver_() 返回的驱动保持相同的属性
+    driver.ready_states = PROFILES[profile]['ready_states']
+    driver.cdp_commands = profile_commands(profile)  # 新标签页需要重新执行的 DevTools 设置
+    driver.tab_setup = []  # 按标签页生效的功能（如 HTTP 回放拦截）在此登记
+    prepare_tab(driver)  # 归还时会话已清理，重新应用加载配置
+    instrument(driver)  # 安装命令耗时统计
+    logger.info("已从浏览器服务借用会话: %s %s", profile, driver.session_id)
+    return driver
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="常驻浏览器服务")
+    parser.add_argument('--profile', action='append', default=[], metavar='NAME=COUNT',
+                        help="预热的加载配置与会话数量，可重复指定，默认 full=1")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    setup_logging()
+    Metrics.shared().enabled = False  # 服务进程中的命令不属于任何测试，不记录耗时
+    profiles = dict((name, int(count)) for name, count in (item.split('=', 1) for item in args.profile or ['full=1']))
+    BrowserService(profiles, args.host, args.port).start().serve_forever()
@@ -0,0 +1,219 @@
+"""
+    BasePage层：截图服务，测试线程只负责抓取画面，解码、缩放、压缩与去重在后台线程池中完成
+"""
+import base64  # 解码 WebDriver 返回的 base64 截图数据
+import hashlib  # 未安装 Pillow 时使用内容哈希做精确去重
+import io  # 内存字节流，用于图片编码
+import logging  # 日志模块
+import threading  # 保护共享实例的创建
+from collections import deque  # 待处理截图队列，保证附件按抓取顺序写入报告
+from concurrent.futures import ThreadPoolExecutor  # 后台线程池
+import allure  # Allure 报告，用于附加截图
+from base_page.metrics_page import Metrics, timed  # 导入耗时统计：读取当前关键词与页码标签，记录截图抓取耗时
+
+try:  # Pillow 为可选依赖：安装后启用缩放、压缩与感知哈希去重
+    from PIL import Image
+except ImportError:  # 未安装时退化为原图附加 + 精确去重
+    Image = None
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+
+def dhash(img, size=16):
+    """
+    计算图片的差值感知哈希（dHash）。
+    - 缩放为 (size+1) x size 的灰度图，比较相邻像素亮度得到 size*size 位的指纹。
+
+    参数:
+        img (Image): Pillow 图片对象。
+        size (int): 哈希边长。
+
+    返回:
+        int: 感知哈希值。
+    """
+    pixels = list(img.convert('L').resize((size + 1, size)).getdata())  # 灰度化并缩放
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)  # 左侧像素更亮记为 1
+    return bits
+
+
+class Shot:
+    """
+    处理完成的截图。
+
+    属性:
+        name (str): 截图名称。
+        data (bytes): 编码后的图片数据。
+        fingerprint (int | str): 感知哈希（Pillow 可用时）或内容哈希。
+        attachment_type: 对应的 Allure 附件类型。
+        unit (tuple): 抓取时所处的 (关键词, 页码)，只在同一单元内去重。
+    """
+
+    def __init__(self, name, data, fingerprint, attachment_type, unit=None):
+        self.name = name  # 截图名称
+        self.data = data  # 图片数据
+        self.fingerprint = fingerprint  # 去重指纹
+        self.attachment_type = attachment_type  # Allure 附件类型
+        self.unit = unit  # 所属 (关键词, 页码)
+
+
+class ScreenshotService:
+    """
+    截图服务：统一封装截图的抓取、后台处理、去重与附加到 Allure 报告。
+    - capture 只在测试线程中抓取 base64 画面，随后立即返回。
+    - 后台线程池负责解码、缩放、压缩并计算感知哈希。
+    - 只在同一 (关键词, 页码) 单元内去重：与该单元上一张截图指纹相同或相近（汉明距离不超过 threshold）的画面会被跳过，
+      不同关键词或页码的截图即使画面相近也全部保留（结果页大面积留白，整体画面容易相近）。
+    - 感知哈希为 16x16 共 256 位，阈值 4 约为 1.5% 的差异。
+    - drain / flush 在测试线程中按抓取顺序将截图附加到 Allure 报告（Allure 上下文只在测试线程中有效）。
+    """
+
+    _shared = None  # 全局共享实例
+    _shared_lock = threading.Lock()  # 保护共享实例的创建
+
+    def __init__(self, workers=2, max_width=1280, quality=70, threshold=4):
+        """
+        初始化截图服务。
+
+        参数:
+            workers (int): 后台处理线程数。
+            max_width (int): 截图最大宽度，超过时等比缩放。
+            quality (int): JPEG 压缩质量。
+            threshold (int): 感知哈希汉明距离阈值，不超过该值视为重复画面。
+        """
+        self.max_width = max_width  # 最大宽度
+        self.quality = quality  # 压缩质量
+        self.threshold = threshold  # 去重阈值
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screenshot")  # 后台线程池
+        self._pending = deque()  # 尚未附加的截图任务
+        self._last = None  # 上一张已保留截图的 (单元, 指纹)
+        self.captured = 0  # 抓取数量
+        self.skipped = 0  # 因重复被跳过的数量
+
+    @classmethod
+    def shared(cls):
+        """
+        获取全局共享的截图服务实例，不存在时创建。
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:  # 加锁后再次检查，避免多个线程各自创建
+                    cls._shared = cls()
+        return cls._shared
+
+    @timed
+    def capture(self, driver, name, full_page=False):
+        """
+        抓取当前画面并提交后台处理，立即返回。
+
+        参数:
+            driver (WebDriver): 浏览器驱动。
+            name (str): 截图名称。
+            full_page (bool): 是否通过 DevTools 截取整页（含视口外内容）。
+        """
+        tags = Metrics.shared().tags()  # search_keyword 为每个单元设置的关键词与页码
+        unit = (tags.get('keyword'), tags.get('page'))
+        raw = self._grab_full(driver) if full_page else None  # 整页截图失败时退回视口截图
+        if raw is None:
+            raw = driver.get_screenshot_as_base64()  # 只抓取 base64 数据，解码留给后台线程
+        self._pending.append(self._executor.submit(self._process, name, raw, unit))  # 提交后台处理
+        self.captured += 1
+
+    @staticmethod
+    def _grab_full(driver):
+        """
+        通过 Chrome DevTools 的 Page.captureScreenshot 截取整页画面。
+
+        返回:
+            str | None: base64 图片数据，浏览器不支持 DevTools 命令时返回 None。
+        """
+        if not hasattr(driver, 'execute_cdp_cmd'):
+            return None
+        try:
+            metrics = driver.execute_cdp_cmd('Page.getLayoutMetrics', {})  # 获取页面完整尺寸
+            size = metrics.get('cssContentSize') or metrics['contentSize']
+            clip = {'x': 0, 'y': 0, 'width': size['width'], 'height': size['height'], 'scale': 1}
+            return driver.execute_cdp_cmd('Page.captureScreenshot', {
+                'format': 'png', 'captureBeyondViewport': True, 'clip': clip,
+            })['data']
+        except Exception as exc:  # DevTools 命令失败时退回视口截图
+            logger.warning("整页截图失败，改用视口截图: %s", exc)
+            return None
+
+    def _process(self, name, raw, unit=None):
+        """
+        后台线程：解码、计算指纹、缩放并压缩截图。
+        """
+        png = base64.b64decode(raw)
+        if Image is None:  # 未安装 Pillow，原图附加
+            return Shot(name, png, hashlib.sha1(png).hexdigest(), allure.attachment_type.PNG, unit)
+        img = Image.open(io.BytesIO(png))
+        img.load()
+        fingerprint = dhash(img)  # 感知哈希
+        if img.width > self.max_width:  # 超过最大宽度时等比缩放
+            img = img.resize((self.max_width, round(img.height * self.max_width / img.width)))
+        buf = io.BytesIO()
+        img.convert('RGB').save(buf, 'JPEG', quality=self.quality, optimize=True)  # 压缩为 JPEG
+        return Shot(name, buf.getvalue(), fingerprint, allure.attachment_type.JPG, unit)
+
+    def _duplicate(self, shot):
+        """
+        判断截图是否与同一单元内上一张保留的截图重复。
+        """
+        if self._last is None or self._last[0] != shot.unit:
+            return False
+        last = self._last[1]
+        if isinstance(shot.fingerprint, int):  # 感知哈希按汉明距离比较
+            return bin(shot.fingerprint ^ last).count('1') <= self.threshold
+        return shot.fingerprint == last  # 内容哈希精确比较
+
+    def collect(self, wait=True):
+        """
+        按抓取顺序取出已处理完成的截图，并跳过重复画面。
+
+        参数:
+            wait (bool): 是否等待所有截图处理完成；为 False 时只取出队首已完成的部分。
+
+        返回:
+            list[Shot]: 去重后的截图列表。
+        """
+        shots = []
+        while self._pending and (wait or self._pending[0].done()):
+            shot = self._pending.popleft().result()
+            if self._duplicate(shot):
+                self.skipped += 1
+                logger.debug("跳过重复截图: %s", shot.name)
+                continue
+            self._last = (shot.unit, shot.fingerprint)
+            shots.append(shot)
+        return shots
+
+    def drain(self, wait=False):
+        """
+        在测试线程中将已处理完成的截图附加到 Allure 报告。
+        """
+        for shot in self.collect(wait):
+            allure.attach(shot.data, name=shot.name, attachment_type=shot.attachment_type)
+
+    def flush(self):
+        """
+        等待所有截图处理完成并附加到 Allure 报告，通常在步骤或用例结束时调用。
+        """
+        self.drain(wait=True)
+
+    def close(self):
+        """
+        关闭后台线程池，不写入 Allure 报告（可能已不在任何用例中）；调用方应在用例内先 flush，
+        此时仍未附加的截图会被丢弃并记录日志。
+        """
+        dropped = len(self.collect(wait=True))
+        if dropped:
+            logger.warning("截图服务关闭时仍有 %d 张截图未附加到报告，已丢弃", dropped)
+        self._executor.shutdown(wait=True)
+        logger.info("截图服务关闭：共抓取 %d 张，跳过重复 %d 张", self.captured, self.skipped)
+        if ScreenshotService._shared is self:
+            ScreenshotService._shared = None
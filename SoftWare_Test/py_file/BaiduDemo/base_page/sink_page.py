@@ -0,0 +1,236 @@
+"""
+    BasePage层：结构化结果输出，在内存中缓冲标题记录，由后台线程按批写入 JSONL / CSV / SQLite，并对重复标题去重
+"""
+import csv  # CSV 输出
+import hashlib  # 计算去重键
+import json  # JSON Lines 输出
+import logging  # 日志模块
+import os  # 创建输出目录
+import queue  # 待写入批次队列
+import sqlite3  # SQLite 输出
+import threading  # 后台写入线程与缓冲区锁
+import time  # 记录提取时间
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+FIELDS = ('keyword', 'page', 'rank', 'title', 'href', 'timestamp')  # 记录字段
+
+
+def record_key(keyword, title, href):
+    """
+    计算标题记录的去重键：同一关键词下标题与链接相同即视为重复（不同关键词的相同结果各自保留），8 字节摘要，内存占用小。
+    """
+    return hashlib.blake2b(f"{keyword}\t{title}\t{href}".encode('utf-8'), digest_size=8).digest()
+
+
+class JsonlWriter:
+    """
+    JSON Lines 写入器，每条记录一行，追加写入。
+    """
+
+    def __init__(self, path):
+        self.path = path  # 输出文件路径
+        self.file = None  # 在写入线程中打开
+
+    def keys(self):
+        """
+        读取已有文件中的记录，返回去重键，用于跨运行去重。
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    row = json.loads(line)
+                    yield record_key(row['keyword'], row['title'], row['href'])
+
+    def write(self, rows):
+        if self.file is None:
+            self.file = open(self.path, 'a', encoding='utf-8')
+        self.file.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+class CsvWriter(JsonlWriter):
+    """
+    CSV 写入器，新文件首行写入表头，utf-8-sig 编码便于 Excel 打开。
+    """
+
+    def keys(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8-sig', newline='') as file:
+            for row in csv.DictReader(file):
+                yield record_key(row['keyword'], row['title'], row['href'] or None)
+
+    def write(self, rows):
+        if self.file is None:
+            new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self.file = open(self.path, 'a', encoding='utf-8-sig' if new else 'utf-8', newline='')
+            self.writer = csv.DictWriter(self.file, fieldnames=FIELDS)
+            if new:
+                self.writer.writeheader()
+        self.writer.writerows(rows)
+        self.file.flush()
+
+
+class SqliteWriter:
+    """
+    SQLite 写入器，每批记录在一个事务中提交。
+    """
+
+    def __init__(self, path):
+        self.path = path  # 数据库文件路径
+        self.conn = None  # 在写入线程中打开
+
+    def keys(self):
+        if not os.path.exists(self.path):
+            return
+        conn = sqlite3.connect(self.path)
+        try:
+            rows = conn.execute("SELECT keyword, title, href FROM results").fetchall()
+        except sqlite3.OperationalError:  # 表尚未创建
+            rows = []
+        finally:
+            conn.close()
+        for keyword, title, href in rows:
+            yield record_key(keyword, title, href)
+
+    def write(self, rows):
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path)
+            self.conn.execute("PRAGMA journal_mode=WAL")  # WAL 模式，提交开销更小
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " keyword TEXT, page INTEGER, rank INTEGER, title TEXT, href TEXT, timestamp REAL)")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO results (keyword, page, rank, title, href, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+                [tuple(row[field] for field in FIELDS) for row in rows])
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+
+WRITERS = {'.jsonl': JsonlWriter, '.csv': CsvWriter, '.sqlite': SqliteWriter, '.db': SqliteWriter}  # 扩展名 -> 写入器
+
+
+class ResultSink:
+    """
+    标题结果输出：add 只把记录追加到内存缓冲区，攒满一批后交给后台线程写入文件，不阻塞测试流程。
+    - 输出格式由文件扩展名决定：.jsonl / .csv / .sqlite（.db）。
+    - 去重索引保存关键词、标题与链接的 8 字节摘要；启用去重时重复记录不再写入，只计数。
+      resume 为 True 时先从已有输出文件加载索引并追加写入，跨运行去重；否则清空已有输出。
+    - 多个工作线程可共用同一个实例。
+
+    参数:
+        path (str): 输出文件路径。
+        batch (int): 每批写入的记录数。
+        dedup (bool): 是否跳过重复记录。
+        resume (bool): 是否保留已有输出并追加。
+    """
+
+    def __init__(self, path, batch=500, dedup=True, resume=False):
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in WRITERS:
+            raise ValueError(f"不支持的结果文件格式: {path}")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if not resume and os.path.exists(path):
+            os.remove(path)  # 非续跑模式：重新输出
+        self.path = path  # 输出文件路径
+        self.batch = batch  # 批大小
+        self.dedup = dedup  # 是否去重
+        self.writer = WRITERS[ext](path)  # 写入器
+        self.seen = set(self.writer.keys())  # 去重索引
+        self.added = 0  # 写入的记录数
+        self.duplicates = 0  # 跳过的重复记录数
+        self._buffer = []  # 待写入记录
+        self._lock = threading.Lock()  # 保护缓冲区与去重索引
+        self._queue = queue.Queue()  # 待写入批次，None 表示结束
+        self._error = None  # 后台写入异常，在 flush 时抛出
+        self._thread = threading.Thread(target=self._run, name="result-sink", daemon=True)
+        self._thread.start()
+        logger.info("结果输出: %s，已有记录 %d 条", path, len(self.seen))
+
+    def add(self, keyword, page, titles):
+        """
+        追加一页的标题记录。
+
+        参数:
+            keyword (str): 搜索关键词。
+            page (int): 页码。
+            titles (list[dict]): titles_ 返回的标题记录，包含 text 与 href。
+
+        返回:
+            int: 本页重复的标题数量。
+        """
+        now = time.time()
+        duplicates = 0
+        with self._lock:
+            for rank, title in enumerate(titles, start=1):
+                key = record_key(keyword, title['text'], title['href'])
+                if key in self.seen:
+                    duplicates += 1
+                    if self.dedup:
+                        continue
+                self.seen.add(key)
+                self._buffer.append({'keyword': keyword, 'page': page, 'rank': rank,
+                                     'title': title['text'], 'href': title['href'], 'timestamp': now})
+            self.added += len(titles) - (duplicates if self.dedup else 0)
+            self.duplicates += duplicates
+            if len(self._buffer) >= self.batch:
+                self._queue.put(self._buffer)  # 整批交给后台线程
+                self._buffer = []
+        return duplicates
+
+    def _run(self):
+        """
+        后台写入线程：逐批写入，收到结束标记时关闭写入器（SQLite 连接只能在创建它的线程中使用）。
+        """
+        while True:
+            rows = self._queue.get()
+            try:
+                if rows is None:
+                    self.writer.close()
+                    return
+                if self._error is None:
+                    self.writer.write(rows)
+            except Exception as exc:  # 记录写入异常，由 flush 在调用线程中抛出
+                logger.error("结果写入失败: %s", exc)
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """
+        写入缓冲区中剩余的记录，并等待后台线程写完。
+        """
+        with self._lock:
+            if self._buffer:
+                self._queue.put(self._buffer)
+                self._buffer = []
+        self._queue.join()
+        if self._error is not None:
+            raise self._error
+
+    def stats(self):
+        """
+        返回输出统计：写入数、重复数与去重索引大小。
+        """
+        return {'added': self.added, 'duplicates': self.duplicates, 'seen': len(self.seen)}
+
+    def close(self):
+        """
+        写入剩余记录并停止后台线程。
+        """
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+            logger.info("结果输出结束: %s，%s", self.path, self.stats())
@@ -0,0 +1,328 @@
+"""
+    BasePage层：单个浏览器内多个标签页并发执行任务
+    - TabDriver：单个标签页的驱动视图，作为页面对象的 driver 使用；脚本、导航、截图与 DevTools 命令
+      通过附加到本标签页的 DevTools 会话直接发送，各标签页互不等待
+    - TabRouter：打开标签页并接管驱动的命令发送，其余 WebDriver 命令（元素查找与操作）按线程路由到绑定的标签页
+    多个标签页共用一个浏览器进程，内存占用远小于每个工作线程一个浏览器的 BrowserPool。
+"""
+import json  # 脚本参数序列化
+import logging  # 日志模块
+import queue  # 空闲标签页队列
+import threading  # 线程局部的标签页绑定与命令锁
+from time import sleep, monotonic, perf_counter  # 导航等待的轮询与超时、命令计时
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException  # 脚本错误、超时与会话错误
+from selenium.webdriver.common.timeouts import Timeouts  # 本标签页的脚本超时
+from selenium.webdriver.remote.command import Command  # WebDriver 命令名称
+from base_page.cdp_page import DevTools, trio  # 浏览器级 DevTools 连接
+from base_page.http_page import run_concurrently  # 在 asyncio 事件循环上并发执行阻塞任务
+from base_page.driver_page import prepare_tab  # 新标签页需要重新执行加载配置的 DevTools 设置
+from base_page.metrics_page import Metrics, NAVIGATION_COMMANDS  # 会话命令同样计入耗时统计
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+MARK_JS = "window.__tabNavigating = true;"  # 导航前标记旧文档
+NAVIGATED_JS = "window.__tabNavigating === undefined"  # 标记消失即已进入新文档
+CHECK_RESULT_JS = """function(result) {
+    if (result instanceof Node || (Array.isArray(result) && result.some(item => item instanceof Node)))
+        throw new Error('多标签页模式下脚本不能返回页面元素，请使用 find_element');
+    return result;
+}"""  # 元素无法按值返回，明确报错而不是返回空对象
+SCRIPT_JS = "({check})((function() {{\n{script}\n}}).apply(null, {args}))"  # 同步脚本，与 execute_script 一致
+ASYNC_SCRIPT_JS = ("new Promise(function(resolve) {{ (function() {{\n{script}\n}}).apply(null, {args}.concat([resolve])); }})"
+                   ".then({check})")  # 异步脚本：最后一个参数为回调，与 execute_async_script 一致
+CONTEXT_ERRORS = ('Execution context was destroyed', 'Cannot find context')  # 文档切换瞬间的瞬时错误
+
+
+class TabDriver:
+    """
+    单个标签页的驱动视图：脚本、导航、截图与 DevTools 命令经本标签页的 DevTools 会话发送，不经过命令锁；
+    其余属性与方法转发给共享的浏览器驱动，由 TabRouter 路由到本标签页。
+    - get 只发起导航并等待新文档出现，页面加载由调用方（如 BasePage.wait_ready）等待。
+    - 参数中含有元素的脚本仍经 WebDriver 执行；脚本不能返回元素。
+    - 每个标签页是独立的对象，元素缓存等按驱动区分的状态互不干扰。
+    - quit 只关闭本标签页，浏览器由创建它的一方关闭，便于健康监控按标签页重启。
+
+    参数:
+        router (TabRouter): 标签页路由器。
+        handle (str): 标签页窗口句柄。
+    """
+
+    def __init__(self, router, handle):
+        self.router = router  # 所属路由器
+        self.handle = handle  # 标签页窗口句柄
+        self.context = None  # setup 为本标签页创建的上下文（如页面对象）
+        self.script_timeout = router.script_timeout  # 本标签页的脚本超时（秒）
+
+    def __getattr__(self, name):
+        return getattr(self.router.driver, name)  # 其余属性与方法直接使用共享驱动
+
+    def _cdp(self, name, method, params=None, timeout=None):
+        """
+        在本标签页的 DevTools 会话上执行命令，耗时按 WebDriver 命令名 name 计入统计；
+        文档切换瞬间的上下文错误在导航超时内重试。
+        """
+        handle = self.router.bound_handle() or self.handle  # 任务中切换过窗口时以线程绑定的标签页为准
+        deadline = monotonic() + self.router.timeout
+        start = perf_counter()
+        try:
+            while True:
+                try:
+                    return self.router.devtools.execute(self.router.session(handle), method, params, timeout)
+                except trio.TooSlowError:
+                    raise TimeoutException(f"标签页命令超时({timeout}s): {method}") from None
+                except Exception as exc:  # 协议错误与连接断开
+                    if any(marker in str(exc) for marker in CONTEXT_ERRORS) and monotonic() < deadline:
+                        sleep(self.router.poll)
+                        continue
+                    raise WebDriverException(f"{method} 失败: {exc}") from exc
+        finally:
+            bucket = 'network' if name in NAVIGATION_COMMANDS else 'driver'
+            Metrics.shared().record('command', name, perf_counter() - start, bucket)
+
+    def _evaluate(self, name, expression, timeout=None):
+        """
+        在本标签页执行表达式并按值返回结果，Promise 等待完成后返回。
+        """
+        response = self._cdp(name, 'Runtime.evaluate', {
+            'expression': expression, 'returnByValue': True, 'awaitPromise': True, 'userGesture': True}, timeout)
+        details = response.get('exceptionDetails')
+        if details:
+            raise JavascriptException((details.get('exception') or {}).get('description') or details.get('text'))
+        return response['result'].get('value')  # undefined 没有 value，返回 None
+
+    def _script(self, template, name, script, args):
+        """
+        执行同步或异步脚本；参数不能按 JSON 传递（如包含元素）时返回 NotImplemented，由调用方改走 WebDriver。
+        """
+        try:
+            payload = json.dumps(list(args))
+        except TypeError:
+            return NotImplemented
+        return self._evaluate(name, template.format(check=CHECK_RESULT_JS, script=script, args=payload),
+                              self.script_timeout)
+
+    def execute_script(self, script, *args):
+        result = self._script(SCRIPT_JS, Command.W3C_EXECUTE_SCRIPT, script, args)
+        if result is NotImplemented:
+            return self.router.driver.execute_script(script, *args)
+        return result
+
+    def execute_async_script(self, script, *args):
+        result = self._script(ASYNC_SCRIPT_JS, Command.W3C_EXECUTE_SCRIPT_ASYNC, script, args)
+        if result is NotImplemented:
+            return self.router.driver.execute_async_script(script, *args)
+        return result
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        """
+        执行 DevTools 命令，与 ChromiumDriver.execute_cdp_cmd 一致，但作用于本标签页。
+        """
+        return self._cdp('executeCdpCommand', cmd, cmd_args)
+
+    def set_script_timeout(self, time_to_wait):
+        self.script_timeout = time_to_wait
+
+    @property
+    def timeouts(self):
+        return Timeouts(script=self.script_timeout)
+
+    @property
+    def current_url(self):
+        return self._evaluate(Command.GET_CURRENT_URL, 'location.href')
+
+    @property
+    def title(self):
+        return self._evaluate(Command.GET_TITLE, 'document.title')
+
+    def get_screenshot_as_base64(self):
+        return self._cdp(Command.SCREENSHOT, 'Page.captureScreenshot', {'format': 'png'})['data']
+
+    def get(self, url):
+        """
+        在本标签页打开地址：标记旧文档后发起导航，等待旧文档被替换。
+        """
+        self._evaluate(Command.W3C_EXECUTE_SCRIPT, MARK_JS)
+        response = self._cdp(Command.GET, 'Page.navigate', {'url': url}, self.router.timeout)
+        if response.get('errorText'):
+            raise WebDriverException(f"标签页导航失败: {url}: {response['errorText']}")
+        deadline = monotonic() + self.router.timeout
+        while not self._evaluate(Command.W3C_EXECUTE_SCRIPT, NAVIGATED_JS):
+            if monotonic() >= deadline:
+                raise TimeoutException(f"标签页导航超时: {url}")
+            sleep(self.router.poll)
+
+    def quit(self):
+        """
+        关闭本标签页，不改变当前线程绑定的标签页。
+        """
+        self.router.close_tab(self.handle)
+
+    discard = quit  # 健康监控重启时优先调用 discard，不能转发到共享驱动
+
+
+class TabRouter:
+    """
+    在一个浏览器内打开 size 个标签页，并发执行任务，每个任务独占一个标签页。
+    - 脚本、导航、截图与 DevTools 命令由 TabDriver 经各标签页的 DevTools 会话发送，不经过命令锁。
+    - 接管 driver.execute：其余命令（元素查找与操作）需要 WebDriver 的当前窗口，绑定了标签页的线程发送时，
+      仅在当前窗口不是该标签页时先切换，切换与命令在同一把锁内完成，不会被其他线程打断。
+    - 线程内主动切换窗口（switch_to.window）会改变该线程绑定的标签页。
+    - 驱动宜使用 page_load_strategy='none' 创建，否则点击等引起导航的元素命令会在命令锁内等待页面加载。
+    - 使用完毕 close 只关闭额外打开的标签页，驱动由调用方关闭。
+
+    参数:
+        driver (WebDriver): 浏览器驱动，可以是已在使用的驱动（如 health.driver），第一个标签页即其当前标签页。
+        size (int): 标签页数量。
+        timeout (int | float): TabDriver.get 等待新文档出现的超时时间（秒）。
+        poll (float): TabDriver.get 的轮询间隔（秒）。
+    """
+
+    def __init__(self, driver, size=4, timeout=30, poll=0.1):
+        self.driver = driver  # 共享的浏览器驱动
+        self.size = size  # 标签页数量
+        self.timeout = timeout  # 导航超时
+        self.poll = poll  # 导航轮询间隔
+        self.script_timeout = 30  # 标签页脚本的默认超时（秒），start 时读取驱动的设置
+        self.devtools = None  # 浏览器级 DevTools 连接
+        self.tabs = []  # 标签页列表
+        self._sessions = {}  # 窗口句柄 -> DevTools 会话
+        self._sessions_lock = threading.Lock()  # 保护会话表，与命令锁分开，创建会话不等待元素命令
+        self._execute = None  # 被接管前的 driver.execute
+        self._current = None  # 浏览器当前所在的窗口句柄
+        self._lock = threading.RLock()  # 保证"切换窗口 + 执行命令"不被其他线程打断
+        self._local = threading.local()  # 线程绑定的标签页句柄
+        self._free = queue.Queue()  # 空闲标签页
+
+    def start(self):
+        """
+        打开标签页、建立 DevTools 连接并接管命令发送。
+        """
+        self.script_timeout = self.driver.timeouts.script
+        self.devtools = DevTools(self.driver, name="tab-router").start(self.timeout)
+        handles = [self.driver.current_window_handle]
+        for _ in range(self.size - 1):
+            self.driver.switch_to.new_window('tab')  # 新建空白标签页
+            prepare_tab(self.driver)  # 资源屏蔽等设置不会从第一个标签页继承
+            handles.append(self.driver.current_window_handle)
+        self._current = handles[-1]
+        self._execute = self.driver.execute
+        self.driver.execute = self._routed  # 实例属性覆盖，驱动与元素上的命令都经过路由
+        for handle in handles:
+            tab = TabDriver(self, handle)
+            self.tabs.append(tab)
+            self._free.put(tab)
+        logger.info("多标签页已就绪，标签页数量: %d", self.size)
+        return self
+
+    def new_tab(self):
+        """
+        在当前线程中新建标签页并执行 prepare_tab，当前线程随即绑定到新标签页；用于健康监控按标签页重启。
+
+        返回:
+            TabDriver: 新标签页的驱动视图。
+        """
+        self.driver.switch_to.new_window('tab')  # 线程内切换窗口即改变绑定的标签页
+        prepare_tab(self.driver)  # 资源屏蔽等设置不会从其他标签页继承
+        return TabDriver(self, self.bound_handle() or self._current)
+
+    def bound_handle(self):
+        """
+        当前线程绑定的标签页句柄，未绑定时为 None。
+        """
+        return getattr(self._local, 'handle', None)
+
+    def session(self, handle):
+        """
+        返回附加到标签页的 DevTools 会话，首次使用时创建。
+        """
+        with self._sessions_lock:
+            session = self._sessions.get(handle)
+        if session is None:
+            session = self.devtools.session(handle)
+            with self._sessions_lock:
+                session = self._sessions.setdefault(handle, session)
+        return session
+
+    def close_tab(self, handle):
+        """
+        关闭指定标签页，不改变当前线程绑定的标签页。
+        """
+        with self._sessions_lock:
+            self._sessions.pop(handle, None)
+        with self._lock:
+            self._execute(Command.SWITCH_TO_WINDOW, {'handle': handle})
+            self._execute(Command.CLOSE, {})
+            self._current = None  # 当前窗口已关闭，下一条命令前必须重新切换
+
+    def close(self):
+        """
+        恢复命令发送、关闭 DevTools 连接与额外打开的标签页，只保留第一个标签页。
+        """
+        if self._execute is None:
+            return
+        self.driver.execute = self._execute
+        self._execute = None
+        self.devtools.close()
+        self._sessions = {}
+        for tab in self.tabs[1:]:
+            try:
+                self.driver.switch_to.window(tab.handle)
+                self.driver.close()
+            except WebDriverException as exc:  # 标签页已被关闭
+                logger.warning("关闭标签页失败: %s", exc)
+        if self.tabs:
+            self.driver.switch_to.window(self.tabs[0].handle)
+        self.tabs = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _routed(self, command, params=None):
+        """
+        替换 driver.execute：按当前线程绑定的标签页路由命令。
+        """
+        handle = self.bound_handle()
+        with self._lock:
+            if command == Command.SWITCH_TO_WINDOW:
+                if handle is not None:
+                    self._local.handle = params['handle']  # 线程内切换窗口即改变绑定的标签页
+                response = self._execute(command, params)
+                self._current = params['handle']
+                return response
+            if handle is not None and handle != self._current:
+                self._execute(Command.SWITCH_TO_WINDOW, {'handle': handle})
+                self._current = handle
+            response = self._execute(command, params)
+            if command == Command.CLOSE:
+                self._current = None  # 当前窗口已关闭，下一条命令前必须重新切换
+            return response
+
+    def run(self, items, task, setup=None):
+        """
+        并发执行任务，每个任务在执行期间独占一个标签页。
+
+        参数:
+            items (iterable): 任务输入。
+            task (callable): 任务函数 task(context, item)，context 为 setup 的返回值（未指定 setup 时为 TabDriver）。
+            setup (callable): 标签页首次执行任务前调用 setup(tab)，返回值作为该标签页的 context；
+                              失败时该任务记为失败，下一个使用该标签页的任务会重新调用。
+
+        返回:
+            list[tuple]: 按输入顺序排列的 (item, 返回值, 异常)。
+        """
+        def work(item):  # 在工作线程中取得一个空闲标签页并绑定到当前线程
+            tab = self._free.get()
+            self._local.handle = tab.handle
+            try:
+                if tab.context is None:
+                    tab.context = setup(tab) if setup else tab
+                return task(tab.context, item)
+            finally:
+                tab.handle = self._local.handle  # 任务中可能切换了窗口，记录标签页的最新句柄
+                self._local.handle = None
+                self._free.put(tab)
+
+        return run_concurrently(items, work, self.size)
@@ -0,0 +1,83 @@
+"""
+    benchmark 基准测试的 fixture：本地模拟服务、浏览器驱动、页面对象与基线
+    可通过环境变量调整：
+        BENCH_LATENCY    模拟服务响应延迟（秒），默认 0
+        BENCH_RESULTS    每页结果数量，默认 10
+        BENCH_PROFILE    浏览器加载配置，默认 visual
+        BENCH_TABS       多标签页场景的标签页数量，默认 4
+        BENCH_THRESHOLD  允许的回归幅度，默认 0.2
+        BENCH_UPDATE     为 1 时用本次结果覆盖基线（benchmark/baseline.json），记录后提交
+"""
+import os  # 读取环境变量
+import pytest  # pytest 测试框架
+from urllib.request import urlopen  # 校准负载的请求
+from base_page.http_page import SerpParser  # 校准负载的解析
+from base_page.driver_page import driver_  # 浏览器驱动生成方法
+from test_cases.support.serp_server import SerpServer  # 本地模拟 SERP 服务
+from benchmark.harness import Baseline, Bench, calibrate  # 基线、计时器与校准
+from test_cases.test_cases import build_pages  # 页面对象构造方法
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")  # 基线文件路径
+CALIBRATION_PAGES = 50  # 校准负载请求并解析的结果页数量
+
+
+@pytest.fixture(scope="session")
+def serp_server():
+    """
+    功能：启动本地模拟 SERP 服务，会话结束时关闭
+    """
+    server = SerpServer(latency=float(os.environ.get("BENCH_LATENCY", "0")),
+                        results=int(os.environ.get("BENCH_RESULTS", "10")))
+    with server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def bench_driver():
+    """
+    功能：基准测试专用的浏览器驱动，默认使用无头的 visual 加载配置
+    """
+    driver = driver_(os.environ.get("BENCH_PROFILE", "visual"), headless=True)
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture(scope="session")
+def tabs_driver():
+    """
+    功能：多标签页场景专用的浏览器驱动，页面加载策略为 none，点击翻页等元素命令不在命令锁内等待页面加载
+    """
+    driver = driver_(os.environ.get("BENCH_PROFILE", "visual"), headless=True, strategy="none")
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture()
+def bench_pages(bench_driver, serp_server):
+    """
+    功能：实例化页面对象，并将打开页的地址指向本地模拟服务
+    """
+    pages = build_pages(bench_driver)
+    pages["open"].url = serp_server.url  # 实例属性覆盖类属性中的百度地址
+    return pages
+
+
+@pytest.fixture(scope="session")
+def bench(serp_server):
+    """
+    功能：提供场景计时器，会话开始时在本机执行校准，会话结束时保存基线
+    校准负载：从本地模拟服务逐个请求并解析 CALIBRATION_PAGES 个结果页，不需要浏览器
+    """
+    def workload():
+        for page in range(1, CALIBRATION_PAGES + 1):
+            url = serp_server.result_url("校准", page % serp_server.max_pages + 1)
+            with urlopen(url) as response:
+                parser = SerpParser(url)
+                parser.feed(response.read().decode("utf-8"))
+                parser.close()
+
+    baseline = Baseline(BASELINE_PATH,
+                        threshold=float(os.environ.get("BENCH_THRESHOLD", "0.2")),
+                        update=os.environ.get("BENCH_UPDATE") == "1")
+    yield Bench(baseline, calibrate(workload))
+    baseline.save()
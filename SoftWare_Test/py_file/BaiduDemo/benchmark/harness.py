@@ -0,0 +1,136 @@
+"""
+    benchmark 基准测试：计时与基线比对
+    功能说明：记录各场景耗时，与保存的基线比较，超过阈值即判定为性能回归
+    - 绝对耗时随机器变化，基线保存的是 场景耗时 / 校准耗时 的比值；校准在每个会话开始时于同一台机器上执行，
+      因此提交到仓库的基线（benchmark/baseline.json）可以在不同机器之间比较。
+    - 基线用 BENCH_UPDATE=1 运行全部场景后记录，场景或校准负载变化时需要重新记录并提交。
+"""
+import json  # 读写基线文件
+import logging  # 日志模块
+import os  # 文件路径
+from time import perf_counter  # 高精度计时
+
+logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
+
+
+def calibrate(func, repeat=5):
+    """
+    校准：执行 repeat 次固定负载，返回最短的一次耗时（秒），作为本机速度的参照。
+    - 取最小值以排除偶发的调度与缓存抖动。
+
+    参数:
+        func (callable): 校准负载，无参数。
+        repeat (int): 执行次数。
+    """
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        seconds = perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    logger.info("校准耗时 %.4fs", best)
+    return best
+
+
+class Baseline:
+    """
+    基线存储：以 JSON 文件保存每个场景相对校准耗时的比值。
+    - 文件格式：{"calibration": 记录时的校准耗时（仅供参考）, "ratios": {场景: 比值}}。
+    - 处于更新模式时，本次结果写入基线；场景没有基线时判定失败，提示以 BENCH_UPDATE=1 记录。
+    - 否则本次比值超过 基线 * (1 + threshold) 即判定为回归。
+
+    参数:
+        path (str): 基线文件路径。
+        threshold (float): 允许的相对回归幅度，0.2 表示允许慢 20%。
+        update (bool): 是否用本次结果覆盖基线。
+    """
+
+    def __init__(self, path, threshold=0.2, update=False):
+        self.path = path  # 基线文件路径
+        self.threshold = threshold  # 回归阈值
+        self.update = update  # 更新模式
+        self.data = {}  # 场景 -> 基线比值
+        self.calibration = None  # 记录基线时的校准耗时
+        self.results = {}  # 场景 -> 本次比值
+        self.dirty = False  # 基线是否有变化需要保存
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                saved = json.load(file)
+            self.data = saved.get('ratios', {})
+            self.calibration = saved.get('calibration')
+
+    def check(self, name, seconds, calibration):
+        """
+        记录场景耗时，换算为相对校准耗时的比值后与基线比较。
+
+        参数:
+            name (str): 场景名称。
+            seconds (float): 场景耗时（秒）。
+            calibration (float): 本会话的校准耗时（秒）。
+
+        返回:
+            str | None: 没有基线或发生回归时返回说明文字，否则返回 None。
+        """
+        ratio = seconds / calibration
+        self.results[name] = ratio
+        if self.update:  # 更新模式：写入基线
+            self.data[name] = round(ratio, 3)
+            self.calibration = round(calibration, 4)
+            self.dirty = True
+            logger.info("基线已记录 %s: %.3fs，比值 %.3f", name, seconds, ratio)
+            return None
+        base = self.data.get(name)
+        if base is None:
+            return f"{name} 没有基线，请以 BENCH_UPDATE=1 运行基准测试记录后提交 {os.path.basename(self.path)}"
+        limit = base * (1 + self.threshold)
+        logger.info("%s: %.3fs，比值 %.3f（基线 %.3f，上限 %.3f）", name, seconds, ratio, base, limit)
+        if ratio > limit:
+            return f"{name} 性能回归: 比值 {ratio:.3f} > 基线 {base:.3f} * (1 + {self.threshold})"
+        return None
+
+    def save(self):
+        """
+        保存基线文件（仅在有变化时写入）。
+        """
+        if not self.dirty:
+            return
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump({'calibration': self.calibration, 'ratios': dict(sorted(self.data.items()))},
+                      file, ensure_ascii=False, indent=2)
+            file.write('\n')
+        logger.info("基线文件已更新: %s", self.path)
+
+
+class Bench:
+    """
+    场景计时器：执行场景函数、计时并与基线比较，没有基线或回归时抛出 AssertionError。
+
+    参数:
+        baseline (Baseline): 基线存储。
+        calibration (float): 本会话的校准耗时（秒），见 calibrate。
+    """
+
+    def __init__(self, baseline, calibration):
+        self.baseline = baseline  # 基线存储
+        self.calibration = calibration  # 校准耗时
+
+    def measure(self, scenario, scale, func):
+        """
+        执行并计时一个场景。
+
+        参数:
+            scenario (str): 场景名称，如 open、search、flow。
+            scale (int): 规模（关键词数量或操作次数）。
+            func (callable): 场景函数，无参数。
+
+        返回:
+            float: 场景总耗时（秒）。
+        """
+        name = f"{scenario}[{scale}]"
+        start = perf_counter()
+        func()
+        seconds = perf_counter() - start
+        logger.info("%s 总耗时 %.3fs，单次 %.4fs", name, seconds, seconds / max(scale, 1))
+        failure = self.baseline.check(name, seconds, self.calibration)
+        assert failure is None, failure
+        return seconds
@@ -0,0 +1,131 @@
+"""
+    benchmark 基准测试：在本地模拟 SERP 服务上测量各页面对象与完整搜索流程的耗时
+    运行方式：pytest benchmark，规模可通过环境变量 BENCH_SCALES 指定，如 BENCH_SCALES=10,100
+"""
+import os  # 读取环境变量
+import pytest  # pytest 测试框架
+from base_page.shot_page import ScreenshotService  # 截图服务
+from test_cases.test_cases import search_keyword, search_http, search_tabs, number_items  # 单关键词流程、各并发流程与行号
+
+SCALES = [int(s) for s in os.environ.get("BENCH_SCALES", "10,100,1000").split(",")]  # 测试规模
+FLIP_NUM = 2  # 完整流程中每个关键词的翻页次数
+TABS = int(os.environ.get("BENCH_TABS", "4"))  # 多标签页场景的标签页数量
+
+
+def keywords(scale):
+    """
+    生成指定数量的关键词。
+    """
+    return [f"关键词{i}" for i in range(scale)]
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_bench_open(bench, bench_pages, scale):
+    """
+    场景：打开首页 scale 次
+    """
+    op = bench_pages["open"]
+    bench.measure("open", scale, lambda: [op.openurl() for _ in range(scale)])
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_bench_search(bench, bench_pages, scale):
+    """
+    场景：在首页打开后连续搜索 scale 个关键词
+    """
+    bench_pages["open"].openurl()
+    sp = bench_pages["search"]
+    bench.measure("search", scale, lambda: [sp.search_(kw) for kw in keywords(scale)])
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_bench_titles(bench, bench_pages, serp_server, scale):
+    """
+    场景：在同一结果页上提取标题 scale 次
+    """
+    tp = bench_pages["titles"]
+    tp.open(serp_server.result_url("标题"))
+    bench.measure("titles", scale, lambda: [tp.titles_(1) for _ in range(scale)])
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_bench_scroll(bench, bench_pages, serp_server, scale):
+    """
+    场景：在同一结果页上从顶部滚动到底部 scale 次
+    """
+    scp = bench_pages["scroll"]
+    scp.open(serp_server.result_url("滚动"))
+
+    def run():
+        for _ in range(scale):
+            scp.execute_script("window.scrollTo(0, 0);")  # 回到顶部，保证每次滚动距离一致
+            scp.scroll_()
+
+    bench.measure("scroll", scale, run)
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_bench_flip(bench, bench_pages, serp_server, scale):
+    """
+    场景：连续翻页 scale 次，翻到最后一页后回到第 1 页继续
+    """
+    fp = bench_pages["flip"]
+    fp.open(serp_server.result_url("翻页"))
+
+    def run():
+        page = 1
+        for _ in range(scale):
+            if page >= serp_server.max_pages:
+                fp.open(serp_server.result_url("翻页"))
+                page = 1
+            fp.flip_(page + 1)
+            page += 1
+
+    bench.measure("flip", scale, run)
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_bench_flow(bench, bench_pages, scale):
+    """
+    场景：完整的 test_search 流程（搜索、逐页提取标题、截图、滚动、翻页），共 scale 个关键词
+    """
+    service = ScreenshotService()  # 独立的截图服务，截图只处理不附加到报告
+    bench_pages["open"].openurl()
+
+    def run():
+        for kw in keywords(scale):
+            search_keyword(bench_pages, kw, FLIP_NUM, service.capture)
+            service.collect()  # 等待本关键词的截图处理完成后丢弃
+
+    try:
+        bench.measure("flow", scale, run)
+    finally:
+        service.close()
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_bench_tabs_flow(bench, serp_server, tabs_driver, scale, monkeypatch):
+    """
+    场景：完整流程在一个浏览器的 BENCH_TABS 个标签页中并发执行，共 scale 个关键词，与 flow 对比
+    """
+    monkeypatch.setattr("page_object.open_page.OpenPage.url", serp_server.url)  # 各标签页的首页指向本地模拟服务
+
+    def run():
+        results = search_tabs(number_items({"content": kw} for kw in keywords(scale)), FLIP_NUM, TABS, tabs_driver)
+        errors = [error for _, _, error in results if error is not None]
+        assert not errors, f"多标签页执行失败: {errors[:3]}"
+
+    bench.measure("tabs_flow", scale, run)
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_bench_http_flow(bench, serp_server, scale):
+    """
+    场景：HTTP 后端的完整流程（搜索、逐页提取标题、翻页，无截图），共 scale 个关键词并发执行，与 flow 对比
+    """
+    def run():
+        results = search_http(number_items({"content": kw} for kw in keywords(scale)), FLIP_NUM, url=serp_server.url)
+        errors = [error for _, _, error in results if error is not None]
+        assert not errors, f"HTTP 后端执行失败: {errors[:3]}"
+
+    bench.measure("http_flow", scale, run)
@@ -0,0 +1,103 @@
+"""
+    benchmark 离线回放测试：对本地模拟 SERP 服务录制完整流程（含后台标签页预加载翻页），停止服务后回放，结果应一致；
+    浏览器池与多标签页模式同样录制后离线回放
+"""
+import os  # 读取环境变量
+import pytest  # pytest 测试框架
+from base_page.driver_page import driver_  # 浏览器驱动生成方法
+from base_page.replay_page import ReplayCache  # HTTP 录制与回放
+from test_cases.support.serp_server import SerpServer  # 本地模拟 SERP 服务
+from test_cases.test_cases import build_pages, number_items, search_keyword, search_parallel, search_tabs  # 页面对象、行号与各执行流程
+
+KEYWORDS = ["NCPD", "My Back"]  # 录制与回放的关键词
+CONCURRENCY = 2  # 浏览器池会话数量与标签页数量
+FLIP_NUM = 2  # 每个关键词处理的页数，第 2 页经预加载标签页打开
+
+
+class Collector:
+    """
+    收集每个单元写入的标题，替代结果输出。
+    """
+
+    def __init__(self):
+        self.titles = []  # (关键词, 页码, 标题, 链接)
+
+    def add(self, keyword, page, titles):
+        self.titles.extend((keyword, page, t["text"], t["href"]) for t in titles)
+
+
+def run_flow(store, mode, url):
+    """
+    功能：以指定模式接入录制与回放，在新浏览器中执行所有关键词，返回收集的标题与拦截统计
+    """
+    cache = ReplayCache(store, mode, strict=True)
+    driver = cache.attach(driver_(os.environ.get("BENCH_PROFILE", "visual"), headless=True))
+    try:
+        pages = build_pages(driver)
+        pages["open"].url = url  # 实例属性覆盖类属性中的百度地址
+        pages["sink"] = Collector()
+        pages["open"].openurl()
+        for keyword in KEYWORDS:
+            search_keyword(pages, keyword, FLIP_NUM, shoot=lambda *args: None)
+        return pages["sink"].titles, cache.stats()
+    finally:
+        cache.close()
+        driver.quit()
+
+
+def run_concurrent(store, mode, backend):
+    """
+    功能：以指定模式接入录制与回放，用浏览器池（pool）或多标签页（tabs）并发执行所有关键词，
+         返回排序后的标题与拦截统计
+    """
+    cache = ReplayCache(store, mode, strict=True)
+    sink = Collector()
+    items = number_items({"content": keyword} for keyword in KEYWORDS)
+    profile = os.environ.get("BENCH_PROFILE", "visual")
+    try:
+        if backend == "pool":
+            results = search_parallel(items, FLIP_NUM, CONCURRENCY, profile=profile, sink=sink, http_cache=cache)
+            errors = [result.error for result in results if result.error is not None]
+        else:
+            driver = cache.attach(driver_(profile, headless=True, strategy="none"))  # 新标签页经 prepare_tab 自动接入
+            try:
+                results = search_tabs(items, FLIP_NUM, CONCURRENCY, driver, sink=sink)
+            finally:
+                driver.quit()
+            errors = [error for _, _, error in results if error is not None]
+        assert not errors, f"{backend} {mode} 执行失败: {errors}"
+        return sorted(sink.titles), cache.stats()  # 并发执行时写入顺序不固定
+    finally:
+        cache.close()
+
+
+def test_record_then_replay_offline(tmp_path):
+    store = str(tmp_path / "http_cache")
+    server = SerpServer(results=5, max_pages=3, filler=0).start()
+    url = server.url
+    try:
+        recorded, record_stats = run_flow(store, "record", url)
+    finally:
+        server.stop()  # 回放阶段服务已停止，所有页面只能来自录制的响应
+    replayed, replay_stats = run_flow(store, "replay", url)
+    assert recorded and record_stats["recorded"] > 0
+    assert replayed == recorded
+    assert replay_stats["hits"] > 0
+
+
+@pytest.mark.parametrize("backend", ["pool", "tabs"])
+def test_concurrent_replay_offline(tmp_path, monkeypatch, backend):
+    """
+    浏览器池的每个会话与多标签页的每个标签页都接入回放，服务停止后结果与录制时一致
+    """
+    store = str(tmp_path / "http_cache")
+    server = SerpServer(results=5, max_pages=3, filler=0).start()
+    monkeypatch.setattr("page_object.open_page.OpenPage.url", server.url)  # 各会话与标签页的首页指向本地模拟服务
+    try:
+        recorded, record_stats = run_concurrent(store, "record", backend)
+    finally:
+        server.stop()
+    replayed, replay_stats = run_concurrent(store, "replay", backend)
+    assert recorded and record_stats["recorded"] > 0
+    assert replayed == recorded
+    assert replay_stats["hits"] > 0
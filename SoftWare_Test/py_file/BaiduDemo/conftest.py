@@ -1,39 +1,245 @@
 import pytest  # pytest 测试框架
-import yaml  # 读取 YAML 文件
 import logging  # 日志模块
+import json  # 序列化耗时统计报告
+import allure  # Allure 报告，用于附加耗时统计报告
 from base_page.driver_page import driver_  # 导入自定义的浏览器驱动生成方法
+from base_page.base_page import ElementCache  # 导入元素缓存，会话结束时输出统计
+from base_page.shot_page import ScreenshotService  # 导入截图服务，会话结束时关闭后台线程池
+from base_page.metrics_page import Metrics  # 导入耗时统计，会话结束时输出报告
+from base_page.data_page import DataSource, read_settings, resolve_path  # 导入流式测试数据源、配置读取与路径解析
+from base_page.checkpoint_page import Checkpoint  # 导入进度检查点，用于断点续跑
+from base_page.sink_page import ResultSink  # 导入标题结果输出，会话结束时写入剩余记录
+from base_page.replay_page import ReplayCache  # 导入 HTTP 录制与回放，离线复现页面加载
+from base_page.report_page import ResultStore  # 导入 Allure 结果存储，会话结束时并入本次结果
+from base_page.log_page import setup_logging  # 导入统一日志管道，整个会话只配置一次
+from base_page.service_page import acquire_driver  # 导入常驻浏览器服务客户端，优先借用预热好的会话
+from base_page.health_page import HealthMonitor  # 导入浏览器健康监控，超过阈值时自动重启浏览器
+from page_object.flip_page import FlipPage  # 导入翻页对象，用于按配置开启下一页预加载
 
-# 配置日志输出格式和等级
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")  # 设置日志格式
+CONFIG_KEY = pytest.StashKey[tuple]()  # 会话内缓存的 (配置文件路径, 配置字典)
 logger = logging.getLogger(__name__)  # 获取当前模块的 logger 实例
 
 
+def pytest_addoption(parser):
+    """
+    功能：
+        - 注册命令行参数 --load-profile，用于在命令行选择浏览器加载配置
+        - 注册命令行参数 --test-data，用于指定测试数据配置文件
+        - 注册命令行参数 --data-shards，用于将关键词数据拆分为多个参数化用例
+        - 注册命令行参数 --resume，用于从检查点继续执行
+        - 注册命令行参数 --http-cache，用于录制或回放浏览器的 HTTP 响应
+        - 注册 pytest.ini 配置项 pipeline_log_*，用于配置统一日志管道
+        - 注册 pytest.ini 配置项 allure_store，用于将结果并入按内容寻址的 Allure 结果存储
+    """
+    parser.addoption("--load-profile", default=None,
+                     help="浏览器加载配置：full / visual / extract-only，未指定时读取测试数据中的 load_profile")
+    parser.addoption("--test-data", default=None,
+                     help="测试数据配置文件，相对路径基于 test_data 目录（或环境变量 BAIDU_DEMO_DATA_DIR），默认 order.yaml")
+    parser.addoption("--data-shards", type=int, default=None,
+                     help="关键词数据分片数量，每个分片生成一个参数化用例，未指定时读取测试数据中的 data_shards")
+    parser.addoption("--resume", action="store_true", default=False,
+                     help="断点续跑：保留检查点中的进度，跳过已完成的 (数据行号, 页码) 单元")
+    parser.addoption("--http-cache", default=None, choices=("off", "record", "replay"),
+                     help="HTTP 录制与回放：record 录制响应，replay 离线回放，未指定时读取测试数据中的 http_cache")
+    parser.addini("pipeline_log_level", default="INFO", help="日志级别")
+    parser.addini("pipeline_log_levels", type="linelist", default=[], help="按模块设置的日志级别，每行一个 模块=级别")
+    parser.addini("pipeline_log_file", default="", help="文本日志文件路径，留空不写文件")
+    parser.addini("pipeline_log_jsonl", default="", help="JSONL 日志文件路径（附带关键词与页码），留空不输出")
+    parser.addini("pipeline_log_console", type="bool", default=True, help="是否输出日志到控制台")
+    parser.addini("allure_store", default="", help="Allure 结果存储目录，留空则不入库")
+
+
+def pytest_configure(config):
+    """
+    功能：
+        - 在收集用例之前配置统一日志管道：测试线程只把日志放入队列，格式化与写入在后台线程完成
+    """
+    levels = dict(line.split("=", 1) for line in config.getini("pipeline_log_levels") if "=" in line)
+    setup_logging(level=config.getini("pipeline_log_level"),
+                  levels={name.strip(): level.strip() for name, level in levels.items()},
+                  file=config.getini("pipeline_log_file") or None,
+                  jsonl=config.getini("pipeline_log_jsonl") or None,
+                  console=config.getini("pipeline_log_console"))
+
+
+def load_config(config):
+    """
+    功能：
+        - 读取测试数据配置文件（全局参数），关键词数据由 DataSource 另行流式读取
+        - 内联的 text_list 只做词法扫描不构造；整个会话只解析一次，收集阶段与 fixture 共用结果
+    返回：
+        tuple: (配置文件路径, 配置字典)
+    """
+    if CONFIG_KEY not in config.stash:
+        data_path = resolve_path(config.getoption("--test-data") or "order.yaml")  # 解析配置文件路径
+        config.stash[CONFIG_KEY] = (data_path, read_settings(data_path, skip=("text_list",)))
+    data_path, data = config.stash[CONFIG_KEY]
+    return data_path, dict(data)  # 返回副本，fixture 中的修改不影响缓存
+
+
+def pytest_generate_tests(metafunc):
+    """
+    功能：
+        - 为使用 data_shard 参数的用例按分片数量参数化
+        - 参数只包含分片编号，收集阶段不读取关键词数据，用例数量与耗时不随数据量增长
+    """
+    if "data_shard" in metafunc.fixturenames:
+        shards = metafunc.config.getoption("--data-shards") or load_config(metafunc.config)[1].get("data_shards", 1)
+        metafunc.parametrize("data_shard", [(index, shards) for index in range(shards)],
+                             ids=[f"shard{index + 1}of{shards}" for index in range(shards)])
+
+
 @pytest.fixture(scope="session")
-def driver():  # 定义 driver fixture，在整个测试会话范围内只执行一次
+def http_cache(request, test_data):  # 定义 http_cache fixture，在整个测试会话范围内只执行一次
     """
     功能：
-        - 初始化浏览器驱动，提供给测试用例使用
+        - 创建 HTTP 录制与回放，模式优先取命令行 --http-cache，其次取测试数据中的 http_cache，默认 off
+        - record 模式录制浏览器收到的所有响应；replay 模式从本地存储回放，不访问网络
     返回：
-        WebDriver 对象
+        ReplayCache 对象
+    """
+    mode = request.config.getoption("--http-cache") or test_data.get("http_cache") or "off"  # 确定缓存模式（YAML 中未加引号的 off 会解析为 False）
+    cache = ReplayCache(test_data.get("http_cache_dir", "./temps/http_cache"), mode,
+                        strict=test_data.get("http_cache_strict", True))
+    yield cache
+    cache.close()  # 停止拦截线程
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    """
+    功能：
+        - 会话结束后将本次的 Allure 结果并入结果存储：附件按内容哈希去重，多个分片或多次运行合并为一个结果目录
+        - 使用 pytest-xdist 时只在主进程中入库
+        - 原结果目录保持不变（附件以复制方式入库），allure serve / generate 仍可直接使用本次结果
+        - 基准测试（pytest benchmark）的结果不入库，避免混入功能测试的报告
     """
-    logger.info("初始化浏览器驱动...")  # 日志记录初始化操作
-    driver = driver_()  # 调用 driver_ 函数创建浏览器驱动实例
-    yield driver  # 将 driver 提供给测试用例
+    config = session.config
+    store = config.getini("allure_store")
+    results_dir = config.getoption("allure_report_dir", None)  # allure-pytest 的 --alluredir
+    if not store or not results_dir or hasattr(config, "workerinput"):
+        return
+    if any(item.nodeid.startswith("benchmark/") for item in getattr(session, "items", [])):
+        logger.info("本次运行包含基准测试，跳过 Allure 结果入库")  # 日志记录跳过原因
+        return
+    ResultStore(store).ingest(results_dir, remove=False)
+
+
+@pytest.fixture(scope="session")
+def health(request, test_data, http_cache):  # 定义 health fixture，在整个测试会话范围内只执行一次
+    """
+    功能：
+        - 创建浏览器健康监控并启动浏览器，长时间运行时按配置的阈值自动重启浏览器
+        - 配置了常驻浏览器服务（browser_service 或环境变量 BAIDU_DEMO_BROWSER_SERVICE）时优先借用预热好的会话，
+          会话结束时归还服务；服务不可用时启动新浏览器
+        - 加载配置优先取命令行 --load-profile，其次取测试数据中的 load_profile，默认 full
+        - 多标签页模式（tab_count 大于 1）在同一浏览器中打开标签页，页面加载策略改为 none，元素命令不等待页面加载
+    返回：
+        HealthMonitor 对象，当前浏览器驱动为 health.driver
+    """
+    profile = request.config.getoption("--load-profile") or test_data.get("load_profile", "full")  # 确定加载配置
+    logger.info("初始化浏览器驱动，加载配置: %s", profile)  # 日志记录初始化操作
+    service_url = test_data.get("browser_service")  # 常驻浏览器服务地址
+
+    strategy = "none" if test_data.get("tab_count", 1) > 1 else None  # 多标签页模式的页面加载策略
+
+    def factory():  # 首次启动与重启时都使用同一加载配置，并接入录制与回放
+        return http_cache.attach(acquire_driver(profile, service_url) or driver_(profile, strategy=strategy))
+
+    monitor = HealthMonitor(
+        factory,
+        every=test_data.get("health_every", 20),
+        max_steps=test_data.get("recycle_steps", 0),
+        max_heap_mb=test_data.get("max_heap_mb", 0),
+        max_nodes=test_data.get("max_nodes", 0),
+        max_rss_mb=test_data.get("max_rss_mb", 0),
+    )
+    monitor.start()  # 创建浏览器驱动
+    yield monitor
     logger.info("测试结束，关闭浏览器...")  # 日志记录结束操作
-    driver.quit()  # 关闭浏览器驱动，释放资源
+    monitor.close()  # 关闭当前浏览器驱动，释放资源
+
+
+@pytest.fixture(scope="session")
+def driver(health, test_data):  # 定义 driver fixture，在整个测试会话范围内只执行一次
+    """
+    功能：
+        - 提供浏览器驱动给测试用例使用，驱动由健康监控创建和关闭
+        - 会话结束时输出元素缓存统计、关闭截图服务并输出耗时统计报告
+    返回：
+        WebDriver 对象（浏览器重启后页面对象会绑定到 health.driver）
+    """
+    yield health.driver  # 将 driver 提供给测试用例
+    if test_data.get("element_cache", False):
+        logger.info("元素缓存统计: %s", ElementCache.of(health.driver).stats())  # 日志记录元素缓存命中情况
+    ScreenshotService.shared().close()  # 关闭截图服务（截图已在各用例内附加，会话结束时不再写入报告）
+    if Metrics.shared().enabled:
+        report = Metrics.shared().dump("./temps/metrics/metrics.json")  # 写入耗时统计 JSON 报告
+        allure.attach(json.dumps(report, ensure_ascii=False, indent=2), name="耗时统计",
+                      attachment_type=allure.attachment_type.JSON)  # 同时附加到 Allure 报告
 
 
 @pytest.fixture(scope="session")
-def test_data():  # 定义 test_data fixture，在整个测试会话范围内只执行一次
+def test_data(request):  # 定义 test_data fixture，在整个测试会话范围内只执行一次
     """
     功能：
-        - 加载 YAML 测试数据，提供给测试用例使用
+        - 加载 YAML 测试数据配置，提供给测试用例使用
+        - text_list 替换为可重复迭代的 DataSource，按行流式读取：
+            配置了 text_source 时读取该文件（CSV / XLSX / YAML，默认关键词位于 keywords.yaml），否则读取配置文件中的 text_list
+        - text_column 指定关键词所在列，统一重命名为 content
     返回：
         dict: 解析后的测试数据
     """
-    data_path = r"D:\Tianyi_Cloud\learn\Py_ProJect\SoftWare_Test\py_file\BaiduDemo\test_data\order.yaml"  # 指定 YAML 文件路径
+    data_path, data = load_config(request.config)  # 读取配置文件
     logger.info("开始加载测试数据: %s", data_path)  # 日志记录文件路径
-    with open(data_path, "r", encoding="utf-8") as file:  # 打开 YAML 文件
-        data = yaml.safe_load(file)  # 解析 YAML 内容
-    logger.info("测试数据加载完成，共 %d 条", len(data.get("text_list", [])))  # 日志记录加载完成和数量
+    source = data.get("text_source")  # 关键词数据源文件
+    column = data.get("text_column", "content")  # 关键词所在列
+    data["text_list"] = DataSource(
+        source or data_path,
+        key=None if source else "text_list",
+        sheet=data.get("text_sheet"),
+        rename={column: "content"} if column != "content" else None,
+    )
+    logger.info("测试数据加载完成，关键词数据源: %s", data["text_list"].path)  # 日志记录数据源
+    Metrics.shared().enabled = bool(data.get("metrics", True))  # 按配置开启耗时统计
+    FlipPage.prefetch_pages = bool(data.get("flip_prefetch", True))  # 按配置开启下一页预加载
     return data  # 返回测试数据字典
+
+
+@pytest.fixture(scope="session")
+def sink(request, test_data):  # 定义 sink fixture，在整个测试会话范围内只执行一次
+    """
+    功能：
+        - 创建标题结果输出，按 results 配置的扩展名写入 JSONL / CSV / SQLite
+        - 使用 --resume 运行时保留已有结果并追加，已输出过的标题不再重复写入
+    返回：
+        ResultSink 对象，未配置 results 时为 None
+    """
+    path = test_data.get("results")  # 结果文件路径
+    if not path:
+        yield None
+        return
+    result_sink = ResultSink(path, batch=test_data.get("results_batch", 500),
+                             dedup=test_data.get("results_dedup", True),
+                             resume=request.config.getoption("--resume"))
+    yield result_sink
+    result_sink.close()  # 写入剩余记录并停止后台线程
+
+
+@pytest.fixture(scope="session")
+def checkpoint(request, test_data):  # 定义 checkpoint fixture，在整个测试会话范围内只执行一次
+    """
+    功能：
+        - 创建进度检查点，记录每个 (数据行号, 页码) 单元的完成情况
+        - 默认每次运行清空进度；使用 --resume 时保留进度，跳过已完成的单元
+        - 测试数据中 checkpoint 为空时不记录进度
+    返回：
+        Checkpoint 对象或 None
+    """
+    path = test_data.get("checkpoint", "./temps/checkpoint/search.sqlite")  # 检查点文件路径
+    if not path:
+        yield None
+        return
+    cp = Checkpoint(path, resume=request.config.getoption("--resume"))  # 创建检查点
+    yield cp
+    cp.close()  # 关闭检查点
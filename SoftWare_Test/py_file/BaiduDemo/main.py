@@ -4,18 +4,39 @@
 # @File		: main.py
 # @Software	: PyCharm
 
-import pytest  # 导入 pytest 模块，用于运行测试并生成报告
+import argparse  # 解析命令行参数
 import os  # 导入 os 模块，用于执行操作系统命令
+import pytest  # 导入 pytest 模块，用于运行测试并生成报告
+from base_page.report_page import ResultStore  # Allure 结果存储，增量合并结果并生成报告
+
+STORE = './temps/allure-store'  # 与 pytest.ini 中的 allure_store 一致
+REPORT = './temps/allure-report'  # HTML 报告目录
 
 if __name__ == '__main__':  # 检查是否直接运行当前脚本
-    # 运行 pytest，指定将测试结果保存到 ./temps/result 目录中
-    pytest.main(['--alluredir', './temps/allure-report'])  # '--alluredir' 是 pytest 的选项，用于生成可供 Allure 展示的测试报告
+    parser = argparse.ArgumentParser(description="运行测试并生成 Allure 报告")
+    parser.add_argument('--fresh', action='store_true', help="清空存储中已合并的结果，只展示本次运行")
+    parser.add_argument('--merge', nargs='*', default=[], metavar='DIR',
+                        help="只合并指定的 Allure 结果目录（如并行分片各自的 --alluredir）并生成报告，不运行测试")
+    args, pytest_args = parser.parse_known_args()
 
-    # 使用操作系统命令 'allure serve' 来启动 Allure 本地服务，并在浏览器中展示生成的测试报告
-    os.system("allure serve ./temps/allure")  # 'allure serve' 会读取指定的目录，并生成可视化的测试报告
+    store = ResultStore(STORE)
+    if args.fresh:
+        store.reset()
+    if args.merge:
+        for results_dir in args.merge:
+            store.ingest(results_dir)  # 附件按内容哈希入库，不再重复复制
+    else:
+        # 运行 pytest，结果写入 pytest.ini 中的 --alluredir，会话结束时自动并入存储
+        pytest.main(pytest_args)
+
+    # 结果没有变化时跳过生成，直接打开上次的报告
+    store.generate(REPORT)
+    os.system(f"allure open {REPORT}")  # 'allure open' 在浏览器中展示生成的测试报告
 
 
 """
     在 cmd 中文件夹内执行完整的测试代码可实现一键测试、保存、展示三个功能
-    pytest && allure generate -c -o temps/allure-report && allure serve ./temps/allure
-"""
\ No newline at end of file
+    python main.py                               运行测试，结果并入存储（每个用例只保留最新结果），增量生成并打开报告
+    python main.py --fresh                       只展示本次运行的结果
+    python main.py --merge shard1 shard2 ...     合并各分片的结果目录并生成报告
+"""
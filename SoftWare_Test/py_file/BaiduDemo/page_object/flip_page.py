@@ -2,36 +2,134 @@
     page_object 页面对象类(page_object)：用于定位输入框和搜索按钮点击
     功能说明：封装页面元素定位与操作方法，便于在测试用例中直接调用，提高代码复用性
 """
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode  # 根据查询参数与偏移量构造分页地址
 from base_page.base_page import BasePage  # 导入自定义的BasePage类，封装了基础的Selenium操作方法
+from base_page.driver_page import prepare_tab  # 预加载标签页需要先执行加载配置的 DevTools 设置
+from base_page.metrics_page import timed  # 导入耗时统计装饰器，记录方法耗时
 import logging  # 导入日志模块，用于记录程序运行信息
-import allure  # 导入Allure，用于生成测试报告并添加截图等附件
+from base_page.shot_page import ScreenshotService  # 导入截图服务，统一处理截图的压缩、去重与附加
 
-# 配置日志输出格式和日志级别，输出时间、日志级别和日志信息
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)  # 获取当前模块的logger对象，用于打印日志信息
 
 
 class FlipPage(BasePage):  # 定义FlipPage类，继承BasePage，封装特定页面的操作
+    """
+    翻页：优先根据当前地址的查询参数与偏移量直接构造目标页地址，无法构造时精确匹配页码按钮点击。
+    - prefetch 在处理第 N 页时于后台标签页预加载第 N+1 页，flip_ 时直接切换到该标签页，翻页不再阻塞主流程。
+    """
 
-    page_text = '//*[@id="page"]/div/a/span[contains(text(), "{index}")]'  # 定义翻页按钮的xpath模板，{index}用于动态替换页码
+    page_text = '//*[@id="page"]/div/a/span[normalize-space(text())="{index}"]'  # 翻页按钮的xpath模板，精确匹配页码，避免 1 匹配到 10~19
+    results = ('id', 'content_left')  # 搜索结果容器定位符，翻页后旧容器会被替换
+    result_title = ('xpath', '//h3')  # 结果标题定位符，用于判断新页面结果已出现
+    query_param = 'wd'  # 搜索关键词参数，地址中有该参数时才按地址翻页
+    offset_param = 'pn'  # 结果偏移量参数
+    page_size = 10  # 每页结果偏移量步长
+    prefetch_pages = True  # 是否在后台标签页预加载下一页，可在类或实例上关闭
 
-    def take_screenshot(self, name="screenshot"):
+    def __init__(self, driver):
+        super().__init__(driver)
+        self._prefetched = None  # 预加载的 (目标地址, 标签页句柄)
+
+    def page_url(self, flip_num):
+        """
+        根据当前地址构造目标页地址：替换偏移量参数，其余查询参数保持不变。
+
+        :param flip_num: 目标页码
+        :return: 目标页地址；当前地址中没有搜索关键词参数时返回 None
+        """
+        parts = urlsplit(self.driver.current_url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if not any(key == self.query_param for key, _ in query):
+            return None
+        query = [(key, value) for key, value in query if key != self.offset_param]
+        query.append((self.offset_param, str((flip_num - 1) * self.page_size)))
+        return urlunsplit(parts._replace(query=urlencode(query), fragment=''))
+
+    @timed
+    def prefetch(self, flip_num):
+        """
+        在后台标签页中预加载指定页码，当前标签页不受影响，立即返回。
+        - 先打开空白标签页并执行 prepare_tab（资源屏蔽、缓存设置、HTTP 回放拦截等），再发起导航，
+          保证预加载的页面与当前标签页使用相同的加载配置。
+
+        :param flip_num: 需要预加载的页码
+        :return: 是否已发起预加载
+        """
+        url = self.page_url(flip_num) if self.prefetch_pages else None
+        if url is None:
+            return False
+        if self._prefetched and self._prefetched[0] == url:
+            return True  # 已在预加载
+        self.discard_prefetch()
+        handles = set(self.driver.window_handles)
+        current = self.driver.current_window_handle
+        self.execute_script("window.open('about:blank', '_blank');")  # 先打开空白标签页，当前标签页保持不变
+        opened = [handle for handle in self.driver.window_handles if handle not in handles]
+        if not opened:  # 弹窗被拦截等情况下放弃预加载
+            logger.warning("预加载标签页未能打开: %s", url)
+            return False
+        self._prefetched = (url, opened[0])  # 先记录，准备失败时由 discard_prefetch 关闭
+        try:
+            self.driver.switch_to.window(opened[0])
+            prepare_tab(self.driver)  # 新标签页不继承 DevTools 设置，导航前重新执行
+            self.driver.execute_script("window.location.href = arguments[0];", url)  # 只发起导航，不等待加载
+        except Exception as exc:  # 预加载只是优化，失败时关闭标签页，翻页时按地址直接打开
+            logger.warning("预加载标签页准备失败: %s", exc)
+            self.driver.switch_to.window(current)
+            self.discard_prefetch()
+            return False
+        self.driver.switch_to.window(current)  # 回到当前页，预加载在后台继续
+        logger.info("预加载第 %d 页: %s", flip_num, url)
+        return True
+
+    def discard_prefetch(self):
+        """
+        关闭尚未使用的预加载标签页，当前标签页保持不变。
+        """
+        if not self._prefetched:
+            return
+        _, handle = self._prefetched
+        self._prefetched = None
+        current = self.driver.current_window_handle
+        if handle in self.driver.window_handles:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+            self.driver.switch_to.window(current)
+
+    @timed
+    def take_screenshot(self, name="screenshot", full_page=False):
         """
         截图并附加到 Allure 报告中
         :param name: 截图名称，默认值为"screenshot"
+        :param full_page: 是否截取整页
         """
+        service = ScreenshotService.shared()  # 获取共享截图服务
+        service.capture(self.driver, name, full_page)  # 抓取画面后立即返回，处理在后台完成
+        service.drain()  # 将已处理完成的截图附加到报告
 
-        allure.attach(
-            self.driver.get_screenshot_as_png(),  # 获取当前页面截图，返回二进制PNG数据
-            name=name,  # 指定截图名称
-            attachment_type=allure.attachment_type.PNG  # 指定附件类型为PNG图片
-        )  # 使用Selenium的get_screenshot_as_png方法获取截图，并通过Allure attach方法添加到报告中
-
+    @timed
     def flip_(self, flip_num):
         """
-        翻页操作：点击指定页码的翻页按钮
+        翻页操作：依次尝试切换到预加载的标签页、直接打开目标页地址、点击指定页码的翻页按钮
         :param flip_num: 目标页码，传入数字
         """
-        # 使用BasePage封装的click方法，通过xpath定位并点击指定页码的按钮
-        self.click('xpath', self.page_text.format(index=flip_num))  # 动态替换xpath中的{index}为flip_num
-        self.wait(5)  # 等待5秒，保证页面加载完成，可根据实际情况调整等待时间
+        url = self.page_url(flip_num)  # 目标页地址，无法构造时为 None
+        if url and self._prefetched and self._prefetched[0] == url and \
+                self._prefetched[1] in self.driver.window_handles:
+            handle = self._prefetched[1]
+            self._prefetched = None
+            self.driver.close()  # 关闭当前页所在的标签页
+            self.driver.switch_to.window(handle)  # 切换到已预加载的目标页
+            self.invalidate_cache()  # 切换标签页后旧元素全部失效
+            self.wait_ready()  # 预加载通常已完成，这里只是确认
+        else:
+            self.discard_prefetch()  # 预加载的地址与目标不符（如已重新搜索），丢弃
+            if url:
+                self.open(url)  # 直接打开目标页地址
+            else:
+                old_url = self.driver.current_url  # 记录翻页前的 URL
+                old_results = self.driver.find_elements(*self.results)  # 记录翻页前的结果容器
+                # 使用BasePage封装的click方法，通过xpath精确定位并点击指定页码的按钮
+                self.click('xpath', self.page_text.format(index=flip_num))  # 动态替换xpath中的{index}为flip_num
+                self.wait_replaced(old_results[0] if old_results else None, old_url)  # 等待旧结果被替换且页面加载完成
+        self.wait_present(*self.result_title)  # 等待新页面结果标题出现
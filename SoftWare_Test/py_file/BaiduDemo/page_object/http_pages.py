@@ -0,0 +1,130 @@
+"""
+    page_object 页面对象类(page_object)：HTTP 提取后端的页面对象
+    功能说明：与浏览器页面对象提供相同的方法名（openurl / search_ / scroll_ / flip_ / titles_），
+             test_search 可通过配置切换后端；页面需要脚本渲染时抛出 NeedsBrowser，由调用方回退到浏览器
+"""
+from urllib.parse import quote, urljoin, urlsplit, urlunsplit, parse_qsl, urlencode  # 构造搜索与分页地址
+from base_page.http_page import HttpPage, HttpSession  # HTTP 页面对象基类与会话
+from base_page.metrics_page import timed  # 导入耗时统计装饰器，记录方法耗时
+import logging  # 导入日志模块，用于记录程序运行信息
+
+logger = logging.getLogger(__name__)  # 获取当前模块的logger对象，用于打印日志信息
+
+PAGE_SIZE = 10  # 每页结果偏移量步长，对应百度结果页的 pn 参数
+
+
+class HttpOpenPage(HttpPage):
+    """
+    打开首页，并记录站点地址供搜索与翻页使用。
+    """
+    url = r'https://www.baidu.com'  # 与 OpenPage.url 一致
+
+    @timed
+    def openurl(self):
+        """
+        请求首页。
+        """
+        logger.info("准备打开网址: %s", self.url)
+        self.driver.base_url = self.url  # 后续搜索与翻页基于该地址
+        self.open(self.url)
+
+
+class HttpSearchPage(HttpPage):
+    """
+    搜索：直接请求结果页地址 /s?wd=关键词。
+    """
+
+    @timed
+    def search_(self, text):
+        """
+        请求关键词的第一页结果。
+
+        参数:
+            text (str): 搜索关键词。
+        """
+        logger.info("HTTP 搜索: %s", text)
+        self.open(urljoin(self.driver.base_url, f"/s?wd={quote(text)}"), expect_results=True)
+
+
+class HttpScrollPage(HttpPage):
+    """
+    滚动：HTTP 后端一次请求即取得完整页面，无需滚动。
+    """
+
+    @timed
+    def scroll_(self, target=None, count=1):
+        """
+        返回与 ScrollPage.scroll_ 相同结构的结果。
+        """
+        return {'reason': 'static', 'batches': 0, 'mutations': 0, 'height': 0, 'elapsed': 0}
+
+
+class HttpFlipPage(HttpPage):
+    """
+    翻页：优先使用当前页分页区域中的页码链接，没有时按 pn 参数构造地址。
+    """
+
+    def prefetch(self, flip_num):
+        """
+        与 FlipPage.prefetch 对应；HTTP 后端翻页本身只是一次请求，不做预加载。
+        """
+        return False
+
+    @timed
+    def flip_(self, flip_num):
+        """
+        请求指定页码的结果页。
+
+        参数:
+            flip_num (int): 目标页码。
+        """
+        href = self.driver.document.pages.get(flip_num) if self.driver.document else None
+        if href is None:  # 分页区域中没有该页码时按 pn 参数构造
+            parts = urlsplit(self.driver.current_url)
+            query = dict(parse_qsl(parts.query))
+            query['pn'] = str((flip_num - 1) * PAGE_SIZE)
+            href = urlunsplit(parts._replace(query=urlencode(query)))
+        self.open(href, expect_results=True)
+
+
+class HttpTitlesPage(HttpPage):
+    """
+    标题：返回当前页解析出的 <h3> 标题与链接。
+    """
+
+    @timed
+    def titles_(self, page):
+        """
+        获取当前页所有标题记录。
+
+        :param page: 当前页码，用于在日志中标记输出结果所属的页面
+        :return: 标题记录列表，每条记录包含 text 和 href
+        """
+        titles = self.driver.document.titles
+        logger.info("第 %d 页提取标题 %d 条", page, len(titles))
+        if logger.isEnabledFor(logging.DEBUG):
+            for idx, t in enumerate(titles, start=1):
+                logger.debug("[第%d页-第%d条] %s", page, idx, t['text'])
+        return titles
+
+
+def build_http_pages(client, url=None):
+    """
+    基于共享的 HTTP 客户端创建一组 HTTP 页面对象，结构与浏览器的 build_pages 一致。
+
+    参数:
+        client (HttpClient): HTTP 客户端，多组页面对象可共享同一连接池。
+        url (str): 首页地址，默认使用 HttpOpenPage.url。
+    """
+    session = HttpSession(client)
+    pages = {
+        "search": HttpSearchPage(session),
+        "open": HttpOpenPage(session),
+        "scroll": HttpScrollPage(session),
+        "flip": HttpFlipPage(session),
+        "titles": HttpTitlesPage(session),
+    }
+    if url:
+        pages["open"].url = url  # 实例属性覆盖类属性中的百度地址
+    session.base_url = pages["open"].url
+    return pages
@@ -2,11 +2,10 @@
     page_object 页面对象类(page_object)：用于打开操作页面
 """
 from base_page.base_page import BasePage  # 从 base_page 模块导入 BasePage 类，作为所有页面类的基类
+from base_page.metrics_page import timed  # 导入耗时统计装饰器，记录方法耗时
 from selenium.webdriver.remote.webdriver import WebDriver  # 导入 WebDriver 类型注解
 import logging  # 引入logging库，用于记录日志信息
 
-# 配置日志记录格式和日志级别，记录日志的详细信息（时间戳、日志级别、日志消息）
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)  # 创建一个名为当前模块(__name__)的logger实例，用于记录日志
 
 
@@ -30,6 +29,7 @@ class OpenPage(BasePage):  # 定义 OpenPage 类，并继承自 BasePage 类
         super().__init__(driver)  # 调用基类构造方法，初始化 driver
         self.driver: WebDriver = driver  # 为 IDE/检查器提供明确的类型提示
 
+    @timed
     def openurl(self):  # 定义 openurl 方法，用于打开指定网址
         """
         使用预定义的 URL 打开网页。
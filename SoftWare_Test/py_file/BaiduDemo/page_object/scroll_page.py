@@ -1,30 +1,84 @@
 """
-    page_object 页面对象类(page_object)：用于定位输入框和搜索按钮点击
+    page_object 页面对象类(page_object)：用于页面滚动，加载懒加载内容
 """
 from base_page.base_page import BasePage  # 从base_page模块导入BasePage基类，提供封装好的基础操作方法
+from base_page.metrics_page import timed  # 导入耗时统计装饰器，记录方法耗时
 import logging  # 导入日志模块，用于记录程序运行信息，便于调试和维护
 
-# 配置日志输出格式和等级
-logging.basicConfig(  # 配置logging模块的基本设置
-    level=logging.INFO,  # 设置日志级别为INFO，表示输出INFO及以上级别的日志（INFO、WARNING、ERROR、CRITICAL）
-    format="%(asctime)s - %(levelname)s - %(message)s"  # 设置日志输出格式：时间 - 日志级别 - 日志消息
-)
 logger = logging.getLogger(__name__)  # 获取当前模块的日志记录器logger，便于在不同模块中区分日志来源
 
 
+# 滚动直到稳定：在浏览器内逐屏向下滚动，并通过 MutationObserver 与 scrollHeight 监测内容增长，
+# 到达页面底部且在静默窗口内没有新内容、或目标元素数量达到要求、或超时后，一次性返回结果
+SCROLL_UNTIL_STABLE_JS = """
+const [settleMs, maxMs, stepRatio, by, value, count] = arguments;
+const done = arguments[arguments.length - 1];
+const root = document.scrollingElement || document.documentElement;
+const start = performance.now();
+let lastChange = start, lastHeight = root.scrollHeight, batches = 0, mutations = 0;
+const observer = new MutationObserver(records => { mutations += records.length; lastChange = performance.now(); });
+observer.observe(document.body, {childList: true, subtree: true});
+function matched() {
+    if (!value) return false;
+    if (by === 'xpath') {
+        return document.evaluate('count(' + value + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue >= count;
+    }
+    return document.querySelectorAll(value).length >= count;
+}
+function finish(reason) {
+    observer.disconnect();
+    done({reason: reason, batches: batches, mutations: mutations, height: root.scrollHeight,
+          elapsed: Math.round(performance.now() - start)});
+}
+function tick() {
+    window.scrollBy(0, Math.max(1, window.innerHeight * stepRatio));
+    const height = root.scrollHeight;
+    if (height > lastHeight) { batches += 1; lastHeight = height; lastChange = performance.now(); }
+    if (matched()) return finish('target');
+    const now = performance.now();
+    const atBottom = window.scrollY + window.innerHeight >= height - 2;
+    if (atBottom && now - lastChange >= settleMs) return finish('stable');
+    if (now - start >= maxMs) return finish('timeout');
+    setTimeout(tick, atBottom ? 50 : 16);
+}
+tick();
+"""
+
+
 class ScrollPage(BasePage):  # ScrollPage类继承BasePage，封装页面滑动相关操作
-    scroll_times = 3  # 页面滑动的次数，可根据页面内容长度调整
+    """
+    页面对象类 ScrollPage：
+    - 在浏览器内逐屏滚动到页面底部，监测 DOM 变化与页面高度增长，内容稳定后立即返回。
+    - 整个滚动过程只需一次 execute_async_script 调用。
+    - 异步脚本超时只在本次调用期间加大，结束后恢复，不影响共用同一驱动的其他页面对象。
+    """
+    settle_ms = 300  # 静默窗口（毫秒）：到达底部后在该时长内没有新内容即视为加载完成
+    scroll_timeout = 20  # 单次滚动的最长时间（秒）
+    step_ratio = 1.0  # 每次滚动的距离（视口高度的倍数）
 
-    def scroll_(self):  # 定义页面滑动方法scroll_
+    @timed
+    def scroll_(self, target=None, count=1):  # 定义页面滑动方法scroll_
         """
-        分多次向下滚动页面，通常用于懒加载或动态加载内容的页面。
+        向下滚动页面直到内容稳定，通常用于懒加载或动态加载内容的页面。
+
+        参数:
+            target (tuple): 目标元素定位符 ('css selector' | 'xpath', 值)，出现 count 个即停止滚动。
+            count (int): 目标元素的数量要求。
+
+        返回:
+            dict: 滚动结果：reason（stable / target / timeout）、batches（加载的批次数）、
+                mutations（DOM 变化次数）、height（最终页面高度）、elapsed（耗时毫秒）。
         """
-        for i in range(1, self.scroll_times + 1):  # 循环scroll_times次，每次滑动页面高度的1/scroll_times
-            # 使用JavaScript执行页面滚动：
-            # window.scrollTo(x, y) 将页面滚动到指定位置
-            # document.body.scrollHeight 获取整个页面的总高度
-            # f-string中 i/self.scroll_times 计算当前滚动比例
-            self.driver.execute_script(
-                f"window.scrollTo(0, document.body.scrollHeight * {i}/{self.scroll_times});"
+        by, value = target or (None, None)
+        previous = self.driver.timeouts.script  # 驱动当前的异步脚本超时（秒）
+        self.driver.set_script_timeout(self.scroll_timeout + 5)  # 异步脚本超时需大于滚动最长时间
+        try:
+            result = self.execute_async_script(
+                SCROLL_UNTIL_STABLE_JS, self.settle_ms, self.scroll_timeout * 1000, self.step_ratio, by, value, count
             )
-            self.wait(2)  # 滚动后等待2秒，让页面加载新的内容，避免操作过快导致内容未加载
+        finally:
+            self.driver.set_script_timeout(previous)  # 恢复原来的超时，其他脚本调用不受影响
+        logger.info("页面滚动结束: %s，加载批次 %d，耗时 %dms", result["reason"], result["batches"], result["elapsed"])
+        if result["reason"] == "timeout":
+            logger.warning("页面内容在 %ds 内未稳定", self.scroll_timeout)  # 持续变化的页面按超时处理，不中断流程
+        return result
@@ -2,15 +2,11 @@
     page_object 页面对象类(page_object)：用于定位输入框和搜索按钮点击
 """
 from base_page.base_page import BasePage
+from base_page.metrics_page import timed  # 导入耗时统计装饰器，记录方法耗时
 from selenium.webdriver.remote.webdriver import WebDriver  # 导入 WebDriver 类型注解
 import logging
-import allure
+from base_page.shot_page import ScreenshotService  # 导入截图服务，统一处理截图的压缩、去重与附加
 
-# 配置日志输出格式和等级
-logging.basicConfig(  # 配置logging模块的基本设置
-    level=logging.INFO,  # 设置日志级别为INFO，表示只输出INFO及以上级别的日志（INFO、WARNING、ERROR、CRITICAL）
-    format="%(asctime)s - %(levelname)s - %(message)s"  # 设置日志输出格式：时间 - 日志级别 - 日志消息
-)
 logger = logging.getLogger(__name__)  # 获取一个以当前模块名命名的日志记录器logger，便于在不同模块中区分日志来源
 
 
@@ -22,13 +18,20 @@ class SearchPage(BasePage):  # SearchPage类继承BasePage，封装搜索相关
     # 页面通用搜索框和搜索按钮定位符（如聊天输入框场景）
     search_box = ('id', 'chat-textarea')
     search_button = ('id', 'chat-submit-button')
+    # 搜索结果容器与结果标题定位符，用于判断新结果是否加载完成
+    results = ('id', 'content_left')
+    result_title = ('xpath', '//h3')
 
-    def take_screenshot(self, name="screenshot"):  # 定义截图方法，将截图附加到Allure报告中
+    @timed
+    def take_screenshot(self, name="screenshot", full_page=False):  # 定义截图方法，将截图附加到Allure报告中
         """
         截图并附加到 Allure 报告中
         :param name: 截图名称
+        :param full_page: 是否截取整页
         """
-        allure.attach(self.driver.get_screenshot_as_png(), name=name, attachment_type=allure.attachment_type.PNG)  # 获取当前页面的截图并附加到Allure报告中，格式为PNG
+        service = ScreenshotService.shared()  # 获取共享截图服务
+        service.capture(self.driver, name, full_page)  # 抓取画面后立即返回，压缩与去重在后台完成
+        service.drain()  # 将已处理完成的截图附加到报告
 
     def __init__(self, driver: WebDriver):  # 显式指定 driver 类型为 WebDriver
         """
@@ -40,16 +43,21 @@ class SearchPage(BasePage):  # SearchPage类继承BasePage，封装搜索相关
         super().__init__(driver)  # 调用基类构造方法，初始化 driver
         self.driver: WebDriver = driver  # 为 IDE/检查器提供明确的类型提示
 
+    @timed
     def search_(self, text):  # 在通用搜索框进行搜索
         """
         功能：在页面的搜索框（如聊天输入框）输入文本并点击搜索按钮
         参数：
             text(str): 要搜索的文本内容
         """
-        logger.info(f"准备在页面搜索框输入内容：{text}")  # 日志：输入内容
+        old_url = self.driver.current_url  # 记录搜索前的 URL
+        old_results = self.driver.find_elements(*self.results)  # 记录搜索前的结果容器（首页时为空）
+
+        logger.info("准备在页面搜索框输入内容：%s", text)  # 日志：输入内容
         self.input(*self.search_box, text=text)  # 输入内容
 
         logger.info("点击页面搜索按钮")  # 日志：点击按钮
         self.click(*self.search_button)  # 点击搜索按钮
         logger.info("等待搜索结果加载完成")  # 日志：等待结果
-        self.wait(3)  # 等待结果加载
+        self.wait_replaced(old_results[0] if old_results else None, old_url)  # 等待旧结果被替换且页面加载完成
+        self.wait_present(*self.result_title)  # 等待新结果标题出现
@@ -2,10 +2,9 @@
     page_object 页面对象类(page_object)：用于定位输入框和搜索按钮点击
 """
 from base_page.base_page import BasePage  # 引入自定义的BasePage基类，封装了常用的Selenium操作
+from base_page.metrics_page import timed  # 导入耗时统计装饰器，记录方法耗时
 import logging  # 引入Python标准库logging，用于日志记录
 
-# 配置日志记录格式和输出级别，INFO级别会输出一般运行信息（含时间戳、日志级别、消息内容）
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)  # 获取当前模块的日志记录器实例
 
 
@@ -20,14 +19,21 @@ class TitlesPage(BasePage):  # 定义页面对象类TitlesPage，继承BasePage
     # 使用元组形式 ('定位方式', '定位表达式')，与 Selenium find_elements 方法兼容
     titles = ('xpath', '//h3')  # 元素定位器，使用xpath定位页面中所有<h3>标签（一般表示标题）
 
+    @timed
     def titles_(self, page):  # 定义方法titles_，参数page表示第几页
         """
-        获取并打印当前页面所有标题文本。
+        获取当前页面所有标题文本。
+        - 通过 query_all 在一次脚本调用中提取全部标题与链接，不随结果数量增加 WebDriver 往返次数。
+        - 每页只输出一条 INFO 日志，逐条标题为 DEBUG 级别；标题记录由调用方写入结果输出（ResultSink）。
 
         :param page: 当前页码，用于在日志中标记输出结果所属的页面
+        :return: 标题记录列表，每条记录包含 text（标题文本）和 href（标题链接）
         """
-        titles = self.driver.find_elements(*self.titles)  # 使用WebDriver查找所有匹配的<h3>元素，返回元素列表
-        for idx, t in enumerate(titles, start=1):  # 遍历获取到的标题元素，idx从1开始计数
-            # 输出日志，格式：[第X页-第Y条] 标题文本
-            # 例如：[第2页-第3条] Python自动化测试框架
-            logger.info(f"[第{page}页-第{idx}条] {t.text}")
+        titles = self.query_all(*self.titles, fields=('text', 'href'))  # 一次性提取所有<h3>的文本和链接
+        logger.info("第 %d 页提取标题 %d 条", page, len(titles))  # 日志记录本页标题数量
+        if logger.isEnabledFor(logging.DEBUG):  # 未开启 DEBUG 时不格式化逐条日志
+            for idx, t in enumerate(titles, start=1):  # 遍历获取到的标题记录，idx从1开始计数
+                # 输出日志，格式：[第X页-第Y条] 标题文本
+                # 例如：[第2页-第3条] Python自动化测试框架
+                logger.debug("[第%d页-第%d条] %s", page, idx, t['text'])
+        return titles  # 返回标题记录，供调用方进一步使用
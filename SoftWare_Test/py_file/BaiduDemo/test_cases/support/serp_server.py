@@ -0,0 +1,167 @@
+"""
+    测试支持：本地模拟百度搜索结果页（SERP）的 HTTP 服务，供 test_cases 的离线测试与 benchmark 基准测试共用
+    功能说明：提供首页、结果页与分页链接，页面结构与页面对象使用的定位符一致：
+        - 搜索框 id=chat-textarea，搜索按钮 id=chat-submit-button
+        - 结果容器 id=content_left，结果标题 //h3
+        - 分页链接 //*[@id="page"]/div/a/span
+"""
+import html  # 转义页面中的关键词
+import threading  # 后台线程运行服务
+import time  # 模拟响应延迟
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler  # 标准库 HTTP 服务
+from urllib.parse import urlparse, parse_qs, quote  # 解析与构造查询参数
+
+PAGE_SIZE = 10  # 每页结果偏移量步长，与百度 pn 参数一致
+
+SEARCH_FORM = """
+<textarea id="chat-textarea" name="wd">{wd}</textarea>
+<button id="chat-submit-button" type="button"
+        onclick="location.href='/s?wd=' + encodeURIComponent(document.getElementById('chat-textarea').value)">搜索</button>
+"""
+
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>百度一下，你就知道</title></head>
+<body>{form}</body></html>
+"""
+
+RESULT_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{wd}_百度搜索</title></head>
+<body>
+{form}
+<div id="content_left">
+{results}
+</div>
+<div style="height: {filler}px"></div>
+<div id="page"><div>
+{pages}
+</div></div>
+</body></html>
+"""
+
+
+class SerpServer:
+    """
+    本地模拟 SERP 服务。
+
+    用法:
+        with SerpServer(latency=0.05, results=10) as server:
+            driver.get(server.url)
+
+    参数:
+        latency (float): 每个响应的模拟延迟（秒）。
+        results (int): 每页结果数量。
+        max_pages (int): 最大页数，分页链接不会超过该值。
+        filler (int): 结果下方的占位高度（像素），用于模拟需要滚动的长页面。
+    """
+
+    def __init__(self, latency=0.0, results=10, max_pages=10, filler=2000, host='127.0.0.1', port=0):
+        self.latency = latency  # 响应延迟
+        self.results = results  # 每页结果数量
+        self.max_pages = max_pages  # 最大页数
+        self.filler = filler  # 占位高度
+        self.requests = 0  # 已处理的请求数
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())  # port=0 时由系统分配空闲端口
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        服务首页地址。
+        """
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def result_url(self, wd, page=1):
+        """
+        构造指定关键词与页码的结果页地址。
+        """
+        return f"{self.url}s?wd={quote(wd)}&pn={(page - 1) * PAGE_SIZE}"
+
+    def start(self):
+        """
+        在后台线程中启动服务。
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="serp-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        停止服务并释放端口。
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def render_home(self):
+        """
+        渲染首页。
+        """
+        return HOME_PAGE.format(form=SEARCH_FORM.format(wd=''))
+
+    def render_results(self, wd, pn):
+        """
+        渲染结果页。
+
+        参数:
+            wd (str): 搜索关键词。
+            pn (int): 结果偏移量，页码 = pn / PAGE_SIZE + 1。
+        """
+        page = pn // PAGE_SIZE + 1
+        safe = html.escape(wd)
+        results = "\n".join(
+            f'<div class="result"><h3><a href="{self.url}item/{quote(wd)}/{pn + rank}">{safe} 第{page}页 结果{rank}</a></h3>'
+            f'<p>{safe} 的模拟摘要 {rank}</p></div>'
+            for rank in range(1, self.results + 1)
+        )
+        first = max(1, page - 4)  # 与百度一致：当前页附近最多显示 10 个页码
+        last = min(self.max_pages, first + 9)
+        pages = "\n".join(
+            f'<strong><span>{n}</span></strong>' if n == page else
+            f'<a href="/s?wd={quote(wd)}&pn={(n - 1) * PAGE_SIZE}"><span>{n}</span></a>'
+            for n in range(first, last + 1)
+        )
+        return RESULT_PAGE.format(wd=safe, form=SEARCH_FORM.format(wd=safe), results=results,
+                                  filler=self.filler, pages=pages)
+
+    def _handler(self):
+        """
+        创建绑定到当前服务配置的请求处理类。
+        """
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # 支持长连接
+
+            def do_GET(self):
+                server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)  # 模拟网络延迟
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                if parsed.path == '/':
+                    body = server.render_home()
+                elif parsed.path == '/s':
+                    body = server.render_results(query.get('wd', [''])[0], int(query.get('pn', ['0'])[0]))
+                elif parsed.path.startswith('/item/'):
+                    body = f"<html><body><h1>{html.escape(parsed.path)}</h1></body></html>"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):  # 关闭默认的请求日志输出
+                pass
+
+        return Handler
@@ -7,49 +7,390 @@ from page_object.open_page import OpenPage  # 打开页面对象，封装打开
 from page_object.scroll_page import ScrollPage  # 滚动页面对象，封装页面滚动操作
 from page_object.flip_page import FlipPage  # 翻页对象，封装翻页操作
 from page_object.titles_page import TitlesPage  # 获取标题对象，封装获取页面标题操作
+from base_page.pool_page import BrowserPool  # 浏览器池，用于关键词并行搜索
+from base_page.tab_page import TabRouter  # 单个浏览器内多标签页并发
+from base_page.driver_page import driver_  # 浏览器驱动生成方法，浏览器池的会话接入录制与回放
+from base_page.shot_page import ScreenshotService  # 截图服务，后台压缩、去重并附加截图
+from base_page.metrics_page import Metrics  # 耗时统计，为记录附加关键词与页码标签
+from base_page.http_page import HttpClient, NeedsBrowser, run_concurrently  # HTTP 提取后端
+from base_page.health_page import session_lost  # 判断浏览器会话是否已不可用
+from page_object.http_pages import build_http_pages  # HTTP 后端页面对象
 
-# 配置日志格式和日志等级
-logging.basicConfig(
-    level=logging.INFO,  # 设置日志输出等级为 INFO，输出 info 及以上级别日志
-    format="%(asctime)s - %(levelname)s - %(message)s"  # 日志输出格式，包含时间、日志级别和消息
-)
 logger = logging.getLogger(__name__)  # 获取当前模块的 logger，用于记录模块内日志
 
 
-def screenshot_step(driver: WebDriver, name: str):
+def screenshot_step(driver: WebDriver, name: str, full_page: bool = False):
     """
-    功能：直接截图并附加到 Allure 测试报告，不再重复标题
+    功能：截图并附加到 Allure 测试报告，不再重复标题
+    说明：
+        - 截图交由共享的截图服务在后台压缩、去重，测试线程只负责抓取画面
+        - 已处理完成的截图会在下一次截图或 flush 时附加到报告
     参数：
         driver (WebDriver): 当前页面的浏览器驱动
         name (str): 截图名称，显示在 Allure 报告中
+        full_page (bool): 是否通过 DevTools 截取整页
     """
     logger.info("截图操作：%s", name)  # 日志记录截图操作
-    # 获取当前页面截图（PNG 格式）并附加到 Allure 报告
-    allure.attach(
-        driver.get_screenshot_as_png(),  # 获取截图数据
-        name=name,  # 截图名称
-        attachment_type=allure.attachment_type.PNG  # 指定附件类型为 PNG
-    )
+    service = ScreenshotService.shared()  # 获取共享截图服务
+    service.capture(driver, name, full_page)  # 抓取画面后立即返回
+    service.drain()  # 附加已处理完成的截图
 
 
-@pytest.fixture(scope="module")
-def pages(driver, test_data):
+def skip_screenshot(driver, name: str, full_page: bool = False):
     """
-    功能：模块级 fixture，实例化所有页面对象，并返回测试数据
+    功能：HTTP 后端没有页面画面，截图为空操作
+    """
+    logger.info("HTTP 后端跳过截图：%s", name)  # 日志记录跳过的截图
+
+
+def build_pages(driver: WebDriver, element_cache: bool = False):
+    """
+    功能：基于指定的浏览器驱动实例化所有页面对象
     参数：
-        driver: selenium WebDriver 实例
-        test_data: YAML 或其他格式的测试数据
+        driver (WebDriver): 浏览器驱动
+        element_cache (bool): 是否为这组页面对象启用元素句柄缓存（只设置实例属性，不影响其他页面对象）
     返回：
-        dict: 包含搜索页、打开页、滚动页、翻页页对象和测试数据
+        dict: 包含搜索页、打开页、滚动页、翻页页、标题页对象
     """
-    logger.info("实例化页面对象")  # 日志记录页面对象初始化
-    return {
+    pages = {
         "search": SearchPage(driver),  # 搜索页对象，用于执行搜索操作
         "open": OpenPage(driver),  # 打开页面对象，用于打开指定网址
         "scroll": ScrollPage(driver),  # 滚动页面对象，用于滚动页面
         "flip": FlipPage(driver),  # 翻页对象，用于执行翻页操作
         "titles": TitlesPage(driver),  # 标题对象，用于获取和打印页面标题
+    }
+    if element_cache:
+        for page in pages.values():
+            page.cache_elements = True
+    return pages
+
+
+def number_items(text_list, data_shard=(0, 1)):
+    """
+    功能：为分片内的关键词数据附加其在整个数据源中的行号，作为检查点的单元主键
+    参数：
+        text_list (iterable): 分片内的关键词数据
+        data_shard (tuple): (分片编号, 分片数量)，分片内第 k 行在数据源中的行号为 k * 分片数量 + 分片编号
+    返回：
+        generator: 惰性产出 (行号, 关键词数据)
+    """
+    index, count = data_shard
+    for position, word in enumerate(text_list):
+        yield position * count + index, word
+
+
+def goto_page(pages, keyword: str, page: int):
+    """
+    功能：将浏览器定位到关键词的指定结果页：执行搜索，目标页大于 1 时再翻到该页
+    参数：
+        pages (dict): build_pages 返回的页面对象
+        keyword (str): 搜索关键词
+        page (int): 目标页码
+    """
+    with Metrics.shared().context(keyword=keyword, page=0):  # 搜索阶段的记录标记为第 0 页
+        pages["search"].search_(keyword)  # 执行搜索操作
+        logger.info("已执行搜索: %s", keyword)  # 日志记录搜索完成
+        if page > 1:
+            pages["flip"].flip_(page)  # 续跑或重试时直接翻到目标页
+            logger.info("已定位到第 %d 页: %s", page, keyword)  # 日志记录定位完成
+
+
+def search_keyword(pages, keyword: str, flip_num: int, shoot=screenshot_step, full_page: bool = False,
+                   checkpoint=None, retries: int = 0, item: int = None):
+    """
+    功能：对单个关键词执行搜索，并逐页获取标题、滚动、截图、翻页
+    说明：
+        - 每个 (数据行号, 页码) 为一个执行单元，完成后写入检查点，续跑时跳过已完成的单元
+        - 单元失败时重新搜索并定位到该页后重试，最多重试 retries 次
+        - 失败原因是浏览器会话不可用（会话失效、浏览器崩溃）时，先通过健康监控重启浏览器再重试
+        - 某页最终失败后继续执行后续页，全部结束后抛出第一个错误
+        - pages 中有结果输出（"sink"）时，单元成功后才将本页标题写入结果输出
+    参数：
+        pages (dict): build_pages 返回的页面对象
+        keyword (str): 搜索关键词
+        flip_num (int): 翻页次数
+        shoot (callable): 截图函数 shoot(driver, name, full_page)，默认交给共享截图服务
+        full_page (bool): 为 True 时每页只截一张整页图，替代"页首截图-滚动-页尾截图"
+        checkpoint (Checkpoint): 进度检查点，为 None 时不记录进度
+        retries (int): 单元失败后的重试次数
+        item (int): 关键词在数据源中的行号，作为检查点的单元主键（使用检查点时必须提供）
+    """
+    todo = range(1, flip_num + 1)  # 待执行的页码
+    if checkpoint:
+        todo = checkpoint.todo(item, todo)  # 续跑时跳过已完成的页码
+    if not todo:
+        logger.info("关键词已全部完成，跳过: %s", keyword)  # 日志记录续跑跳过
+        return
+
+    metrics = Metrics.shared()
+    position = None  # 浏览器当前所在页码，None 表示需要重新定位
+    errors = []  # 最终失败的单元错误
+    for page in todo:
+        for attempt in range(retries + 1):
+            try:
+                if position != page:
+                    goto_page(pages, keyword, page)  # 首次进入、跳过已完成页或失败后重新定位
+                with metrics.context(keyword=keyword, page=page):  # 本页的所有记录标记关键词与页码
+                    titles = search_page(pages, keyword, page, shoot, full_page)
+            except NeedsBrowser:  # HTTP 后端无法解析，重试无意义，交给调用方回退到浏览器
+                raise
+            except Exception as exc:  # 单元失败：记录并按需重试
+                position = None
+                logger.warning("单元执行失败 %s-第%d页（第 %d 次）: %s", keyword, page, attempt + 1, exc)
+                if checkpoint:
+                    checkpoint.mark_failed(item, page, exc, keyword)
+                if attempt == retries:
+                    errors.append(exc)
+                elif pages.get("health") and session_lost(exc):  # 会话已不可用，在原会话上重试必然失败
+                    try:
+                        pages["health"].recycle(f"会话不可用: {exc}")  # 重启浏览器并重新绑定页面对象
+                        pages["open"].openurl()  # 重启后回到首页，由 goto_page 重新定位
+                    except Exception as recycle_exc:  # 重启失败时照常重试，由下一次失败记录错误
+                        logger.error("重启浏览器失败: %s", recycle_exc)
+            else:
+                position = page + 1  # search_page 结束时已翻到下一页
+                if pages.get("sink"):
+                    pages["sink"].add(keyword, page, titles)  # 单元成功后才写入，重试不会重复记录
+                if checkpoint:
+                    checkpoint.mark_done(item, page, keyword)
+                if pages.get("health"):
+                    pages["health"].step()  # 按步数检查浏览器健康状况，必要时重启并恢复到当前页
+                break
+    if errors:
+        raise errors[0]
+
+
+def search_page(pages, keyword: str, page: int, shoot=screenshot_step, full_page: bool = False):
+    """
+    功能：处理搜索结果的单个页面：预加载下一页，获取标题、截图、滚动并翻到下一页
+    参数：
+        pages (dict): build_pages 返回的页面对象
+        keyword (str): 搜索关键词
+        page (int): 当前页码
+        shoot (callable): 截图函数 shoot(driver, name, full_page)
+        full_page (bool): 是否只截一张整页图
+    返回：
+        list[dict]: 本页标题记录，由 search_keyword 在单元成功后写入结果输出
+    """
+    sp, scp, fp, tp = pages["search"], pages["scroll"], pages["flip"], pages["titles"]
+    fp.prefetch(page + 1)  # 处理本页期间在后台加载下一页
+    titles = tp.titles_(page)  # 获取当前页标题
+    logger.info("第 %d 页操作开始: %s", page, keyword)  # 日志记录当前页操作开始
+    if full_page:
+        shoot(sp.driver, f"{keyword}-第{page}页-整页", True)  # 一次截取整页
+    else:
+        shoot(sp.driver, f"{keyword}-第{page}页-页首")  # 截图页首
+        scp.scroll_()  # 页面滚动到底部
+        logger.info("已滚动页面: %s-第%d页", keyword, page)  # 日志记录滚动完成
+        shoot(sp.driver, f"{keyword}-第{page}页-页尾")  # 截图页尾
+    fp.flip_(page + 1)  # 执行翻页操作，跳转到下一页
+    logger.info("已翻页到第 %d 页", page + 1)  # 日志记录翻页完成
+    return titles
+
+
+def search_parallel(text_list, flip_num: int, pool_size: int, full_page: bool = False, profile: str = 'visual',
+                    checkpoint=None, retries: int = 0, sink=None, health=None, http_cache=None):
+    """
+    功能：使用浏览器池并行搜索关键词，并将每个关键词的截图按原顺序合并到 Allure 报告
+    说明：
+        - Allure 步骤和附件只能在测试线程中写入，工作线程只收集处理后的截图
+        - 所有关键词执行完毕后在测试线程中按关键词顺序回放为 Allure 步骤
+        - 传入 health 时每个会话按相同阈值单独监控，超过阈值或会话不可用时只重启该会话
+        - 传入 http_cache 时每个会话（包括重启后的会话）都接入录制与回放
+    参数：
+        text_list (iterable): (数据行号, 关键词数据)，由 number_items 产出
+        flip_num (int): 翻页次数
+        pool_size (int): 浏览器会话数量
+        full_page (bool): 是否每页只截一张整页图
+        profile (str): 浏览器池使用的加载配置（强制无头）
+        checkpoint (Checkpoint): 进度检查点
+        retries (int): 单元失败后的重试次数
+        sink (ResultSink): 标题结果输出，多个会话共用
+        health (HealthMonitor): 主流程的健康监控，提供各会话的监控阈值
+        http_cache (ReplayCache): HTTP 录制与回放
+    返回：
+        list[TaskResult]: 每个关键词的执行结果，item 为 (数据行号, 关键词数据)
+    """
+    services = []  # 每个会话独立的截图服务
+    monitors = {}  # 浏览器池启动的驱动 -> 该会话的健康监控
+
+    def setup(driver):  # 每个浏览器会话独立的页面对象与截图服务，并先打开首页
+        worker_pages = build_pages(driver)
+        if health:
+            monitors[driver] = health.spawn(pool.factory, driver)  # 重启时由浏览器池的创建函数新建会话
+            worker_pages = monitors[driver].bind(worker_pages)
+            worker_pages["health"] = monitors[driver]
+        worker_pages["sink"] = sink
+        worker_pages["shots"] = ScreenshotService(workers=1)
+        services.append(worker_pages["shots"])
+        worker_pages["open"].openurl()
+        return worker_pages
+
+    def task(worker_pages, numbered):  # 在工作线程中执行单个关键词，返回处理后的截图
+        item, word = numbered
+        service = worker_pages["shots"]
+        try:
+            search_keyword(worker_pages, word["content"], flip_num, service.capture, full_page, checkpoint, retries,
+                           item)
+        finally:
+            shots = service.collect()  # 失败时也取出已抓取的截图，避免混入下一个关键词
+        return shots
+
+    try:
+        factory = (lambda: http_cache.attach(driver_(profile, headless=True))) if http_cache else None
+        with BrowserPool(pool_size, factory, profile) as pool:
+            try:
+                results = pool.run(text_list, task, setup)
+            finally:  # 重启过的会话以当前驱动交由浏览器池关闭
+                pool.drivers = [monitors[driver].driver if driver in monitors else driver for driver in pool.drivers]
+    finally:
+        for service in services:
+            service.close()
+
+    for result in results:  # 在测试线程中按关键词顺序合并 Allure 步骤与附件
+        with allure.step(f"搜索: {result.item[1]['content']}"):
+            for shot in result.value or []:
+                allure.attach(shot.data, name=shot.name, attachment_type=shot.attachment_type)
+            if result.error is not None:
+                allure.attach(repr(result.error), name="错误信息", attachment_type=allure.attachment_type.TEXT)
+    return results
+
+
+def search_tabs(text_list, flip_num: int, tab_count: int, driver, full_page: bool = False, checkpoint=None,
+                retries: int = 0, sink=None, health=None):
+    """
+    功能：在一个浏览器内打开多个标签页并发搜索关键词，内存占用远小于多浏览器的 search_parallel
+    说明：
+        - 在调用方提供的驱动（如 health.driver，已接入录制与回放）上打开额外的标签页，结束后关闭这些标签页，驱动由调用方关闭
+        - 脚本、导航与截图经各标签页的 DevTools 会话发送，页面加载与滚动等待互不阻塞；
+          驱动宜使用 page_load_strategy='none' 启动，点击翻页等元素命令不在命令锁内等待页面加载
+        - 标签页之间不预加载下一页，避免并发打开窗口时无法区分新标签页归属
+        - Allure 步骤在所有关键词执行完毕后于测试线程中按关键词顺序回放
+        - 传入 health 时每个标签页单独监控 JS 堆与 DOM 节点数，重启时只替换该标签页（进程内存由所有标签页共用，不检查）
+    参数：
+        text_list (iterable): (数据行号, 关键词数据)，由 number_items 产出
+        flip_num (int): 翻页次数
+        tab_count (int): 标签页数量
+        driver (WebDriver): 浏览器驱动，第一个标签页即其当前标签页
+        full_page (bool): 是否每页只截一张整页图
+        checkpoint (Checkpoint): 进度检查点
+        retries (int): 单元失败后的重试次数
+        sink (ResultSink): 标题结果输出，多个标签页共用
+        health (HealthMonitor): 主流程的健康监控，提供各标签页的监控阈值
+    返回：
+        list[tuple]: 按关键词顺序排列的 ((数据行号, 关键词数据), 截图列表, 异常)
+    """
+    services = []  # 每个标签页独立的截图服务
+
+    def setup(tab):  # 每个标签页独立的页面对象与截图服务，并先打开首页
+        tab_pages = build_pages(tab)
+        if health:
+            monitor = health.spawn(router.new_tab, tab, max_rss_mb=0)  # 重启时在当前线程新建标签页并关闭旧标签页
+            tab_pages = monitor.bind(tab_pages)
+            tab_pages["health"] = monitor
+        tab_pages["flip"].prefetch_pages = False
+        tab_pages["sink"] = sink
+        tab_pages["shots"] = ScreenshotService(workers=1)
+        services.append(tab_pages["shots"])
+        tab_pages["open"].openurl()
+        return tab_pages
+
+    def task(tab_pages, numbered):  # 在工作线程中执行单个关键词，返回处理后的截图
+        item, word = numbered
+        service = tab_pages["shots"]
+        try:
+            search_keyword(tab_pages, word["content"], flip_num, service.capture, full_page, checkpoint, retries,
+                           item)
+        finally:
+            shots = service.collect()  # 失败时也取出已抓取的截图，避免混入下一个关键词
+        return shots
+
+    try:
+        with TabRouter(driver, tab_count) as router:
+            results = router.run(text_list, task, setup)
+    finally:
+        for service in services:
+            service.close()
+
+    for (_, word), shots, error in results:  # 在测试线程中按关键词顺序合并 Allure 步骤与附件
+        with allure.step(f"搜索: {word['content']}"):
+            for shot in shots or []:
+                allure.attach(shot.data, name=shot.name, attachment_type=shot.attachment_type)
+            if error is not None:
+                allure.attach(repr(error), name="错误信息", attachment_type=allure.attachment_type.TEXT)
+    return results
+
+
+def search_http(text_list, flip_num: int, concurrency: int = 8, url: str = None, checkpoint=None, retries: int = 0,
+                sink=None):
+    """
+    功能：不启动浏览器，通过 HTTP 直接请求结果页并解析标题，多个关键词并发执行
+    说明：
+        - 所有关键词共享同一个长连接客户端，每个关键词使用独立的页面对象
+        - 页面需要脚本渲染或安全验证时，该关键词的错误为 NeedsBrowser，由调用方回退到浏览器
+    参数：
+        text_list (iterable): (数据行号, 关键词数据)，由 number_items 产出
+        flip_num (int): 翻页次数
+        concurrency (int): 同时执行的关键词数量
+        url (str): 首页地址，默认使用 HttpOpenPage.url
+        checkpoint (Checkpoint): 进度检查点
+        retries (int): 单元失败后的重试次数
+        sink (ResultSink): 标题结果输出，所有关键词共用
+    返回：
+        list[tuple]: 按关键词顺序排列的 ((数据行号, 关键词数据), 返回值, 异常)
+    """
+    client = HttpClient(max_per_host=concurrency)
+
+    def task(numbered):  # 在工作线程中执行单个关键词
+        item, word = numbered
+        http_pages = build_http_pages(client, url)
+        http_pages["sink"] = sink
+        search_keyword(http_pages, word["content"], flip_num, skip_screenshot, False, checkpoint, retries, item)
+
+    try:
+        return run_concurrently(text_list, task, concurrency)
+    finally:
+        logger.info("HTTP 请求 %d 次，新建连接 %d 次", client.requests, client.connects)  # 日志记录连接复用情况
+        client.close()
+
+
+def browser_step(pages, keyword: str, flip_num: int, full_page: bool = False, checkpoint=None, retries: int = 0,
+                 item: int = None):
+    """
+    功能：在测试线程中用浏览器执行单个关键词，失败时将错误附加到 Allure 报告
+    返回：
+        bool: 关键词是否执行成功
+    """
+    try:
+        search_keyword(pages, keyword, flip_num, full_page=full_page,
+                       checkpoint=checkpoint, retries=retries, item=item)  # 执行搜索、逐页截图与翻页
+    except Exception as exc:  # 记录失败并继续下一个关键词
+        allure.attach(repr(exc), name="错误信息", attachment_type=allure.attachment_type.TEXT)
+        return False
+    finally:
+        ScreenshotService.shared().flush()  # 将本关键词的截图附加到当前步骤
+    return True
+
+
+@pytest.fixture(scope="module")
+def pages(driver, test_data, health, sink):
+    """
+    功能：模块级 fixture，实例化所有页面对象，并返回测试数据
+    参数：
+        driver: selenium WebDriver 实例，依赖它以保证会话结束时的统计输出在页面对象之后执行；
+                浏览器重启后该对象会过期，页面对象始终基于 health.driver 创建
+        test_data: YAML 或其他格式的测试数据
+        health: 浏览器健康监控，页面对象登记到监控中，浏览器重启后自动绑定到新驱动
+        sink: 标题结果输出
+    返回：
+        dict: 包含搜索页、打开页、滚动页、翻页页对象、测试数据、健康监控与结果输出
+    """
+    logger.info("实例化页面对象")  # 日志记录页面对象初始化
+    return {
+        **health.bind(build_pages(health.driver, test_data.get("element_cache", False))),  # 页面对象
         "data": test_data,  # 测试数据，从 fixture 或 YAML 文件中获取
+        "health": health,  # 健康监控，search_keyword 每完成一个单元调用一次 step
+        "sink": sink,  # 结果输出，search_keyword 在每个单元成功后写入本页标题
     }
 
 
@@ -66,12 +407,13 @@ def test_open(pages):
     op.openurl()  # 执行打开首页操作
     logger.info("已打开百度首页，准备截图")  # 日志记录截图前提示
     screenshot_step(op.driver, "打开百度官网")  # 调用截图函数，并附加到 Allure
+    ScreenshotService.shared().flush()  # 等待截图处理完成并附加到报告
     logger.info("百度首页打开并截图完成")  # 日志记录操作完成
 
 
 @allure.feature("搜索功能")  # Allure 功能模块标记
 @allure.story("循环搜索关键词")  # Allure 用户故事标记
-def test_search(pages):
+def test_search(pages, data_shard, checkpoint, http_cache):
     """
     功能：循环搜索关键词并翻页截图
     步骤：
@@ -79,27 +421,56 @@ def test_search(pages):
         2. 执行搜索操作
         3. 每页滚动并截图页首和页尾
         4. 翻页继续搜索下一个关键词
+    说明：
+        - 每个 (数据行号, 页码) 完成后写入检查点，使用 --resume 运行时跳过已完成的单元
+        - 单个关键词失败不会中断其他关键词，所有关键词结束后统一断言
+        - backend 为 http 时不经过浏览器直接解析结果页，需要浏览器的关键词自动回退到浏览器执行
+        - 浏览器池与多标签页模式下每个会话或标签页按 health 的阈值单独监控；HTTP 后端不启动浏览器，只有回退的关键词受监控
+        - 录制与回放（http_cache）覆盖所有浏览器模式：多标签页在已接入的 health.driver 上打开，浏览器池的会话创建时接入
     """
-    # 获取页面对象，方便后续调用各类操作
-    sp, scp, fp, tp = pages["search"], pages["scroll"], pages["flip"], pages['titles']
-    text_list = pages["data"].get("text_list", [])  # 获取搜索关键词列表，默认为空列表
+    text_list = number_items(pages["data"]["text_list"].shard(*data_shard), data_shard)  # 流式读取当前分片的关键词及其行号
     flip_num = pages["data"].get("flip_num")  # 从配置文件读取翻页次数
-    logger.info("开始搜索关键词，共 %d 个", len(text_list))  # 日志记录关键词数量
-
-    for idx, word in enumerate(text_list, start=1):
-        keyword = word["content"]  # 获取当前搜索关键词
-        logger.info("第 %d 次搜索: %s", idx, keyword)  # 日志记录当前搜索序号和关键词
-        sp.search_(keyword)  # 执行搜索操作
-        logger.info("已执行搜索: %s", keyword)  # 日志记录搜索完成
+    pool_size = pages["data"].get("pool_size", 1)  # 从配置文件读取浏览器池大小，默认串行执行
+    tab_count = pages["data"].get("tab_count", 1)  # 从配置文件读取单浏览器内的并发标签页数量
+    full_page = pages["data"].get("full_page_shot", False)  # 从配置文件读取是否使用整页截图
+    retries = pages["data"].get("unit_retries", 1)  # 从配置文件读取单元失败重试次数
+    backend = pages["data"].get("backend", "browser")  # 从配置文件读取提取后端：browser 或 http
+    health = pages["health"]  # 健康监控，浏览器重启后 health.driver 为当前驱动
+    logger.info("开始搜索关键词，分片 %d/%d", data_shard[0] + 1, data_shard[1])  # 日志记录当前分片
 
-        for page in range(1, flip_num + 1):
-            tp.titles_(page)  # 获取并打印当前页标题
-            logger.info("第 %d 页操作开始: %s", page, keyword)  # 日志记录当前页操作开始
-            screenshot_step(sp.driver, f"{keyword}-第{page}页-页首")  # 截图页首
-            scp.scroll_()  # 页面滚动到底部
-            logger.info("已滚动页面: %s-第%d页", keyword, page)  # 日志记录滚动完成
-            screenshot_step(sp.driver, f"{keyword}-第{page}页-页尾")  # 截图页尾
-            fp.flip_(page + 1)  # 执行翻页操作，跳转到下一页
-            logger.info("已翻页到第 %d 页", page + 1)  # 日志记录翻页完成
+    if backend == "http":  # HTTP 后端并发执行，在测试线程中按关键词顺序写入 Allure 步骤
+        concurrency = pages["data"].get("http_concurrency", 8)  # 从配置文件读取 HTTP 并发数
+        failed = []  # 失败的关键词
+        for (item, word), _, error in search_http(text_list, flip_num, concurrency, checkpoint=checkpoint,
+                                                  retries=retries, sink=pages["sink"]):
+            keyword = word["content"]
+            with allure.step(f"搜索: {keyword}"):
+                if isinstance(error, NeedsBrowser):  # 需要浏览器的关键词回退到浏览器执行
+                    logger.info("回退到浏览器: %s（%s）", keyword, error)  # 日志记录回退原因
+                    if not browser_step(pages, keyword, flip_num, full_page, checkpoint, retries, item):
+                        failed.append(keyword)
+                elif error is not None:
+                    failed.append(keyword)
+                    allure.attach(repr(error), name="错误信息", attachment_type=allure.attachment_type.TEXT)
+    elif tab_count > 1:  # 单个浏览器内多标签页并发执行
+        results = search_tabs(text_list, flip_num, tab_count, health.driver, full_page, checkpoint, retries,
+                              pages["sink"], health)
+        failed = [word["content"] for (_, word), _, error in results if error is not None]
+    elif pool_size > 1:  # 浏览器池并行执行
+        results = search_parallel(text_list, flip_num, pool_size, full_page, health.driver.load_profile, checkpoint,
+                                  retries, pages["sink"], health, http_cache)
+        failed = [r.item[1]["content"] for r in results if r.error is not None]
+    else:
+        failed = []  # 失败的关键词
+        for idx, (item, word) in enumerate(text_list, start=1):
+            keyword = word["content"]  # 获取当前搜索关键词
+            logger.info("第 %d 次搜索: %s", idx, keyword)  # 日志记录当前搜索序号和关键词
+            with allure.step(f"搜索: {keyword}"):
+                if not browser_step(pages, keyword, flip_num, full_page, checkpoint, retries, item):
+                    failed.append(keyword)
+    if pages["sink"]:
+        pages["sink"].flush()  # 本分片的标题记录全部写入
+        logger.info("标题结果输出: %s", pages["sink"].stats())  # 日志记录写入与重复数量
+    assert not failed, f"以下关键词搜索失败: {failed}"
 
     logger.info("搜索关键词循环完成")  # 日志记录所有搜索操作完成
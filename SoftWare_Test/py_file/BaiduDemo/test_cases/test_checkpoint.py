@@ -0,0 +1,74 @@
+"""
+    断点续跑检查点的单元测试：单元状态、待执行页码与续跑，不需要浏览器
+"""
+import pytest  # pytest 测试框架
+from base_page.checkpoint_page import Checkpoint  # 执行进度检查点
+
+
+@pytest.fixture()
+def path(tmp_path):
+    """
+    功能：检查点数据库路径（目录不存在时由 Checkpoint 创建）
+    """
+    return str(tmp_path / "checkpoint" / "search.sqlite")
+
+
+def test_mark_done_and_todo(path):
+    checkpoint = Checkpoint(path)
+    try:
+        checkpoint.mark_done(0, 1, "NCPD")
+        checkpoint.mark_done(0, 3, "NCPD")
+        assert checkpoint.done_pages(0) == {1, 3}
+        assert checkpoint.todo(0, range(1, 5)) == [2, 4]
+        assert checkpoint.todo(1, range(1, 3)) == [1, 2]  # 行号为主键，其他数据行不受影响
+        assert checkpoint.count("done") == 2
+    finally:
+        checkpoint.close()
+
+
+def test_mark_failed_is_retried(path):
+    """
+    失败的单元记录错误与执行次数，续跑时重新执行；之后成功则状态变为 done
+    """
+    checkpoint = Checkpoint(path)
+    try:
+        checkpoint.mark_failed(2, 1, TimeoutError("timeout"), "My Back")
+        checkpoint.mark_failed(2, 1, TimeoutError("timeout"), "My Back")
+        assert checkpoint.failed() == [(2, "My Back", 1, "TimeoutError('timeout')")]
+        assert checkpoint.todo(2, [1, 2]) == [1, 2]
+        checkpoint.mark_done(2, 1, "My Back")
+        assert checkpoint.failed() == []
+        assert checkpoint.todo(2, [1, 2]) == [2]
+        attempts = checkpoint._conn.execute("SELECT attempts FROM units WHERE item = 2 AND page = 1").fetchone()[0]
+        assert attempts == 3
+    finally:
+        checkpoint.close()
+
+
+def test_duplicate_keywords_tracked_per_item(path):
+    checkpoint = Checkpoint(path)
+    try:
+        checkpoint.mark_done(0, 1, "NCPD")
+        assert checkpoint.todo(5, [1]) == [1]  # 同一关键词出现在另一行时各自记录进度
+    finally:
+        checkpoint.close()
+
+
+def test_resume(path):
+    """
+    续跑模式保留已有进度，非续跑模式清空进度重新开始
+    """
+    checkpoint = Checkpoint(path)
+    checkpoint.mark_done(0, 1, "NCPD")
+    checkpoint.close()
+    checkpoint = Checkpoint(path, resume=True)
+    try:
+        assert checkpoint.todo(0, [1, 2]) == [2]
+    finally:
+        checkpoint.close()
+    checkpoint = Checkpoint(path)
+    try:
+        assert checkpoint.todo(0, [1, 2]) == [1, 2]
+        assert checkpoint.count("done") == 0
+    finally:
+        checkpoint.close()
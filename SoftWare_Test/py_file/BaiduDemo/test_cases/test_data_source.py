@@ -0,0 +1,109 @@
+"""
+    测试数据加载的单元测试：YAML 流式读取、配置读取、解析缓存与分片，不需要浏览器
+"""
+import os  # 文件路径
+import pytest  # pytest 测试框架
+import yaml  # YAML 解析异常
+from base_page.data_page import DataSource, read_csv, read_settings, read_yaml  # 数据源与读取函数
+
+
+def write(tmp_path, name, text):
+    """
+    功能：写入测试数据文件并返回路径
+    """
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def fail(*args, **kwargs):
+    """
+    功能：替换读取函数，确认缓存命中时不再解析源文件
+    """
+    raise AssertionError("不应解析源文件")
+
+
+def test_read_yaml_streams_items(tmp_path):
+    """
+    列表项逐项构造：第一项在后面的内容解析之前即可产出
+    """
+    rows = read_yaml(write(tmp_path, "rows.yaml", "- content: a\n- content: b\n- [unclosed\n"))
+    assert next(rows) == {"content": "a"}
+    assert next(rows) == {"content": "b"}
+    with pytest.raises(yaml.YAMLError):
+        next(rows)
+
+
+def test_read_yaml_key_and_documents(tmp_path):
+    path = write(tmp_path, "rows.yaml", "meta: 1\nrows:\n  - a\n  - b\n---\nrows: [c]\n")
+    assert list(read_yaml(path, key="rows")) == ["a", "b", "c"]
+    path = write(tmp_path, "docs.yaml", "a: 1\n---\na: 2\n---\n- 3\n- 4\n")
+    assert list(read_yaml(path)) == [{"a": 1}, {"a": 2}, 3, 4]
+
+
+def test_read_yaml_alias_between_items(tmp_path):
+    path = write(tmp_path, "rows.yaml", "- &x {content: a}\n- *x\n- {<<: *x, page: 2}\n")
+    assert list(read_yaml(path)) == [{"content": "a"}, {"content": "a"}, {"content": "a", "page": 2}]
+
+
+def test_read_settings_skips_key(tmp_path):
+    path = write(tmp_path, "order.yaml", "\ufeffflip_num: 2\ntext_list:\n  - content: a\n  - content: b\nbackend: http\n")
+    assert read_settings(path, skip=("text_list",)) == {"flip_num": 2, "backend": "http"}
+
+
+def test_read_settings_alias_into_skipped_key(tmp_path):
+    """
+    被跳过的键中定义的锚点仍可被其他键引用
+    """
+    path = write(tmp_path, "order.yaml", "text_list: [&b {x: 1}]\nother: *b\nmerged: {<<: *b, y: 2}\n")
+    assert read_settings(path, skip=("text_list",)) == {"other": {"x": 1}, "merged": {"x": 1, "y": 2}}
+
+
+def test_read_csv_with_bom(tmp_path):
+    path = write(tmp_path, "rows.csv", "\ufeffcontent,page\na,1\nb,2\n")
+    assert list(read_csv(path)) == [{"content": "a", "page": "1"}, {"content": "b", "page": "2"}]
+
+
+def test_data_source_cache(tmp_path):
+    """
+    第二次迭代读取缓存；源文件修改后缓存失效，重新解析
+    """
+    path = write(tmp_path, "rows.yaml", "- {wd: a}\n- {wd: b}\n")
+    source = DataSource(path, rename={"wd": "content"}, cache_dir=str(tmp_path / "cache"))
+    assert list(source) == [{"content": "a"}, {"content": "b"}]
+    assert os.path.exists(source.cache_path)
+    reader, source.reader = source.reader, fail
+    assert list(source) == [{"content": "a"}, {"content": "b"}]
+    write(tmp_path, "rows.yaml", "- {wd: a}\n- {wd: b}\n- {wd: c}\n")
+    source.reader = reader
+    assert [row["content"] for row in source] == ["a", "b", "c"]
+
+
+def test_data_source_partial_iteration_keeps_no_cache(tmp_path):
+    path = write(tmp_path, "rows.yaml", "- {wd: a}\n- {wd: b}\n")
+    source = DataSource(path, cache_dir=str(tmp_path / "cache"))
+    rows = iter(source)
+    next(rows)
+    rows.close()  # 中途停止迭代
+    assert not os.path.exists(source.cache_path)
+
+
+def test_shard_partitions_in_one_pass(tmp_path):
+    """
+    各分片互不重叠且合起来覆盖全部行；第一个分片遍历一次数据源即写出所有分片的缓存
+    """
+    path = write(tmp_path, "rows.yaml", "".join(f"- {{content: k{i}}}\n" for i in range(10)))
+    source = DataSource(path, cache_dir=str(tmp_path / "cache"))
+    first = [row["content"] for row in source.shard(0, 3)]
+    assert first == ["k0", "k3", "k6", "k9"]
+    assert all(os.path.exists(source._shard_path(i, 3)) for i in range(3))
+    source.reader = fail  # 其余分片只读取自己的缓存文件
+    assert [row["content"] for row in source.shard(1, 3)] == ["k1", "k4", "k7"]
+    assert [row["content"] for row in source.shard(2, 3)] == ["k2", "k5", "k8"]
+
+
+def test_shard_without_cache(tmp_path):
+    path = write(tmp_path, "rows.csv", "content\n" + "".join(f"k{i}\n" for i in range(5)))
+    source = DataSource(path, cache=False)
+    assert [row["content"] for row in source.shard(1, 2)] == ["k1", "k3"]
+    assert [row["content"] for row in source.shard(0, 1)] == [f"k{i}" for i in range(5)]
@@ -0,0 +1,71 @@
+"""
+    HTTP 提取后端的离线测试：解析本地模拟 SERP 服务的页面，以及需要浏览器时的回退，不需要浏览器与外网
+"""
+import pytest  # pytest 测试框架
+from urllib.parse import urljoin  # 拼接分页链接的期望地址
+from base_page.http_page import NeedsBrowser, SerpParser  # 结果页解析器与回退异常
+from base_page.sink_page import ResultSink  # 标题结果输出
+from test_cases.support.serp_server import SerpServer  # 本地模拟 SERP 服务
+from test_cases.test_cases import number_items, search_http  # HTTP 后端流程与行号
+
+
+@pytest.fixture(scope="module")
+def serp_server():
+    """
+    功能：启动本地模拟 SERP 服务，每页 5 条结果，最多 5 页
+    """
+    with SerpServer(results=5, max_pages=5, filler=0) as server:
+        yield server
+
+
+def parse(server, wd, page):
+    """
+    功能：用 SerpParser 解析模拟服务渲染的结果页
+    """
+    parser = SerpParser(server.result_url(wd, page))
+    parser.feed(server.render_results(wd, (page - 1) * 10))
+    parser.close()
+    return parser
+
+
+def test_parser_titles(serp_server):
+    parser = parse(serp_server, "NCPD", 2)
+    assert parser.has_results
+    assert parser.title == "NCPD_百度搜索"
+    assert len(parser.titles) == 5
+    assert parser.titles[0] == {"text": "NCPD 第2页 结果1", "href": f"{serp_server.url}item/NCPD/11"}
+
+
+def test_parser_pages(serp_server):
+    """
+    分页区域只记录链接形式的页码，当前页（<strong>）不是链接
+    """
+    parser = parse(serp_server, "NCPD", 2)
+    assert sorted(parser.pages) == [1, 3, 4, 5]
+    assert parser.pages[3] == urljoin(serp_server.url, "/s?wd=NCPD&pn=20")
+
+
+def test_parser_unescapes_keyword(serp_server):
+    parser = parse(serp_server, "a<b & c", 1)
+    assert parser.titles[0]["text"] == "a<b & c 第1页 结果1"
+
+
+def test_search_http(serp_server, tmp_path):
+    sink = ResultSink(str(tmp_path / "titles.jsonl"))
+    try:
+        results = search_http(number_items([{"content": "NCPD"}, {"content": "My Back"}]), 2, concurrency=2,
+                              url=serp_server.url, sink=sink)
+        sink.flush()
+        assert [error for _, _, error in results] == [None, None]
+        assert sink.stats()["added"] == 2 * 2 * 5  # 2 个关键词 × 2 页 × 5 条
+    finally:
+        sink.close()
+
+
+def test_search_http_needs_browser(serp_server, monkeypatch):
+    """
+    结果页中没有结果容器与标题（如依赖脚本渲染）时，关键词的错误为 NeedsBrowser，由调用方回退到浏览器
+    """
+    monkeypatch.setattr(serp_server, "render_results", lambda wd, pn: serp_server.render_home())
+    results = search_http(number_items([{"content": "NCPD"}]), 2, url=serp_server.url, retries=1)
+    assert isinstance(results[0][2], NeedsBrowser)
@@ -0,0 +1,95 @@
+"""
+    耗时统计的单元测试：百分位数、聚合与慢步骤列表，不需要浏览器
+"""
+import pytest  # pytest 测试框架
+from base_page.metrics_page import Aggregate, Metrics, percentile, timed  # 耗时统计
+
+
+@pytest.mark.parametrize("n, pct, expected", [
+    (10, 50, 5),
+    (100, 95, 95),
+    (100, 99, 99),
+    (100, 50, 50),
+    (3, 50, 2),
+    (10, 100, 10),
+    (1, 99, 1),
+])
+def test_percentile_nearest_rank(n, pct, expected):
+    """
+    最近秩法：排名为不小于 pct% * n 的最小整数
+    """
+    assert percentile(list(range(1, n + 1)), pct) == expected
+
+
+def test_percentile_empty():
+    assert percentile([], 95) == 0.0
+
+
+class Nested:
+    """
+    嵌套调用的 timed 方法，模拟 input -> wait_visible -> wait_until
+    """
+
+    @timed
+    def outer(self):
+        return self.inner()
+
+    @timed
+    def inner(self):
+        return 1
+
+
+def test_slowest_lists_outermost_steps_once(monkeypatch):
+    """
+    嵌套方法在 methods 中各自统计，慢步骤列表只列出最外层方法
+    """
+    metrics = Metrics()
+    monkeypatch.setattr(Metrics, "_shared", metrics)
+    with metrics.context(keyword="kw", page=1):
+        Nested().outer()
+    report = metrics.report()
+    assert set(report["methods"]) == {"Nested.outer", "Nested.inner"}
+    assert [step["name"] for step in report["slowest"]] == ["Nested.outer"]
+    assert report["slowest"][0]["keyword"] == "kw"
+
+
+def test_aggregate_is_bounded():
+    """
+    样本数超过蓄水池容量后内存不再增长，次数、总耗时、最大值与直方图仍为精确值
+    """
+    aggregate = Aggregate(size=100)
+    for i in range(1, 10001):
+        aggregate.add(i / 1000)
+    summary = aggregate.summary()
+    assert len(aggregate.samples) == 100
+    assert summary["count"] == 10000
+    assert summary["total"] == round(sum(range(1, 10001)) / 1000, 4)
+    assert summary["max"] == 10.0
+    assert sum(summary["histogram"].values()) == 10000
+    assert summary["histogram"]["<=0.01s"] == 10
+    assert 0 < summary["p50"] <= summary["p99"] <= 10.0
+
+
+def test_aggregate_exact_below_capacity():
+    aggregate = Aggregate(size=100)
+    for i in range(1, 101):
+        aggregate.add(float(i))
+    summary = aggregate.summary()
+    assert (summary["p50"], summary["p95"], summary["p99"]) == (50.0, 95.0, 99.0)
+    assert summary["histogram"][">10s"] == 90
+
+
+def test_slowest_keeps_top_n():
+    """
+    慢步骤只保留最慢的 keep_slowest 条，按耗时降序输出
+    """
+    metrics = Metrics(keep_slowest=3)
+    metrics.record("command", "get", 2.0, "network")  # 线程中的第一条记录为命令时也能读取标签
+    for i in range(100):
+        metrics.record("step", f"step{i}", float(i), None)
+    report = metrics.report()
+    assert len(metrics._slowest) == 3
+    assert [step["seconds"] for step in report["slowest"]] == [99.0, 98.0, 97.0]
+    assert report["methods"]["step5"]["count"] == 1
+    assert report["commands"]["get"]["count"] == 1
+    assert report["buckets"]["network"] == 2.0
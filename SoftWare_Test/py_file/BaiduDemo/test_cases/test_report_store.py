@@ -0,0 +1,85 @@
+"""
+    Allure 结果存储的单元测试：附件去重、附件引用改写、每个用例只保留最新结果与结果集指纹，不需要浏览器与 allure 命令行
+"""
+import json  # 读写 Allure 结果
+import os  # 文件操作
+from base_page.report_page import ResultStore, rewrite_sources  # 结果存储与附件引用改写
+
+
+def write_run(path, uuid, history_id, stop, attachment):
+    """
+    功能：写入一次运行的 Allure 结果目录：一个带附件的结果与引用它的容器
+    """
+    os.makedirs(path, exist_ok=True)
+    source = f"{uuid}-attachment.png"
+    with open(os.path.join(path, source), "wb") as file:
+        file.write(attachment)
+    result = {"uuid": uuid, "historyId": history_id, "name": "test_search", "status": "passed", "stop": stop,
+              "steps": [{"name": "搜索", "attachments": [{"name": "截图", "source": source}]}]}
+    with open(os.path.join(path, f"{uuid}-result.json"), "w", encoding="utf-8") as file:
+        json.dump(result, file)
+    with open(os.path.join(path, f"c{uuid}-container.json"), "w", encoding="utf-8") as file:
+        json.dump({"uuid": f"c{uuid}", "children": [uuid]}, file)
+    return str(path)
+
+
+def stored(store):
+    """
+    功能：合并后结果目录中的文件名集合
+    """
+    return set(os.listdir(store.results))
+
+
+def test_rewrite_sources():
+    node = {"attachments": [{"source": "a"}], "steps": [{"attachments": [{"source": "b"}, {"source": "c"}]}],
+            "befores": [{"attachments": [{"source": "a"}]}]}
+    rewrite_sources(node, {"a": "x.png", "b": "y.png"})
+    assert node["attachments"][0]["source"] == "x.png"
+    assert [a["source"] for a in node["steps"][0]["attachments"]] == ["y.png", "c"]
+    assert node["befores"][0]["attachments"][0]["source"] == "x.png"
+
+
+def test_ingest_dedups_attachments(tmp_path):
+    """
+    内容相同的附件只入库一份；remove=False 时保留原目录
+    """
+    store = ResultStore(str(tmp_path / "store"))
+    first = write_run(tmp_path / "run1", "r1", "h1", 1, b"same")
+    second = write_run(tmp_path / "run2", "r2", "h2", 2, b"same")
+    assert store.ingest(first, remove=False)["stored"] == 1
+    stats = store.ingest(second)
+    assert (stats["stored"], stats["duplicates"]) == (0, 1)
+    assert len(os.listdir(store.objects)) == 1
+    assert os.listdir(first) and not os.listdir(second)
+    with open(os.path.join(store.results, "r2-result.json"), encoding="utf-8") as file:
+        source = json.load(file)["steps"][0]["attachments"][0]["source"]
+    assert source in stored(store) and source in os.listdir(store.objects)
+
+
+def test_ingest_keeps_newest_per_history(tmp_path):
+    """
+    同一用例再次入库时替换旧结果，旧结果的容器与附件链接一并删除；比已有结果更旧的结果被丢弃
+    """
+    store = ResultStore(str(tmp_path / "store"))
+    store.ingest(write_run(tmp_path / "run1", "r1", "h", 1, b"old"))
+    old_files = stored(store)
+    stats = store.ingest(write_run(tmp_path / "run2", "r2", "h", 2, b"new"))
+    assert stats["superseded"] == 1
+    files = stored(store)
+    assert not files & old_files
+    assert {"r2-result.json", "cr2-container.json"} <= files and len(files) == 3
+    stats = store.ingest(write_run(tmp_path / "run0", "r0", "h", 0, b"older"))
+    assert stats["superseded"] == 1
+    assert stored(store) == files
+    assert len(os.listdir(store.objects)) == 3  # 附件本体保留，再次出现时无需重新入库
+
+
+def test_fingerprint(tmp_path):
+    store = ResultStore(str(tmp_path / "store"))
+    empty = store.fingerprint()
+    store.ingest(write_run(tmp_path / "run1", "r1", "h1", 1, b"a"))
+    first = store.fingerprint()
+    assert first != empty
+    assert store.fingerprint() == first  # 结果没有变化时指纹不变
+    store.ingest(write_run(tmp_path / "run2", "r2", "h2", 2, b"b"))
+    assert store.fingerprint() != first
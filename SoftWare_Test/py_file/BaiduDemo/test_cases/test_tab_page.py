@@ -0,0 +1,96 @@
+"""
+    多标签页的单元测试：TabDriver 的脚本与导航经各标签页的 DevTools 会话发送，不经过命令锁，不需要浏览器
+"""
+import json  # DevTools 消息
+import threading  # 后台线程运行模拟服务
+import pytest  # pytest 测试框架
+from base_page.cdp_page import DevTools, trio  # 浏览器级 DevTools 连接
+from base_page.http_page import run_concurrently  # 并发执行阻塞任务
+from base_page.tab_page import TabDriver, TabRouter  # 标签页驱动视图与路由器
+
+trio_websocket = pytest.importorskip("trio_websocket")  # 随 selenium 安装
+
+
+class Endpoint:
+    """
+    只提供 DevTools 地址的驱动替身，cdp_endpoint 从能力中读取。
+    """
+
+    def __init__(self, url):
+        self.caps = {"se:cdp": url, "se:cdpVersion": "130.0"}
+
+
+@pytest.fixture(scope="module")
+def cdp_server():
+    """
+    功能：模拟 DevTools 服务：附加标签页时以 target id 生成会话 id，其他命令返回 [会话 id, 方法, 参数]，
+         每条命令延迟 0.2 秒后并发应答，并记录收到的命令
+    """
+    received = []
+    started = threading.Event()
+    address = {}
+
+    async def handler(request):
+        ws = await request.accept()
+
+        async def reply(message):
+            received.append(message)
+            if message["method"] == "Target.attachToTarget":
+                result = {"sessionId": "session-" + message["params"]["targetId"]}
+            elif message["method"] == "Runtime.evaluate":
+                await trio.sleep(0.2)
+                value = [message.get("sessionId"), message["method"], message["params"]["expression"]]
+                result = {"result": {"type": "object", "value": value}}
+            else:
+                result = {"frameId": "frame"}
+            await ws.send_message(json.dumps({"id": message["id"], "result": result,
+                                              **({"sessionId": message["sessionId"]} if "sessionId" in message else {})}))
+
+        async with trio.open_nursery() as nursery:
+            while True:
+                try:
+                    message = json.loads(await ws.get_message())
+                except trio_websocket.ConnectionClosed:
+                    return
+                nursery.start_soon(reply, message)
+
+    async def main():
+        async with trio.open_nursery() as nursery:
+            server = await nursery.start(trio_websocket.serve_websocket, handler, "127.0.0.1", 0, None)
+            address["url"] = f"ws://127.0.0.1:{server.port}/devtools/browser"
+            started.set()
+
+    threading.Thread(target=trio.run, args=(main,), daemon=True).start()
+    started.wait(5)
+    yield address["url"], received
+
+
+@pytest.fixture()
+def router(cdp_server):
+    """
+    功能：只建立 DevTools 连接的路由器，不接管 WebDriver 命令
+    """
+    router = TabRouter(driver=None, size=2)
+    router.devtools = DevTools(Endpoint(cdp_server[0])).start()
+    yield router
+    router.devtools.close()
+
+
+def test_scripts_use_tab_sessions_without_lock(router):
+    """
+    另一个线程持有命令锁（如正在执行元素命令）时，各标签页的脚本仍经各自的会话并发执行
+    """
+    tabs = [TabDriver(router, "A"), TabDriver(router, "B")]
+    with router._lock:
+        results = run_concurrently(tabs, lambda tab: tab.execute_script("return 1;"), 2)
+    values = [value for _, value, _ in results]
+    assert [session for session, _, _ in values] == ["session-A", "session-B"]
+    assert all("return 1;" in expression for _, _, expression in values)
+
+
+def test_get_navigates_tab_session(router, cdp_server):
+    received = cdp_server[1]
+    TabDriver(router, "C").get("http://127.0.0.1/s?wd=NCPD")
+    navigate = [m for m in received if m["method"] == "Page.navigate"][-1]
+    assert navigate["sessionId"] == "session-C"
+    assert navigate["params"] == {"url": "http://127.0.0.1/s?wd=NCPD"}